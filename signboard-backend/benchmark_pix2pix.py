@@ -0,0 +1,284 @@
+"""
+pix2pix 추론 단계별 시간 측정 스크립트 - 전처리 / 모델 forward / 후처리.
+
+간판 크기별로 전처리(pix2pix_io.preprocess_into), forward(engine.infer), 후처리(pix2pix_io.postprocess_output)
+시간을 따로 재서, 모델 밖에서 쓰는 시간이 전체에서 차지하는 비율을 보여준다.
+--legacy를 주면 이전 방식(cvtColor → PIL 리사이즈 → PIL 캔버스 붙여넣기 → transforms.Compose,
+후처리는 전체 512x512 변환 후 잘라내기 + cvtColor)도 함께 재고 결과가 같은지 확인한다.
+
+모델 파일이 없으면 forward 없이 전처리/후처리만 측정한다.
+
+--matrix를 주면 torch 엔진의 CPU 추론 설정(inference_mode, channels_last, torch.compile, bf16 autocast)과
+스레드 수, 배치 크기의 조합마다 forward 지연 시간과 처리량(이미지/초), fp32 eager 대비 최대 오차를 표로 출력한다.
+torch.compile 조합은 --compile을 줄 때만, bf16 조합은 CPU가 bf16을 지원할 때만(--bf16 force면 항상) 측정한다.
+
+사용 예시:
+
+    python benchmark_pix2pix.py --backend torch --sizes 512x128,1200x300,2400x600 --runs 20 --legacy
+    python benchmark_pix2pix.py --backend onnx --onnx checkpoints/signboard_pix2pix_v1/140_net_G.onnx
+    python benchmark_pix2pix.py --matrix --threads 1,2,4 --batches 1,4 --compile --runs 5
+"""
+
+import argparse
+import itertools
+import os
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from pix2pix_io import INPUT_SIZE, letterbox, new_input_batch, preprocess_into, postprocess_output
+
+
+def make_signboard(width: int, height: int) -> np.ndarray:
+    """측정용 간판 이미지 (배경색 + 테두리 + 글자, BGR)"""
+    img = np.full((height, width, 3), (40, 90, 200), dtype=np.uint8)
+    cv2.rectangle(img, (4, 4), (width - 5, height - 5), (230, 230, 230), max(2, height // 40))
+    scale = height / 60
+    cv2.putText(img, "OPENING SIGN", (width // 12, int(height * 0.7)), cv2.FONT_HERSHEY_SIMPLEX,
+                scale, (255, 255, 255), max(1, int(scale * 2)), cv2.LINE_AA)
+    return cv2.GaussianBlur(img, (3, 3), 0)
+
+
+def legacy_preprocess(img: np.ndarray) -> Tuple[np.ndarray, tuple]:
+    """이전 SignboardAIEngine.preprocess (PIL 캔버스 + transforms.Compose, torchvision이 없으면 같은 numpy 연산)"""
+    original_h, original_w = img.shape[:2]
+    new_h, new_w, pad_top, pad_left = letterbox(original_h, original_w)
+    pil_img = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)).resize((new_w, new_h), Image.LANCZOS)
+    padded_img = Image.new('RGB', (INPUT_SIZE, INPUT_SIZE), (0, 0, 0))
+    padded_img.paste(pil_img, (pad_left, pad_top))
+    try:
+        import torchvision.transforms as transforms
+        transform = transforms.Compose([
+            transforms.ToTensor(),
+            transforms.Normalize(mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5]),
+        ])
+        tensor = transform(padded_img).unsqueeze(0).numpy()
+    except ImportError:
+        tensor = ((np.asarray(padded_img).astype(np.float32) / 255.0 - 0.5) / 0.5).transpose(2, 0, 1)[np.newaxis]
+    return tensor, (original_h, original_w, new_h, new_w, pad_top, pad_left)
+
+
+def legacy_postprocess(output: np.ndarray, scale_info: tuple) -> np.ndarray:
+    """이전 SignboardAIEngine.postprocess (512x512 전체 변환 → 패딩 제거 → 리사이즈 → cvtColor)"""
+    original_h, original_w, resized_h, resized_w, pad_top, pad_left = scale_info
+    img_np = np.transpose(output[0], (1, 2, 0))
+    img_np = ((img_np + 1.0) * 127.5).clip(0, 255).astype(np.uint8)
+    if pad_top > 0 or pad_left > 0:
+        img_np = img_np[pad_top:pad_top + resized_h, pad_left:pad_left + resized_w]
+    img_np = cv2.resize(img_np, (original_w, original_h), interpolation=cv2.INTER_LANCZOS4)
+    return cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+
+
+def timed(fn: Callable, runs: int) -> Tuple[object, float]:
+    """fn을 runs번 실행한 평균 시간 (ms, 첫 실행 제외)"""
+    result = fn()
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    return result, (time.perf_counter() - t0) / runs * 1000
+
+
+def load_engine(backend: str, checkpoint: str, onnx_path: str, device: str):
+    """(engine, 설명) - 모델 파일이 없거나 로드할 수 없으면 (None, 이유)"""
+    if backend == "auto":
+        backend = "onnx" if Path(onnx_path).exists() else "torch"
+    path = onnx_path if backend == "onnx" else checkpoint
+    if not Path(path).exists():
+        return None, f"모델 파일 없음: {path}"
+    try:
+        if backend == "onnx":
+            from onnx_inference import ONNXSignboardEngine
+            return ONNXSignboardEngine(path), f"onnx ({path})"
+        from pix2pix_inference import SignboardAIEngine
+        engine = SignboardAIEngine(path, device=device)
+        return engine, f"torch ({path}, device={engine.device})"
+    except Exception as e:
+        return None, f"모델 로드 실패: {e}"
+
+
+def run(sizes: List[Tuple[int, int]], engine, runs: int, legacy: bool) -> None:
+    header = f"  {'크기':<11}{'전처리':>9}{'forward':>10}{'후처리':>9}{'모델 밖 비율':>13}"
+    if legacy:
+        header += f"{'이전 전처리':>12}{'이전 후처리':>12}{'결과 같음':>10}"
+    print(header)
+
+    buffer = new_input_batch(1)
+    for width, height in sizes:
+        img = make_signboard(width, height)
+        scale_info, pre_ms = timed(lambda: preprocess_into(img, buffer[0]), runs)
+
+        if engine is not None:
+            batch = buffer
+            if hasattr(engine, "new_input_batch"):  # torch 엔진: 입력 버퍼를 tensor로
+                batch, _ = engine.preprocess(img, out=engine.new_input_batch(1))
+            output, forward_ms = timed(lambda: engine.infer(batch), runs)
+            output = output.cpu().numpy() if hasattr(output, "cpu") else output
+        else:
+            output, forward_ms = np.tanh(buffer), 0.0  # forward 대신 입력을 [-1, 1] 출력처럼 사용
+
+        result, post_ms = timed(lambda: postprocess_output(output[0], scale_info), runs)
+        total = pre_ms + forward_ms + post_ms
+        line = (f"  {f'{width}x{height}':<11}{pre_ms:>8.1f}ms{forward_ms:>8.1f}ms{post_ms:>8.1f}ms"
+                f"{(pre_ms + post_ms) / total * 100:>12.1f}%")
+
+        if legacy:
+            (legacy_tensor, legacy_info), legacy_pre_ms = timed(lambda: legacy_preprocess(img), runs)
+            legacy_result, legacy_post_ms = timed(lambda: legacy_postprocess(output, legacy_info), runs)
+            same = np.array_equal(legacy_tensor, buffer) and np.array_equal(legacy_result, result)
+            line += f"{legacy_pre_ms:>10.1f}ms{legacy_post_ms:>10.1f}ms{'예' if same else '아니오':>10}"
+        print(line)
+
+
+def matrix_options(compile: bool, bf16: str) -> List[dict]:
+    """측정할 SignboardAIEngine 설정 조합 (첫 번째가 기준인 fp32 eager + no_grad)"""
+    from pix2pix_inference import cpu_supports_bf16
+
+    bf16_values = [False, True] if bf16 == "force" or (bf16 == "auto" and cpu_supports_bf16()) else [False]
+    return [
+        {"inference_mode": inference_mode, "channels_last": channels_last, "compile": use_compile, "bf16": use_bf16}
+        for use_compile, use_bf16, channels_last, inference_mode in itertools.product(
+            [False, True] if compile else [False], bf16_values, [False, True], [False, True])
+    ]
+
+
+def run_matrix(checkpoint: str, options_list: List[dict], threads: List[int], batches: List[int], runs: int) -> None:
+    """설정 × 스레드 수 × 배치 크기별 forward 지연 시간 / 처리량 / 기준 대비 최대 오차"""
+    import torch
+    from pix2pix_inference import SignboardAIEngine, configure_threads
+
+    print(f"  {'inference_mode':<16}{'channels_last':<15}{'compile':<9}{'bf16':<6}{'스레드':>6}{'배치':>6}"
+          f"{'첫 실행':>11}{'지연 시간':>12}{'이미지당':>11}{'처리량':>13}{'최대 오차':>11}")
+
+    img = make_signboard(1200, 300)
+    reference = {}
+    for options in options_list:
+        engine = SignboardAIEngine(checkpoint, device="cpu",
+                                   bf16="1" if options["bf16"] else "0",
+                                   **{key: options[key] for key in ("inference_mode", "channels_last", "compile")})
+        for thread_count, batch_size in itertools.product(threads, batches):
+            configure_threads(intra=thread_count, inter=0)
+            batch = engine.new_input_batch(batch_size)
+            for index in range(batch_size):
+                engine.preprocess(img, out=batch[index:index + 1])
+
+            t0 = time.perf_counter()
+            engine.infer(batch)  # 첫 실행 (torch.compile이면 컴파일 포함)
+            first_ms = (time.perf_counter() - t0) * 1000
+            output, forward_ms = timed(lambda: engine.infer(batch), runs)
+
+            output = output.float().contiguous().numpy()
+            base = reference.setdefault((thread_count, batch_size), output)
+            max_diff = float(np.abs(output - base).max())
+            print(f"  {str(options['inference_mode']):<16}{str(options['channels_last']):<15}"
+                  f"{str(engine.compiled):<9}{str(engine.bf16):<6}{torch.get_num_threads():>6}{batch_size:>6}"
+                  f"{first_ms:>9.0f}ms{forward_ms:>10.1f}ms{forward_ms / batch_size:>9.1f}ms"
+                  f"{batch_size / forward_ms * 1000:>9.2f}장/초{max_diff:>11.4f}")
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="pix2pix 전처리/forward/후처리 시간 측정")
+    parser.add_argument(
+        "--backend",
+        choices=["auto", "torch", "onnx"],
+        default="auto",
+        help="추론 엔진 (기본: auto, ONNX 모델이 있으면 onnx)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default="checkpoints/signboard_pix2pix_v1/140_net_G.pth",
+        help="torch 체크포인트 (기본: checkpoints/signboard_pix2pix_v1/140_net_G.pth)",
+    )
+    parser.add_argument(
+        "--onnx",
+        type=str,
+        default="checkpoints/signboard_pix2pix_v1/140_net_G.onnx",
+        help="ONNX 모델 (기본: checkpoints/signboard_pix2pix_v1/140_net_G.onnx)",
+    )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default=None,
+        help="torch 장치 (cpu / cuda, 기본: 자동)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        default="512x128,1200x300,2400x600,400x800",
+        help="간판 크기 목록 (가로x세로, 쉼표로 구분)",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=10,
+        help="크기별 반복 횟수 (기본: 10)",
+    )
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="이전 전처리/후처리 방식도 측정하고 결과 비교",
+    )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help="torch CPU 추론 설정 조합별 forward 지연 시간/처리량 측정 (--checkpoint 필요)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=str,
+        default=None,
+        help="--matrix 시 측정할 torch 연산 스레드 수 목록 (쉼표로 구분, 기본: 현재 값)",
+    )
+    parser.add_argument(
+        "--batches",
+        type=str,
+        default="1,4",
+        help="--matrix 시 측정할 배치 크기 목록 (쉼표로 구분, 기본: 1,4)",
+    )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="--matrix 시 torch.compile 조합도 측정 (조합마다 컴파일 시간이 걸림)",
+    )
+    parser.add_argument(
+        "--bf16",
+        choices=["auto", "force", "off"],
+        default="auto",
+        help="--matrix 시 bf16 autocast 조합 (auto: CPU가 지원할 때만, force: 항상, off: 측정 안 함)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    # 스크립트 디렉토리 기준으로 상대 경로 해석
+    os.chdir(Path(__file__).parent)
+
+    if args.matrix:
+        if not Path(args.checkpoint).exists():
+            print(f"[ERROR] 체크포인트 파일이 없습니다: {args.checkpoint}")
+            return
+        import torch
+        threads = [int(count) for count in args.threads.split(",")] if args.threads else [torch.get_num_threads()]
+        options_list = matrix_options(args.compile, args.bf16)
+        print(f"[INFO] torch {torch.__version__}, 설정 {len(options_list)}개 × 스레드 {threads} × 배치 {args.batches}")
+        run_matrix(args.checkpoint, options_list, threads, [int(size) for size in args.batches.split(",")], args.runs)
+        return
+
+    engine, description = load_engine(args.backend, args.checkpoint, args.onnx, args.device)
+    print(f"[INFO] 엔진: {description}" + ("" if engine else " → 전처리/후처리만 측정"))
+    run([parse_size(size) for size in args.sizes.split(",")], engine, args.runs, args.legacy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+pix2pix ONNX 모델 비교 스크립트 - fp32 vs INT8 (quantize_pix2pix.py 결과)의 속도/메모리/화질.
+
+보정에 쓰지 않은 seed로 Phase 1 간판(render_signboard 출력)을 만들어 두 모델로 enhance한 뒤 비교한다.
+
+- 속도: 이미지당 enhance 시간 (전처리/후처리 포함, 평균/p50/p95)
+- 메모리: 모델 파일 크기, 모델 로드 후 RSS 증가량, 추론 중 최대 RSS (모델마다 별도 프로세스에서 측정, Linux)
+- 화질: fp32 결과 대비 INT8 결과의 PSNR / SSIM (원본 크기 BGR, 이미지별 평균/최소)
+
+사용 예시:
+
+    python compare_pix2pix.py \
+        --fp32 checkpoints/signboard_pix2pix_v1/140_net_G.onnx \
+        --int8 checkpoints/signboard_pix2pix_v1/140_net_G_int8.onnx \
+        --samples 32
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from quantize_pix2pix import build_phase1_samples
+
+
+def _rss_mb(field: str = "VmRSS") -> Optional[float]:
+    """현재 프로세스의 메모리 사용량 (MB, /proc이 없으면 None)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def run_model(model: str, samples: List[np.ndarray], runs: int) -> dict:
+    """모델 하나로 모든 간판을 enhance (별도 프로세스에서 실행해 메모리를 따로 측정)"""
+    from onnx_inference import ONNXSignboardEngine
+
+    baseline = _rss_mb()
+    engine = ONNXSignboardEngine(model)
+    loaded = _rss_mb()
+    engine.enhance(samples[0])  # 첫 실행(메모리 할당 등) 제외
+
+    outputs, latencies = [], []
+    for img in samples:
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            result = engine.enhance(img)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        outputs.append(result)
+
+    return {
+        "outputs": outputs,
+        "latency_ms": latencies,
+        "file_mb": os.path.getsize(model) / 1024 / 1024,
+        "load_mb": loaded - baseline if baseline is not None else None,
+        "peak_mb": _rss_mb("VmHWM"),
+    }
+
+
+def psnr(reference: np.ndarray, image: np.ndarray) -> float:
+    mse = np.mean((reference.astype(np.float64) - image.astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+def ssim(reference: np.ndarray, image: np.ndarray) -> float:
+    """SSIM (Wang et al. 2004, 11x11 가우시안 σ=1.5, 채널별 평균)"""
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    x = reference.astype(np.float64)
+    y = image.astype(np.float64)
+
+    def blur(img):
+        return cv2.GaussianBlur(img, (11, 11), 1.5)
+
+    mu_x, mu_y = blur(x), blur(y)
+    sigma_x = blur(x * x) - mu_x ** 2
+    sigma_y = blur(y * y) - mu_y ** 2
+    sigma_xy = blur(x * y) - mu_x * mu_y
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * sigma_xy + c2)) / ((mu_x ** 2 + mu_y ** 2 + c1) * (sigma_x + sigma_y + c2))
+    return float(ssim_map.mean())
+
+
+def _format_mb(value: Optional[float]) -> str:
+    return f"{value:.0f}MB" if value is not None else "-"
+
+
+def report(fp32: dict, int8: dict) -> None:
+    print("\n[결과] fp32 vs INT8")
+    print(f"  {'':<18}{'fp32':>12}{'int8':>12}")
+    for label, stat in (("평균 (ms/이미지)", np.mean), ("p50", np.median), ("p95", lambda v: np.percentile(v, 95))):
+        print(f"  {label:<18}{stat(fp32['latency_ms']):>12.1f}{stat(int8['latency_ms']):>12.1f}")
+    print(f"  {'모델 파일':<18}{_format_mb(fp32['file_mb']):>12}{_format_mb(int8['file_mb']):>12}")
+    print(f"  {'로드 후 RSS 증가':<18}{_format_mb(fp32['load_mb']):>12}{_format_mb(int8['load_mb']):>12}")
+    print(f"  {'최대 RSS':<18}{_format_mb(fp32['peak_mb']):>12}{_format_mb(int8['peak_mb']):>12}")
+    print(f"  속도 향상: {np.mean(fp32['latency_ms']) / np.mean(int8['latency_ms']):.2f}x")
+
+    psnrs = [psnr(a, b) for a, b in zip(fp32["outputs"], int8["outputs"])]
+    ssims = [ssim(a, b) for a, b in zip(fp32["outputs"], int8["outputs"])]
+    print(f"  PSNR (fp32 기준): 평균 {np.mean(psnrs):.2f}dB, 최소 {np.min(psnrs):.2f}dB")
+    print(f"  SSIM (fp32 기준): 평균 {np.mean(ssims):.4f}, 최소 {np.min(ssims):.4f}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="pix2pix fp32 / INT8 모델 비교")
+    parser.add_argument(
+        "--fp32",
+        type=str,
+        default="checkpoints/signboard_pix2pix_v1/140_net_G.onnx",
+        help="fp32 ONNX 모델 (기본: checkpoints/signboard_pix2pix_v1/140_net_G.onnx)",
+    )
+    parser.add_argument(
+        "--int8",
+        type=str,
+        default="checkpoints/signboard_pix2pix_v1/140_net_G_int8.onnx",
+        help="INT8 ONNX 모델 (기본: checkpoints/signboard_pix2pix_v1/140_net_G_int8.onnx)",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=32,
+        help="평가용 간판 이미지 수 (기본: 32)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="평가 이미지 seed (기본: 1, 보정 seed와 다르게)",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=1,
+        help="이미지당 반복 횟수 (기본: 1)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    # 스크립트 디렉토리 기준으로 상대 경로 해석
+    os.chdir(Path(__file__).parent)
+
+    for path in (args.fp32, args.int8):
+        if not Path(path).exists():
+            print(f"[ERROR] 모델 파일이 없습니다: {path}")
+            sys.exit(1)
+
+    print(f"[INFO] 평가용 Phase 1 간판 {args.samples}장 생성 (seed={args.seed})")
+    samples = build_phase1_samples(args.samples, args.seed)
+
+    results = {}
+    for name, path in (("fp32", args.fp32), ("int8", args.int8)):
+        print(f"[INFO] {name} 실행: {path}")
+        # 모델마다 새 프로세스 (RSS/최대 RSS가 다른 모델의 영향을 받지 않도록)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[name] = executor.submit(run_model, path, samples, args.runs).result()
+
+    report(results["fp32"], results["int8"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+합성 연산 모듈 - uint8 고정소수점 alpha 블렌딩 / add / screen
+
+합성할 때마다 전체 프레임을 float32로 바꾸고 np.stack([m, m, m])으로 3채널 마스크를 만든 뒤
+다시 clip → uint8로 되돌리던 패턴을 대체한다.
+
+- 이미지는 uint8 (H, W, C), 마스크는 uint8 (H, W) 한 채널 (0 = 0.0, 255 = 1.0)
+- 마스크는 브로드캐스팅으로 모든 채널에 적용 (3채널 마스크를 만들지 않음)
+- 중간 계산은 uint16 고정소수점, 255로 나누는 부분은 반올림 (오차 ±0.5 LSB)
+- out 인자로 결과를 기존 배열에 바로 쓸 수 있음 (out=dst면 in-place)
+"""
+
+import numpy as np
+import cv2
+
+
+def as_mask(mask) -> np.ndarray:
+    """마스크를 uint8 (H, W) 한 채널로 변환
+
+    - bool: True → 255
+    - uint8: 그대로 (0~255)
+    - float: 0.0~1.0 범위로 보고 255배 후 반올림
+    - (H, W, 1) / (H, W, 3) 마스크는 첫 번째 채널만 사용 (모든 채널이 같다고 가정)
+    """
+    mask = np.asarray(mask)
+    if mask.ndim == 3:
+        mask = mask[:, :, 0]
+    if mask.dtype == np.uint8:
+        return mask
+    if mask.dtype == np.bool_:
+        return mask.astype(np.uint8) * np.uint8(255)
+    return cv2.convertScaleAbs(np.clip(mask, 0.0, 1.0).astype(np.float32), alpha=255.0)
+
+
+def _div255(acc: np.ndarray) -> np.ndarray:
+    """uint16 누산값을 255로 나눠 반올림 (in-place, acc <= 65025 + 255)"""
+    acc += 128
+    acc += acc >> 8
+    acc >>= 8
+    return acc
+
+
+def _expand(mask: np.ndarray, image: np.ndarray) -> np.ndarray:
+    """(H, W) 마스크를 (H, W, 1)로 바꿔 채널 방향 브로드캐스팅"""
+    if image.ndim == 3 and mask.ndim == 2:
+        return mask[:, :, np.newaxis]
+    return mask
+
+
+def _store(acc: np.ndarray, out: np.ndarray) -> np.ndarray:
+    if out is None:
+        return acc.astype(np.uint8)
+    np.copyto(out, acc, casting='unsafe')
+    return out
+
+
+def blend(dst: np.ndarray, src: np.ndarray, mask, out: np.ndarray = None) -> np.ndarray:
+    """alpha 블렌딩: dst * (1 - m) + src * m
+
+    Args:
+        dst, src: uint8 이미지 (같은 shape)
+        mask: uint8/bool/float 마스크 (H, W) - as_mask 참고
+        out: 결과를 쓸 배열 (None이면 새 배열, dst를 넘기면 in-place)
+    """
+    m = _expand(as_mask(mask), dst)
+    acc = dst.astype(np.uint16)
+    acc *= (255 - m)
+    tmp = src.astype(np.uint16)
+    tmp *= m
+    acc += tmp
+    return _store(_div255(acc), out)
+
+
+def premultiply(src: np.ndarray, mask, out: np.ndarray = None) -> np.ndarray:
+    """마스크 곱: src * m (premultiplied 레이어 생성)"""
+    m = _expand(as_mask(mask), src)
+    acc = src.astype(np.uint16)
+    acc *= m
+    return _store(_div255(acc), out)
+
+
+def blend_premultiplied(dst: np.ndarray, src_premul: np.ndarray, mask, out: np.ndarray = None) -> np.ndarray:
+    """premultiplied 레이어 합성: dst * (1 - m) + src_premul (포화 덧셈)"""
+    m = _expand(as_mask(mask), dst)
+    acc = dst.astype(np.uint16)
+    acc *= (255 - m)
+    _div255(acc)
+    acc += src_premul
+    np.minimum(acc, 255, out=acc)
+    return _store(acc, out)
+
+
+def add(dst: np.ndarray, src: np.ndarray, mask=None, out: np.ndarray = None) -> np.ndarray:
+    """포화 덧셈: dst + src * m (mask가 None이면 dst + src)"""
+    if mask is None:
+        return cv2.add(dst, src, dst=out)
+    return cv2.add(dst, premultiply(src, mask), dst=out)
+
+
+def screen(dst: np.ndarray, src: np.ndarray, mask=None, out: np.ndarray = None) -> np.ndarray:
+    """screen 합성: 255 - (255 - dst) * (255 - src * m) / 255"""
+    if mask is not None:
+        src = premultiply(src, mask)
+    acc = (255 - dst).astype(np.uint16)
+    acc *= (255 - src)
+    _div255(acc)
+    return _store(255 - acc, out)
+
+
+def scale(src: np.ndarray, factor: float, out: np.ndarray = None) -> np.ndarray:
+    """밝기 배율: src * factor (반올림, 255에서 포화)"""
+    return cv2.convertScaleAbs(src, dst=out, alpha=factor)
+
+
+def colorize(mask, color_bgr, gain: float = 1.0) -> np.ndarray:
+    """한 채널 강도 마스크를 색상 레이어로: mask * color * gain (uint8, 포화)
+
+    Args:
+        mask: float (0~1 강도) 또는 uint8 (0~255) 한 채널 마스크
+        color_bgr: (B, G, R) 색상
+        gain: 강도 배율
+    """
+    mask = np.asarray(mask)
+    if mask.dtype == np.uint8:
+        unit = 1.0 / 255.0
+    else:
+        mask = mask.astype(np.float32, copy=False)
+        unit = 1.0
+    channels = [cv2.convertScaleAbs(mask, alpha=float(c) * gain * unit) for c in color_bgr]
+    return cv2.merge(channels)
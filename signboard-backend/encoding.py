@@ -0,0 +1,186 @@
+"""
+응답 이미지 인코딩 - 출력 포맷(WebP/JPEG/PNG) 선택과 병렬 인코딩
+
+시뮬레이션 결과는 기본적으로 무손실 PNG(data URL)로 반환한다 (다운로드/시공 도면용).
+미리보기처럼 빠른 응답이 중요한 요청은 output_format 필드나 Accept 헤더로
+손실 포맷(WebP/JPEG)을 선택할 수 있다.
+
+- output_format 필드: "png", "png:1" (압축 레벨 0~9), "jpeg", "jpeg:80" (품질 1~100),
+  "webp", "webp:75", "webp:lossless"
+- Accept 헤더: image/webp, image/jpeg, image/png 중 q 값이 가장 높은 것 (필드가 없을 때만)
+- 주간/야간처럼 한 응답의 여러 이미지는 인코딩 스레드 풀에서 동시에 인코딩
+  (cv2.imencode는 GIL을 풀어줌)
+"""
+
+import os
+import time
+import base64
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# 요청에 포맷 지정이 없을 때 사용할 포맷 ("png", "jpeg:90" 등 output_format 문법)
+ENCODE_DEFAULT_FORMAT = os.getenv("ENCODE_DEFAULT_FORMAT", "png")
+# 손실 포맷 기본 품질
+ENCODE_JPEG_QUALITY = int(os.getenv("ENCODE_JPEG_QUALITY", "90"))
+ENCODE_WEBP_QUALITY = int(os.getenv("ENCODE_WEBP_QUALITY", "85"))
+# 인코딩 스레드 수 (주간/야간 동시 인코딩)
+ENCODE_THREADS = int(os.getenv("ENCODE_THREADS", "4"))
+
+FORMAT_ALIASES = {"png": "png", "jpeg": "jpeg", "jpg": "jpeg", "webp": "webp"}
+FORMAT_MIME = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+FORMAT_EXT = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+MIME_FORMAT = {mime: fmt for fmt, mime in FORMAT_MIME.items()}
+MIME_FORMAT["image/jpg"] = "jpeg"
+
+
+class OutputEncoding:
+    """출력 이미지 포맷 + 품질/압축 레벨
+
+    - png: level 0~9 (None이면 OpenCV 기본값)
+    - jpeg: quality 1~100
+    - webp: quality 1~100, lossless=True면 무손실
+    """
+
+    def __init__(self, fmt: str = "png", quality: int = None, level: int = None, lossless: bool = False):
+        self.format = fmt
+        self.quality = quality
+        self.level = level
+        self.lossless = lossless
+
+    @property
+    def mime(self) -> str:
+        return FORMAT_MIME[self.format]
+
+    @property
+    def is_lossless(self) -> bool:
+        return self.format == "png" or (self.format == "webp" and self.lossless)
+
+    def imencode_params(self) -> list:
+        """cv2.imencode 파라미터"""
+        if self.format == "png":
+            return [] if self.level is None else [cv2.IMWRITE_PNG_COMPRESSION, self.level]
+        if self.format == "jpeg":
+            return [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        # OpenCV WebP: 품질 100 초과면 무손실
+        return [cv2.IMWRITE_WEBP_QUALITY, 101 if self.lossless else self.quality]
+
+    def describe(self) -> dict:
+        """응답에 포함할 포맷 정보"""
+        info = {"format": self.format, "mime": self.mime, "lossless": self.is_lossless}
+        if self.format == "png":
+            if self.level is not None:
+                info["level"] = self.level
+        elif not self.lossless:
+            info["quality"] = self.quality
+        return info
+
+    def __repr__(self):
+        return f"OutputEncoding({self.describe()})"
+
+
+def parse_output_format(value: str) -> OutputEncoding:
+    """output_format 문자열 파싱 ("webp", "jpeg:80", "png:1", "webp:lossless")
+
+    Raises:
+        ValueError: 지원하지 않는 포맷 또는 잘못된 품질/레벨
+    """
+    name, _, option = value.strip().lower().partition(":")
+    fmt = FORMAT_ALIASES.get(name)
+    if fmt is None:
+        raise ValueError(f"지원하지 않는 출력 포맷: {value} (png, jpeg, webp)")
+
+    if fmt == "png":
+        if not option:
+            return OutputEncoding("png")
+        level = int(option)
+        if not 0 <= level <= 9:
+            raise ValueError(f"PNG 압축 레벨은 0~9: {value}")
+        return OutputEncoding("png", level=level)
+
+    if fmt == "webp" and option == "lossless":
+        return OutputEncoding("webp", lossless=True)
+
+    quality = int(option) if option else (ENCODE_JPEG_QUALITY if fmt == "jpeg" else ENCODE_WEBP_QUALITY)
+    if not 1 <= quality <= 100:
+        raise ValueError(f"품질은 1~100: {value}")
+    return OutputEncoding(fmt, quality=quality)
+
+
+def _accept_formats(accept: str):
+    """Accept 헤더에서 지원하는 이미지 포맷을 q 값 내림차순으로 (같은 q는 헤더 순서대로)"""
+    candidates = []
+    for order, part in enumerate(accept.split(",")):
+        media, *params = [p.strip() for p in part.split(";")]
+        fmt = MIME_FORMAT.get(media.lower())
+        if fmt is None:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, val = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, order, fmt))
+    return [fmt for _, _, fmt in sorted(candidates)]
+
+
+def negotiate_encoding(output_format: str = None, accept: str = None) -> OutputEncoding:
+    """요청 필드 → Accept 헤더 → ENCODE_DEFAULT_FORMAT 순서로 출력 포맷 결정
+
+    Raises:
+        ValueError: output_format 필드가 잘못된 경우 (Accept 헤더의 알 수 없는 값은 무시)
+    """
+    if output_format:
+        return parse_output_format(output_format)
+    if accept:
+        formats = _accept_formats(accept)
+        if formats:
+            return parse_output_format(formats[0])
+    return parse_output_format(ENCODE_DEFAULT_FORMAT)
+
+
+def encode_image(image: np.ndarray, encoding: OutputEncoding) -> bytes:
+    """이미지를 지정 포맷 bytes로 인코딩"""
+    if encoding.format == "jpeg" and image.ndim == 3 and image.shape[2] == 4:
+        # JPEG은 알파 채널이 없음
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    ok, buffer = cv2.imencode(FORMAT_EXT[encoding.format], image, encoding.imencode_params())
+    if not ok:
+        raise ValueError(f"이미지 인코딩 실패: {encoding}")
+    return buffer.tobytes()
+
+
+def to_data_url(data: bytes, encoding: OutputEncoding) -> str:
+    """인코딩된 bytes를 data URL 문자열로"""
+    return f"data:{encoding.mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+# 프로세스 전역 인코딩 스레드 풀 (렌더 풀 워커가 결과 이미지를 동시에 인코딩할 때 사용)
+encode_executor = ThreadPoolExecutor(max_workers=max(1, ENCODE_THREADS), thread_name_prefix="encode")
+
+
+def encode_images(images: dict, encoding: OutputEncoding):
+    """여러 이미지를 동시에 인코딩해 data URL로 변환
+
+    Args:
+        images: {응답 키: 이미지}
+        encoding: 출력 포맷
+
+    Returns:
+        ({응답 키: data URL}, 응답에 넣을 인코딩 정보 dict)
+    """
+    t0 = time.perf_counter()
+    futures = {key: encode_executor.submit(encode_image, image, encoding) for key, image in images.items()}
+    encoded = {key: future.result() for key, future in futures.items()}
+    info = encoding.describe()
+    info["bytes"] = {key: len(data) for key, data in encoded.items()}
+    info["encode_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return {key: to_data_url(data, encoding) for key, data in encoded.items()}, info
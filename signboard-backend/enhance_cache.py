@@ -0,0 +1,209 @@
+"""
+pix2pix 결과 캐시 - 같은 Phase 1 간판은 generator를 다시 실행하지 않음
+
+디자인을 다시 열거나 조명만 바꾼 /api/generate-hq 요청은 pix2pix 입력(Phase 1 간판)이 바이트 단위로 같다.
+EnhanceCache는 engine.enhance 앞에서 (입력 이미지 해시, 모델 버전)을 키로 결과를 재사용한다.
+
+- 메모리: 용량 한도 LRU (ENHANCE_CACHE_MAX_MB, TextRasterCache)
+- 디스크: ENHANCE_CACHE_DIR/<모델 버전>/<키>.npz (압축 배열), 서버를 재시작해도 유지,
+  ENHANCE_CACHE_DISK_MB를 넘으면 오래 안 쓴 파일부터 삭제 (0이면 디스크 캐시 사용 안 함)
+- 모델 버전 = 체크포인트 파일(크기, 수정 시각, 앞/뒤 1MB 해시) + 추론 설정(백엔드, 정밀도, 타일 추론 등),
+  체크포인트가 바뀌면 키가 달라지고, 오래 쓰지 않은 이전 버전 디렉토리(ENHANCE_CACHE_STALE_DAYS)는 시작할 때 삭제
+  (버전 해시 형식의 디렉토리만 삭제하므로 다른 파일과 같은 위치를 써도 안전, 설정이 다른 프로세스끼리는 서로 지우지 않음)
+- 반환값은 호출자가 수정할 수 있도록 복사본
+"""
+
+import os
+import io
+import re
+import time
+import shutil
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+from text_cache import TextRasterCache
+
+logger = logging.getLogger(__name__)
+
+# 메모리 캐시 한도 (MB)
+ENHANCE_CACHE_MAX_MB = float(os.getenv("ENHANCE_CACHE_MAX_MB", "256"))
+# 디스크 캐시 위치와 한도 (MB, 0이면 디스크 캐시 사용 안 함)
+ENHANCE_CACHE_DIR = os.getenv("ENHANCE_CACHE_DIR", os.path.join(os.path.dirname(__file__), "cache", "enhance"))
+ENHANCE_CACHE_DISK_MB = float(os.getenv("ENHANCE_CACHE_DISK_MB", "2048"))
+# 이 기간(일) 동안 쓰지 않은 다른 버전 디렉토리는 시작할 때 삭제
+ENHANCE_CACHE_STALE_DAYS = float(os.getenv("ENHANCE_CACHE_STALE_DAYS", "7"))
+
+# 모델 파일 지문에 사용할 앞/뒤 샘플 크기
+_FINGERPRINT_SAMPLE = 1024 * 1024
+# model_version이 만드는 디렉토리 이름 (blake2b digest_size=8 → 16자리 16진수)
+_VERSION_DIR = re.compile(r"[0-9a-f]{16}")
+
+
+def model_version(model_path: str, *settings) -> str:
+    """모델 파일과 추론 설정의 버전 문자열 (파일 전체를 읽지 않는 지문)"""
+    digest = hashlib.blake2b(digest_size=8)
+    stat = os.stat(model_path)
+    digest.update(f"{os.path.basename(model_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(model_path, "rb") as f:
+        digest.update(f.read(_FINGERPRINT_SAMPLE))
+        if stat.st_size > _FINGERPRINT_SAMPLE:
+            f.seek(max(_FINGERPRINT_SAMPLE, stat.st_size - _FINGERPRINT_SAMPLE))
+            digest.update(f.read())
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
+
+def image_key(img: np.ndarray) -> str:
+    """입력 이미지 내용 해시 (shape, dtype 포함)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{img.shape}:{img.dtype}".encode())
+    digest.update(np.ascontiguousarray(img).data)
+    return digest.hexdigest()
+
+
+def _last_used(path: str) -> float:
+    """버전 디렉토리의 마지막 사용 시각 (디렉토리와 결과 파일의 수정 시각 중 최신, 히트 시 파일 시각 갱신)"""
+    try:
+        return max([os.path.getmtime(path)] + [entry.stat().st_mtime for entry in os.scandir(path)])
+    except OSError:
+        return time.time()
+
+
+class EnhanceCache:
+    """engine 앞단의 결과 캐시 (engine.enhance와 같은 인터페이스)"""
+
+    def __init__(self, engine, version: str, max_mb: float = ENHANCE_CACHE_MAX_MB,
+                 cache_dir: str = ENHANCE_CACHE_DIR, disk_mb: float = ENHANCE_CACHE_DISK_MB):
+        self.engine = engine
+        self.version = version
+        self.memory = TextRasterCache(int(max_mb * 1024 * 1024))
+        self.disk_max_bytes = int(disk_mb * 1024 * 1024)
+        self.dir = os.path.join(cache_dir, version) if self.disk_max_bytes > 0 else None
+        self._lock = threading.Lock()
+        self.disk_bytes = 0
+        self.disk_hits = 0
+        self.disk_writes = 0
+        self.disk_evictions = 0
+        self.enhanced = 0
+        self.enhance_ms_total = 0.0
+        if self.dir:
+            self._prepare_dir(cache_dir)
+        logger.info(f"[pix2pix 캐시] 사용: version={version}, memory={max_mb:g}MB, "
+                    f"disk={self.dir or '사용 안 함'} ({self.disk_bytes / 1024 / 1024:.1f}MB)")
+
+    def _prepare_dir(self, cache_dir: str):
+        """현재 버전 디렉토리 생성, 오래 쓰지 않은 다른 버전 디렉토리 삭제, 사용량 계산
+
+        버전 해시 형식이 아닌 항목(다른 캐시, 사용자 파일)은 건드리지 않고, 다른 설정으로 실행 중인
+        프로세스의 버전 디렉토리는 최근에 쓰였으므로 ENHANCE_CACHE_STALE_DAYS가 지나기 전에는 삭제하지 않는다.
+        """
+        os.makedirs(self.dir, exist_ok=True)
+        stale_before = time.time() - ENHANCE_CACHE_STALE_DAYS * 86400
+        for entry in os.scandir(cache_dir):
+            if entry.name == self.version or not _VERSION_DIR.fullmatch(entry.name) or not entry.is_dir():
+                continue
+            if _last_used(entry.path) < stale_before:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                logger.info(f"[pix2pix 캐시] 오래된 모델 버전 캐시 삭제: {entry.name}")
+        self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.dir) if entry.name.endswith(".npz"))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir, f"{key}.npz")
+
+    def _load(self, key: str):
+        """디스크에서 결과 읽기 (없거나 손상되었으면 None)"""
+        if not self.dir:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                result = data["result"]
+            os.utime(path)  # 최근 사용 시각 갱신 (디스크 LRU)
+        except (OSError, KeyError, ValueError):
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        return result
+
+    def _store(self, key: str, result: np.ndarray):
+        """결과를 디스크에 압축 저장 (임시 파일에 쓴 뒤 교체), 한도를 넘으면 오래된 파일 삭제"""
+        if not self.dir:
+            return
+        path = self._path(key)
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, result=result)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(buffer.getbuffer())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[pix2pix 캐시] 디스크 저장 실패: {e}")
+            return
+        with self._lock:
+            self.disk_writes += 1
+            self.disk_bytes += buffer.getbuffer().nbytes
+            over = self.disk_bytes > self.disk_max_bytes
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """오래 안 쓴 파일부터 삭제해 한도의 90% 이하로"""
+        entries = sorted((entry for entry in os.scandir(self.dir) if entry.name.endswith(".npz")),
+                         key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        target = self.disk_max_bytes * 0.9
+        evicted = 0
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        with self._lock:
+            self.disk_bytes = total
+            self.disk_evictions += evicted
+
+    def _load_or_enhance(self, key: str, img: np.ndarray) -> np.ndarray:
+        result = self._load(key)
+        if result is not None:
+            return result
+        t0 = time.perf_counter()
+        result = self.engine.enhance(img)
+        with self._lock:
+            self.enhanced += 1
+            self.enhance_ms_total += (time.perf_counter() - t0) * 1000
+        self._store(key, result)
+        return result
+
+    def enhance(self, phase1_signboard: np.ndarray) -> np.ndarray:
+        """engine.enhance와 같음 (같은 입력 + 같은 모델이면 캐시된 결과의 복사본)"""
+        key = image_key(phase1_signboard)
+        result = self.memory.get_or_render(key, lambda: self._load_or_enhance(key, phase1_signboard))
+        return result.copy()
+
+    def stats(self) -> dict:
+        """메모리/디스크 히트 통계 (/ 엔드포인트용)"""
+        memory = self.memory.stats()
+        with self._lock:
+            return {
+                "version": self.version,
+                "memory": memory,
+                "disk": {
+                    "dir": self.dir,
+                    "bytes": self.disk_bytes,
+                    "max_bytes": self.disk_max_bytes,
+                    "hits": self.disk_hits,
+                    "writes": self.disk_writes,
+                    "evictions": self.disk_evictions,
+                } if self.dir else None,
+                "enhanced": self.enhanced,
+                "mean_enhance_ms": round(self.enhance_ms_total / self.enhanced, 1) if self.enhanced else 0.0,
+            }
@@ -0,0 +1,128 @@
+"""
+pix2pix generator 체크포인트(.pth)를 ONNX 모델(.onnx)로 변환하는 스크립트.
+
+변환한 모델은 onnx_inference.ONNXSignboardEngine이 onnxruntime으로 실행하므로
+서버에는 torch 없이 onnxruntime만 설치하면 된다 (변환할 때만 torch 필요).
+
+사용 예시:
+
+    python export_onnx.py \
+        --checkpoint checkpoints/signboard_pix2pix_v1/140_net_G.pth \
+        --output checkpoints/signboard_pix2pix_v1/140_net_G.onnx \
+        --verify
+
+--verify: 같은 입력으로 torch와 onnxruntime 결과의 최대 오차와 이미지당 추론 시간을 비교한다.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from pix2pix_inference import SignboardAIEngine
+from pix2pix_io import INPUT_SIZE
+
+
+def export(checkpoint: Path, output: Path, opset: int) -> SignboardAIEngine:
+    """체크포인트를 CPU로 로드해 ONNX로 저장 (배치 차원은 가변)"""
+    # CPU 튜닝 설정(PIX2PIX_CHANNELS_LAST / PIX2PIX_COMPILE / PIX2PIX_BF16)과 무관하게 fp32 eager 모델로 변환
+    engine = SignboardAIEngine(str(checkpoint), device="cpu", channels_last=False, compile=False, bf16="0")
+    dummy = torch.randn(1, 3, INPUT_SIZE, INPUT_SIZE)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            engine.model,
+            dummy,
+            str(output),
+            input_names=["input"],
+            output_names=["output"],
+            dynamic_axes={"input": {0: "batch"}, "output": {0: "batch"}},
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    print(f"[INFO] 변환 완료: {output} ({output.stat().st_size / 1024 / 1024:.1f}MB)")
+    return engine
+
+
+def verify(engine: SignboardAIEngine, output: Path, runs: int) -> None:
+    """torch와 onnxruntime 결과/속도 비교"""
+    from onnx_inference import ONNXSignboardEngine
+
+    onnx_engine = ONNXSignboardEngine(str(output))
+    batch = np.random.default_rng(0).uniform(-1, 1, (1, 3, INPUT_SIZE, INPUT_SIZE)).astype(np.float32)
+
+    def timed(fn):
+        fn()  # 첫 실행(메모리 할당 등) 제외
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            result = fn()
+        return result, (time.perf_counter() - t0) / runs * 1000
+
+    with torch.no_grad():
+        torch_out, torch_ms = timed(lambda: engine.model(torch.from_numpy(batch)).numpy())
+    onnx_out, onnx_ms = timed(lambda: onnx_engine.infer(batch))
+
+    diff = np.abs(torch_out - onnx_out)
+    print("[INFO] 검증 결과")
+    print(f"  - 최대 오차: {diff.max():.6f} (평균 {diff.mean():.6f}, 출력 범위 [-1, 1])")
+    print(f"  - torch      : {torch_ms:.1f}ms/이미지")
+    print(f"  - onnxruntime: {onnx_ms:.1f}ms/이미지")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="pix2pix generator ONNX 변환")
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default="checkpoints/signboard_pix2pix_v1/140_net_G.pth",
+        help="변환할 체크포인트 (기본: checkpoints/signboard_pix2pix_v1/140_net_G.pth)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="저장할 ONNX 파일 경로 (기본: 체크포인트와 같은 위치의 .onnx)",
+    )
+    parser.add_argument(
+        "--opset",
+        type=int,
+        default=17,
+        help="ONNX opset 버전 (기본: 17)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="변환 후 onnxruntime으로 실행해 torch 결과와 비교",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="--verify 시 속도 측정 반복 횟수 (기본: 5)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    # 스크립트 디렉토리 기준으로 상대 경로 해석
+    os.chdir(Path(__file__).parent)
+
+    checkpoint = Path(args.checkpoint).resolve()
+    output = Path(args.output).resolve() if args.output else checkpoint.with_suffix(".onnx")
+    if not checkpoint.exists():
+        print(f"[ERROR] 체크포인트 파일이 없습니다: {checkpoint}")
+        sys.exit(1)
+
+    engine = export(checkpoint, output, args.opset)
+    if args.verify:
+        verify(engine, output, args.runs)
+
+
+if __name__ == "__main__":
+    main()
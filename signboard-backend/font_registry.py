@@ -0,0 +1,315 @@
+"""
+한글 폰트 레지스트리 - 폰트 파일 인덱싱 및 FreeTypeFont LRU 캐시
+
+서버 시작 시 플랫폼별 후보 경로를 한 번만 확인해서 (family, 굵기)별 폰트 파일을 인덱싱하고,
+로드한 FreeTypeFont 객체를 (family, 굵기, size) 키로 캐시한다.
+렌더링마다 os.path.exists / TTF 재로딩 / 테스트 렌더링을 반복하지 않기 위함.
+"""
+
+import os
+import math
+import platform
+import logging
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+# 캐시할 최대 폰트 객체 수 (family × 굵기 × size 조합)
+FONT_CACHE_SIZE = int(os.getenv("FONT_CACHE_SIZE", "128"))
+
+WINDOWS_FONTS_DIR = "C:/Windows/Fonts"
+NANUM_DIR = "/usr/share/fonts/truetype/nanum"
+
+# Linux/macOS 공통 폴백 폰트
+UNIX_FALLBACK_FONTS = [
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/AppleGothic.ttf",  # macOS
+]
+
+
+def parse_font_weight(font_weight) -> int:
+    """font_weight를 숫자로 변환 (100-900)
+
+    "regular" → 400, "bold" → 700, "100"~"900" 또는 int → 100-900 범위로 제한
+    """
+    weight_num = 400  # 기본값: regular
+    if isinstance(font_weight, str):
+        if font_weight == "regular":
+            weight_num = 400
+        elif font_weight == "bold":
+            weight_num = 700
+        elif font_weight.isdigit():
+            weight_num = max(100, min(900, int(font_weight)))
+    elif isinstance(font_weight, int):
+        weight_num = max(100, min(900, font_weight))
+    return weight_num
+
+
+def is_bold_weight(font_weight) -> bool:
+    """굵기 범위를 regular/bold로 매핑 (600 이상이면 bold)"""
+    return parse_font_weight(font_weight) >= 600
+
+
+def _windows_candidates(font_family: str, is_bold: bool) -> list:
+    fonts_dir = WINDOWS_FONTS_DIR
+    if font_family == "malgun":
+        # 맑은 고딕: 여러 볼드 파일명 시도
+        if is_bold:
+            return [
+                f"{fonts_dir}/malgunbd.ttf",  # 맑은 고딕 Bold
+                f"{fonts_dir}/malgunb.ttf",   # 대체 이름
+                f"{fonts_dir}/malgun.ttf",    # 폴백: 일반 폰트
+            ]
+        return [f"{fonts_dir}/malgun.ttf"]
+    if font_family == "nanumgothic":
+        if is_bold:
+            return [f"{fonts_dir}/NanumGothicBold.ttf", f"{fonts_dir}/NanumGothic.ttf"]
+        return [f"{fonts_dir}/NanumGothic.ttf"]
+    if font_family == "nanumbarungothic":
+        if is_bold:
+            return [f"{fonts_dir}/NanumBarunGothicBold.ttf", f"{fonts_dir}/NanumBarunGothic.ttf"]
+        return [f"{fonts_dir}/NanumBarunGothic.ttf"]
+    if font_family == "gulim":
+        # TTC 파일: 인덱스 0=일반, 1=볼드 (일부 시스템)
+        return [f"{fonts_dir}/gulim.ttc"]
+    if font_family == "batang":
+        return [f"{fonts_dir}/batang.ttc"]
+    # 기본값: 맑은 고딕
+    if is_bold:
+        return [f"{fonts_dir}/malgunbd.ttf", f"{fonts_dir}/malgun.ttf"]
+    return [f"{fonts_dir}/malgun.ttf"]
+
+
+def _unix_candidates(font_family: str, is_bold: bool) -> list:
+    if font_family == "nanumbarungothic":
+        if is_bold:
+            paths = [f"{NANUM_DIR}/NanumBarunGothicBold.ttf", f"{NANUM_DIR}/NanumBarunGothic.ttf"]
+        else:
+            paths = [f"{NANUM_DIR}/NanumBarunGothic.ttf"]
+    else:
+        # nanumgothic 및 기본값: 나눔고딕
+        if is_bold:
+            paths = [f"{NANUM_DIR}/NanumGothicBold.ttf", f"{NANUM_DIR}/NanumGothic.ttf"]
+        else:
+            paths = [f"{NANUM_DIR}/NanumGothic.ttf", "/usr/share/fonts/TTF/NanumGothic.ttf"]
+    return paths + UNIX_FALLBACK_FONTS
+
+
+class FontRegistry:
+    """한글 폰트 파일 인덱스 + FreeTypeFont LRU 캐시 (프로세스 전역)"""
+
+    FAMILIES = ["malgun", "nanumgothic", "nanumbarungothic", "gulim", "batang"]
+
+    def __init__(self, max_fonts: int = FONT_CACHE_SIZE):
+        self.max_fonts = max_fonts
+        self.is_windows = platform.system() == "Windows"
+        self._lock = threading.Lock()
+        self._fonts = OrderedDict()  # (family, is_bold, size) -> FreeTypeFont
+        self._index = {}  # (family, is_bold) -> [폰트 파일 경로, ...] (존재하는 파일만)
+        self._exists = {}  # 경로 -> 존재 여부 (인덱싱 시 1회만 확인)
+        self._broken = set()  # 로드에 실패한 (경로, ttc 인덱스)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        for family in self.FAMILIES:
+            for is_bold in (False, True):
+                self._resolve(family, is_bold)
+        logger.info(f"[폰트] 폰트 인덱싱 완료: {self.indexed_files()}")
+
+    def _candidates(self, font_family: str, is_bold: bool) -> list:
+        if self.is_windows:
+            return _windows_candidates(font_family, is_bold)
+        return _unix_candidates(font_family, is_bold)
+
+    def _resolve(self, font_family: str, is_bold: bool) -> list:
+        """(family, 굵기)에 해당하는 실제 존재하는 폰트 파일 목록 (우선순위 순)"""
+        key = (font_family, is_bold)
+        paths = self._index.get(key)
+        if paths is None:
+            paths = []
+            for path in self._candidates(font_family, is_bold):
+                if path not in self._exists:
+                    self._exists[path] = os.path.exists(path)
+                if self._exists[path]:
+                    paths.append(path)
+            self._index[key] = paths
+        return paths
+
+    def indexed_files(self) -> dict:
+        """인덱싱된 폰트 파일 (family/굵기 → 첫 번째 후보)"""
+        return {
+            f"{family}/{'bold' if is_bold else 'regular'}": (paths[0] if paths else None)
+            for (family, is_bold), paths in self._index.items()
+        }
+
+    def _load(self, font_path: str, font_size: int, is_bold: bool):
+        """폰트 파일 로드 (TTC는 볼드 인덱스 시도 후 기본 인덱스로 폴백)"""
+        if font_path.endswith('.ttc'):
+            ttc_index = 1 if is_bold else 0
+            if (font_path, ttc_index) not in self._broken:
+                try:
+                    return ImageFont.truetype(font_path, font_size, index=ttc_index)
+                except Exception:
+                    # 인덱스 지정 실패 시 기본 인덱스 사용 (다음부터는 바로 기본 인덱스)
+                    self._broken.add((font_path, ttc_index))
+        return ImageFont.truetype(font_path, font_size)
+
+    def get_font(self, font_size: int, font_family: str = "malgun", font_weight: str = "400"):
+        """캐시된 FreeTypeFont 반환 (없으면 로드 후 캐시)"""
+        is_bold = is_bold_weight(font_weight)
+        key = (font_family, is_bold, int(font_size))
+
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+            paths = self._resolve(font_family, is_bold)
+
+        font = None
+        for font_path in paths:
+            if (font_path, None) in self._broken:
+                continue
+            try:
+                loaded = self._load(font_path, int(font_size), is_bold)
+                # 폰트 테스트 (캐시 미스 시 1회만)
+                loaded.getmask("테스트")
+                font = loaded
+                break
+            except Exception as e:
+                logger.warning(f"[폰트] 폰트 로드 실패: {font_path}, 오류: {e}")
+                self._broken.add((font_path, None))
+
+        if font is None:
+            # 모든 폰트 로드 실패 시 기본 폰트 반환
+            logger.warning(f"[폰트] 폰트를 찾을 수 없음: family={font_family}, weight={font_weight}")
+            font = ImageFont.load_default()
+
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+                self.evictions += 1
+        return font
+
+    def stats(self) -> dict:
+        """캐시 히트/미스 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "cached_fonts": len(self._fonts),
+                "max_fonts": self.max_fonts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def clear(self):
+        """폰트 캐시 비우기 (인덱스는 유지)"""
+        with self._lock:
+            self._fonts.clear()
+
+
+# 프로세스 전역 레지스트리 (import 시점 = 서버 시작 시 1회 인덱싱)
+font_registry = FontRegistry()
+
+
+def measure_text(text: str, font, text_direction: str = "horizontal") -> tuple:
+    """(0, 0) 기준 텍스트 bbox 측정 (세로쓰기는 글자마다 줄바꿈)"""
+    draw = ImageDraw.Draw(Image.new('L', (1, 1)))
+    if text_direction == "vertical":
+        return draw.multiline_textbbox((0, 0), '\n'.join(list(text)), font=font)
+    return draw.textbbox((0, 0), text, font=font)
+
+
+def fit_text_font(text: str, max_width: int, max_height: int, font_size: int,
+                  font_family: str = "malgun", font_weight: str = "400",
+                  text_direction: str = "horizontal", min_font_size: int = 20, step: int = 2):
+    """영역 안에 들어가는 가장 큰 폰트 크기 찾기
+
+    font_size, font_size - step, font_size - 2*step, ... (min_font_size 이상) 중
+    텍스트가 max_width x max_height 안에 들어가는 가장 큰 크기를 고른다.
+    하나씩 줄여가며 측정하는 대신, 텍스트 크기가 폰트 크기에 거의 비례한다는 점을 이용해
+    첫 측정값으로 크기를 추정한 뒤 그 주변에서 이진 탐색한다.
+    어떤 후보도 들어가지 않으면 min_font_size를 사용한다.
+
+    Returns:
+        (font, metrics) - metrics: {"font_size", "bbox", "text_width", "text_height", "measurements"}
+    """
+    measured = {}  # 후보 인덱스 k (크기 = font_size - k * step) -> (font, bbox)
+
+    def measure(size):
+        font = font_registry.get_font(size, font_family, font_weight)
+        return font, measure_text(text, font, text_direction)
+
+    def fits(k):
+        if k not in measured:
+            measured[k] = measure(font_size - k * step)
+        bbox = measured[k][1]
+        return bbox[2] - bbox[0] <= max_width and bbox[3] - bbox[1] <= max_height
+
+    def result(size, font, bbox):
+        return font, {
+            "font_size": size,
+            "bbox": tuple(bbox),
+            "text_width": bbox[2] - bbox[0],
+            "text_height": bbox[3] - bbox[1],
+            "measurements": len(measured),
+        }
+
+    last = (font_size - min_font_size) // step if font_size >= min_font_size else -1
+    if last >= 0 and fits(0):
+        return result(font_size, *measured[0])
+
+    # lo: 안 들어가는 것이 확인된 후보, hi: 들어가는 후보 (last + 1 = 최소 크기로 폴백)
+    lo, hi = 0, last + 1
+    if last >= 1:
+        # 선형 모델로 첫 추정: 크기 비율만큼 폰트를 줄임
+        bbox = measured[0][1]
+        text_w = max(1, bbox[2] - bbox[0])
+        text_h = max(1, bbox[3] - bbox[1])
+        ratio = min(max_width / text_w, max_height / text_h)
+        guess = int(math.ceil((font_size - font_size * ratio) / step))
+        guess = max(1, min(last, guess))
+
+        # 추정값에서 양쪽으로 보폭을 늘려가며 경계를 감쌈
+        if fits(guess):
+            hi = guess
+            gallop = 1
+            while hi - gallop > lo:
+                if fits(hi - gallop):
+                    hi -= gallop
+                    gallop *= 2
+                else:
+                    lo = hi - gallop
+                    break
+        else:
+            lo = guess
+            gallop = 1
+            while lo + gallop < hi:
+                if fits(lo + gallop):
+                    hi = lo + gallop
+                    break
+                lo += gallop
+                gallop *= 2
+
+    # 경계 안에서 이진 탐색
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if fits(mid):
+            hi = mid
+        else:
+            lo = mid
+
+    if hi <= last:
+        return result(font_size - hi * step, *measured[hi])
+    font, bbox = measure(min_font_size)
+    return result(min_font_size, font, bbox)
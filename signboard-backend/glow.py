@@ -0,0 +1,309 @@
+"""
+후광(glow) 엔진 - 넓은 후광 blur를 이미지 피라미드에서 계산
+
+후광채널/전후광채널의 큰 이미지용 후광은 141x141, 141x141, 121x121 (sigma 70/70/60)
+Gaussian blur를 세 번 연속으로 적용한다. 원본 해상도에서 그대로 계산하면
+야간 렌더링에서 가장 비싼 연산이므로, 마스크를 cv2.pyrDown으로 축소한 뒤
+같은 blur를 축소 비율만큼 작은 커널로 적용하고 cv2.pyrUp으로 원래 크기로 되돌린다.
+결과 falloff는 원본 해상도 계산과 GLOW_TOLERANCE 이내로 같다 (python glow.py로 확인).
+
+같은 마스크(같은 텍스트 레이어)에 대한 후광은 마스크 해시로 캐시한다.
+
+미리보기 렌더링(축소 사진)에서는 set_glow_scale로 배율을 지정하면 blur 커널/sigma와
+큰/작은 후광 선택 기준 면적을 같은 배율로 맞춰, 원본 렌더링과 같은 모양의 후광을
+축소된 픽셀 수만큼 싸게 계산한다.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+
+import numpy as np
+import cv2
+
+import compositing
+from text_cache import TextRasterCache
+
+logger = logging.getLogger(__name__)
+
+# 후광 캐시 메모리 한도 (MB)
+GLOW_CACHE_MAX_MB = float(os.getenv("GLOW_CACHE_MAX_MB", "64"))
+
+# 가장 작은 sigma가 이 값 이상인 blur만 피라미드에서 계산 (작은 후광은 원본 해상도 그대로)
+GLOW_PYRAMID_MIN_SIGMA = float(os.getenv("GLOW_PYRAMID_MIN_SIGMA", "16"))
+
+# 축소 레벨에서의 sigma가 이 값 아래로 내려가지 않도록 피라미드 레벨 선택
+GLOW_LEVEL_SIGMA = 8.0
+
+# 축소 레벨의 짧은 변 최소 크기 (px)
+GLOW_MIN_LEVEL_SIZE = 16
+
+# 원본 해상도 계산 대비 허용 오차 (후광 강도 0~1 기준)
+GLOW_TOLERANCE = 0.01
+
+# 후광 blur 단계 ((커널 크기, sigma), ...) 와 강도
+# 작은 이미지 (약 548x548 이하): pix2pix용 자연스러운 후광
+BACKLIGHT_PASSES_SMALL = ((31, 15), (31, 15), (21, 10))
+BACKLIGHT_INTENSITY_SMALL = 1.8
+# 큰 이미지: 웹 간판시안생성기
+BACKLIGHT_PASSES_LARGE = ((141, 70), (141, 70), (121, 60))
+BACKLIGHT_INTENSITY_LARGE = 4.0
+BACKLIGHT_SMALL_AREA = 300000
+# 텍스트 레이어 없이 업로드 이미지의 밝은 영역 마스크로 만드는 후광
+UPLOAD_BACKLIGHT_PASSES = ((81, 40), (81, 40))
+
+# 따뜻한 흰색 LED 색상 (BGR)
+BACKLIGHT_COLOR_BGR = (220, 245, 255)
+
+
+def safe_gaussian_blur(image: np.ndarray, ksize: tuple, sigma: float) -> np.ndarray:
+    """안전한 GaussianBlur - 이미지 크기와 kernel 크기 확인"""
+    if image is None or image.size == 0:
+        return image
+
+    h, w = image.shape[:2] if len(image.shape) == 2 else image.shape[:2]
+    ksize_w, ksize_h = ksize
+
+    # kernel size가 홀수인지 확인하고, 이미지보다 작은지 확인
+    if ksize_w % 2 == 0:
+        ksize_w = max(3, ksize_w - 1) if ksize_w > 0 else 3
+    if ksize_h % 2 == 0:
+        ksize_h = max(3, ksize_h - 1) if ksize_h > 0 else 3
+
+    # 이미지 크기보다 kernel이 크면 조정
+    if ksize_w > w:
+        ksize_w = w if w % 2 == 1 else max(3, w - 1)
+    if ksize_h > h:
+        ksize_h = h if h % 2 == 1 else max(3, h - 1)
+
+    # 최소 크기 확인
+    if ksize_w < 3:
+        ksize_w = 3
+    if ksize_h < 3:
+        ksize_h = 3
+
+    try:
+        return cv2.GaussianBlur(image, (ksize_w, ksize_h), sigma)
+    except:
+        # 실패하면 원본 반환
+        return image
+
+
+# 스레드별 후광 해상도 배율 (미리보기 렌더링은 1.0 미만)
+_glow_state = threading.local()
+
+
+def set_glow_scale(scale: float = 1.0):
+    """현재 스레드에서 렌더링하는 이미지의 원본 대비 배율 설정 (렌더링이 끝나면 1.0으로 되돌릴 것)"""
+    _glow_state.scale = scale
+
+
+def glow_scale() -> float:
+    """현재 스레드의 후광 해상도 배율 (기본 1.0)"""
+    return getattr(_glow_state, "scale", 1.0)
+
+
+def scale_passes(passes: tuple, scale: float) -> tuple:
+    """축소 이미지용 blur 단계 (커널 크기/sigma를 배율만큼 축소)"""
+    return tuple((max(3, int(ksize * scale) | 1), sigma * scale) for ksize, sigma in passes)
+
+
+def backlight_profile(image_area: int):
+    """이미지 면적에 따른 후광 blur 단계와 강도 (passes, intensity)
+
+    미리보기 배율이 설정되어 있으면 원본 해상도로 환산한 면적으로 선택한다.
+    """
+    image_area = image_area / (glow_scale() ** 2)
+    if image_area <= BACKLIGHT_SMALL_AREA:
+        return BACKLIGHT_PASSES_SMALL, BACKLIGHT_INTENSITY_SMALL
+    return BACKLIGHT_PASSES_LARGE, BACKLIGHT_INTENSITY_LARGE
+
+
+def pyramid_level(passes: tuple, shape: tuple) -> int:
+    """blur 단계에 맞는 피라미드 축소 레벨 (0이면 원본 해상도)"""
+    min_sigma = min(sigma for _, sigma in passes)
+    if min_sigma < GLOW_PYRAMID_MIN_SIGMA:
+        return 0
+    level = int(np.floor(np.log2(min_sigma / GLOW_LEVEL_SIGMA)))
+    while level > 0 and (min(shape[:2]) >> level) < GLOW_MIN_LEVEL_SIZE:
+        level -= 1
+    return max(0, level)
+
+
+def _clamp_ksize(ksize: int, length: int) -> int:
+    """safe_gaussian_blur와 같은 규칙으로 커널 크기 보정 (홀수, 이미지 크기 이하, 3 이상)"""
+    if ksize % 2 == 0:
+        ksize = max(3, ksize - 1) if ksize > 0 else 3
+    if ksize > length:
+        ksize = length if length % 2 == 1 else max(3, length - 1)
+    return max(3, ksize)
+
+
+def _level_kernel(ksize: int, sigma: float, factor: int) -> np.ndarray:
+    """원본 해상도 Gaussian 커널을 1/factor 해상도 커널로 변환
+
+    원본 커널(잘린 창 포함)의 각 탭을 축소 레벨의 양옆 탭에 선형 보간 가중치로 나눠
+    더하므로, 창 크기까지 원본 커널의 모양을 그대로 따른다 (합 = 1 유지).
+    """
+    kernel = cv2.getGaussianKernel(ksize, sigma, cv2.CV_64F).ravel()
+    radius = ksize // 2
+    level_radius = int(np.ceil(radius / factor)) + 1
+    level_kernel = np.zeros(2 * level_radius + 1, dtype=np.float64)
+    pos = (np.arange(ksize) - radius) / factor + level_radius
+    lo = np.floor(pos).astype(int)
+    frac = pos - lo
+    np.add.at(level_kernel, lo, kernel * (1 - frac))
+    np.add.at(level_kernel, np.minimum(lo + 1, len(level_kernel) - 1), kernel * frac)
+    return level_kernel.astype(np.float32).reshape(-1, 1)
+
+
+def cascade_blur(field: np.ndarray, passes: tuple, level: int = None) -> np.ndarray:
+    """Gaussian blur 여러 단계를 순서대로 적용 (필요하면 피라미드에서)
+
+    Args:
+        field: float32 (H, W) 또는 (H, W, C)
+        passes: ((커널 크기, sigma), ...)
+        level: 피라미드 레벨 (None이면 pyramid_level로 자동 선택)
+    """
+    if level is None:
+        level = pyramid_level(passes, field.shape)
+
+    if level == 0:
+        for ksize, sigma in passes:
+            field = safe_gaussian_blur(field, (ksize, ksize), sigma)
+        return field
+
+    factor = 2 ** level
+    height, width = field.shape[:2]
+    kernels = [
+        (_level_kernel(_clamp_ksize(ksize, width), sigma, factor),
+         _level_kernel(_clamp_ksize(ksize, height), sigma, factor))
+        for ksize, sigma in passes
+    ]
+
+    # 원본 해상도에서 blur 전체 반경만큼 reflect 패딩 (원본 계산의 BORDER_REFLECT_101 경계와 동일하게)
+    # 패딩은 factor 배수로 맞춰 축소 레벨의 샘플 격자가 원본 (0, 0) 픽셀에 정렬되도록 한다
+    support = sum(_clamp_ksize(ksize, max(width, height)) // 2 for ksize, _ in passes)
+    pad = int(np.ceil(support / factor)) * factor
+    small = cv2.copyMakeBorder(field, pad, pad, pad, pad, cv2.BORDER_REFLECT_101)
+
+    sizes = []
+    for _ in range(level):
+        sizes.append((small.shape[1], small.shape[0]))
+        small = cv2.pyrDown(small)
+
+    for kx, ky in kernels:
+        small = cv2.sepFilter2D(small, -1, kx, ky, borderType=cv2.BORDER_REFLECT_101)
+
+    for size in reversed(sizes):
+        small = cv2.pyrUp(small, dstsize=size)
+    return small[pad:pad + height, pad:pad + width].copy()
+
+
+# 글자/로고 윤곽선 후광 (원본 해상도 px 기준)
+CONTOUR_INNER_DIST = 2.0   # 제일 밝은 부분 범위
+CONTOUR_MAX_DIST = 15.0    # 그라디언트 범위
+CONTOUR_PEAK = 0.6         # 윤곽선 바로 바깥 밝기
+CONTOUR_BLUR_PASSES = ((19, 8), (19, 8))
+
+
+def contour_glow(mask_u8: np.ndarray, exclude) -> np.ndarray:
+    """마스크 윤곽선을 따라 바깥쪽으로 옅어지는 후광 강도 (float32 (H, W))
+
+    윤곽선에서 CONTOUR_INNER_DIST px까지는 CONTOUR_PEAK에서 0으로, 그 바깥 CONTOUR_MAX_DIST px까지는
+    CONTOUR_PEAK에서 0으로 선형 감소한 뒤 blur한다. 거리/blur는 미리보기 배율만큼 축소한다.
+
+    Args:
+        mask_u8: uint8 마스크 (글자/로고 255)
+        exclude: 후광을 0으로 둘 영역 (bool, 보통 글자/로고 내부)
+    """
+    scale = glow_scale()
+    inner_dist = CONTOUR_INNER_DIST * scale
+    max_dist = CONTOUR_MAX_DIST * scale
+
+    dist_transform = cv2.distanceTransform(255 - mask_u8, cv2.DIST_L2, 5)
+    glow_mask = np.zeros_like(dist_transform, dtype=np.float32)
+    bright_mask = (dist_transform > 0) & (dist_transform <= inner_dist)
+    glow_mask[bright_mask] = CONTOUR_PEAK * (1.0 - (dist_transform[bright_mask] / inner_dist))
+
+    gradient_mask = (dist_transform > inner_dist) & (dist_transform <= max_dist)
+    if gradient_mask.any():
+        glow_mask[gradient_mask] = CONTOUR_PEAK * (1.0 - ((dist_transform[gradient_mask] - inner_dist) / (max_dist - inner_dist)))
+
+    glow_mask[exclude] = 0
+
+    passes = scale_passes(CONTOUR_BLUR_PASSES, scale) if scale < 1.0 else CONTOUR_BLUR_PASSES
+    for ksize, sigma in passes:
+        glow_mask = safe_gaussian_blur(glow_mask, (ksize, ksize), sigma)
+    return glow_mask
+
+
+# 프로세스 전역 후광 캐시 (마스크 해시 → 읽기 전용 float32 후광 강도)
+glow_cache = TextRasterCache(int(GLOW_CACHE_MAX_MB * 1024 * 1024))
+
+
+def glow_key(mask_u8: np.ndarray, passes: tuple):
+    """후광 캐시 키 (마스크 내용 해시 + 크기 + blur 단계)"""
+    digest = hashlib.blake2b(np.ascontiguousarray(mask_u8).data, digest_size=16).digest()
+    return ("glow", digest, mask_u8.shape, tuple(passes))
+
+
+def glow_field(mask_u8: np.ndarray, passes: tuple) -> np.ndarray:
+    """uint8 마스크(0~255)의 후광 강도 (float32 (H, W), 0~1)
+
+    같은 마스크와 blur 단계에 대해서는 캐시된 결과를 반환한다 (읽기 전용).
+    passes는 원본 해상도 기준 값이며, 미리보기 배율이 설정되어 있으면 그만큼 축소해 적용한다.
+    """
+    scale = glow_scale()
+    if scale < 1.0:
+        passes = scale_passes(passes, scale)
+
+    def render():
+        field = mask_u8.astype(np.float32) / 255.0
+        return cascade_blur(field, passes)
+
+    return glow_cache.get_or_render(glow_key(mask_u8, passes), render)
+
+
+def render_backlight(mask_u8: np.ndarray, image_area: int, color_bgr: tuple = BACKLIGHT_COLOR_BGR):
+    """텍스트 알파 마스크로부터 후광 색상 레이어 생성 (이미지 면적에 따라 blur 단계/강도 선택)
+
+    Returns:
+        uint8 (H, W, 3) 후광 레이어 (글자 영역 포함 - 제외는 호출하는 쪽에서)
+    """
+    passes, intensity = backlight_profile(image_area)
+    return compositing.colorize(glow_field(mask_u8, passes), color_bgr, intensity)
+
+
+def _self_check():
+    """피라미드 후광과 원본 해상도 후광의 falloff 비교"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.truetype("DejaVuSans-Bold.ttf", 260)
+    except OSError:
+        font = ImageFont.load_default()
+
+    worst = 0.0
+    for width, height in [(1600, 500), (3000, 800), (800, 2400)]:
+        canvas = Image.new("L", (width, height), 0)
+        ImageDraw.Draw(canvas).text((width // 10, height // 4), "GLOW 42", fill=255, font=font)
+        field = np.array(canvas).astype(np.float32) / 255.0
+
+        for passes in (BACKLIGHT_PASSES_LARGE, UPLOAD_BACKLIGHT_PASSES):
+            reference = field
+            for ksize, sigma in passes:
+                reference = safe_gaussian_blur(reference, (ksize, ksize), sigma)
+            fast = cascade_blur(field, passes)
+            err = float(np.abs(fast - reference).max())
+            worst = max(worst, err)
+            print(f"{width}x{height} passes={passes} level={pyramid_level(passes, field.shape)} "
+                  f"peak={reference.max():.4f} max_err={err:.5f} mean_err={np.abs(fast - reference).mean():.6f}")
+
+    print(f"worst max_err={worst:.5f} (tolerance {GLOW_TOLERANCE})")
+    assert worst <= GLOW_TOLERANCE, f"후광 오차 {worst:.5f} > {GLOW_TOLERANCE}"
+
+
+if __name__ == "__main__":
+    _self_check()
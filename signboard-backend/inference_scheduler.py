@@ -0,0 +1,154 @@
+"""
+pix2pix 추론 스케줄러 - 동시에 들어온 enhance 호출을 모아 배치 추론
+
+SignboardAIEngine.enhance는 요청마다 [1, 3, 512, 512] 텐서 하나로 UNet을 실행한다.
+CPU에서는 여러 입력을 한 배치로 실행하는 것이 하나씩 실행하는 것보다 이미지당 처리량이 높으므로,
+스케줄러가 대기 중인 enhance 호출을 최대 PIX2PIX_BATCH_WAIT_MS 동안 (또는 PIX2PIX_MAX_BATCH개까지)
+모아 한 번의 forward로 실행하고 결과를 각 호출자에게 돌려준다.
+
+- 전처리/후처리(리사이즈, 패딩)는 호출한 워커 스레드에서, forward만 스케줄러 스레드에서 실행
+- 모델은 InstanceNorm(샘플별 정규화)을 사용하므로 배치로 실행해도 결과는 단독 실행과 같음
+- 동시에 enhance를 부르는 워커가 여러 개일 때만 배치가 만들어지므로 HQ_WORKERS가 1이면 main에서 스케줄러를 쓰지 않음
+- torch(SignboardAIEngine)와 ONNX(ONNXSignboardEngine) 엔진 모두 지원 (입력이 ndarray면 torch를 import하지 않음)
+- infer로 여러 장([N, 3, 512, 512], 예: 타일 추론)을 넣으면 N장을 배치 크기로 셈
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 실행할 최대 배치 크기 (1이면 스케줄러를 사용하지 않음)
+PIX2PIX_MAX_BATCH = int(os.getenv("PIX2PIX_MAX_BATCH", "4"))
+# 첫 요청이 들어온 뒤 다른 요청을 기다리는 최대 시간 (ms)
+PIX2PIX_BATCH_WAIT_MS = float(os.getenv("PIX2PIX_BATCH_WAIT_MS", "5"))
+
+
+def concat_batch(tensors: list):
+    """[1, 3, H, W] 입력들을 [N, 3, H, W] 배치로 (ndarray 또는 torch.Tensor)"""
+    if isinstance(tensors[0], np.ndarray):
+        return np.concatenate(tensors)
+    import torch
+    return torch.cat(tensors)
+
+
+class _PendingInference:
+    """스케줄러 대기열의 추론 요청 하나"""
+
+    def __init__(self, tensor):
+        self.tensor = tensor
+        self.rows = len(tensor)
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class InferenceScheduler:
+    """SignboardAIEngine 앞단의 마이크로 배치 스케줄러 (engine.enhance와 같은 인터페이스)"""
+
+    def __init__(self, engine, max_batch: int = PIX2PIX_MAX_BATCH, max_wait_ms: float = PIX2PIX_BATCH_WAIT_MS):
+        self.engine = engine
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue = queue.Queue()
+        self._carry = None  # 이전 배치에 들어가지 못한 요청 (스케줄러 스레드 전용)
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.batch_sizes = {}
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.forward_ms_total = 0.0
+        self._thread = threading.Thread(target=self._loop, name="pix2pix-batch", daemon=True)
+        self._thread.start()
+        logger.info(f"[pix2pix 배치] 스케줄러 시작: max_batch={self.max_batch}, max_wait={max_wait_ms}ms")
+
+    def preprocess(self, img: np.ndarray):
+        return self.engine.preprocess(img)
+
+    def postprocess(self, output, scale_info):
+        return self.engine.postprocess(output, scale_info)
+
+    def infer(self, batch):
+        """engine.infer와 같음 (다른 호출과 묶어서 실행, [N, 3, 512, 512] → [N, 3, 512, 512])"""
+        pending = _PendingInference(batch)
+        self._queue.put(pending)
+        return pending.future.result()
+
+    def enhance(self, phase1_signboard: np.ndarray) -> np.ndarray:
+        """engine.enhance와 같음 (forward는 다른 호출과 묶어서 실행)"""
+        input_tensor, scale_info = self.preprocess(phase1_signboard)
+        return self.postprocess(self.infer(input_tensor), scale_info)
+
+    def _collect(self) -> list:
+        """첫 요청을 기다린 뒤 max_wait 동안 또는 max_batch장까지 추가 요청 수집
+
+        여러 장짜리 요청이 남은 자리보다 크면 다음 배치로 넘김 (첫 요청은 max_batch보다 커도 단독 실행)
+        """
+        first, self._carry = self._carry or self._queue.get(), None
+        batch, rows = [first], first.rows
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if rows + pending.rows > self.max_batch:
+                self._carry = pending
+                break
+            batch.append(pending)
+            rows += pending.rows
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                outputs = self.engine.infer(concat_batch([pending.tensor for pending in batch]))
+            except Exception as e:
+                logger.error(f"[pix2pix 배치] 추론 실패 (batch={len(batch)}): {e}", exc_info=True)
+                for pending in batch:
+                    pending.future.set_exception(e)
+                continue
+            offset = 0
+            for pending in batch:
+                pending.future.set_result(outputs[offset:offset + pending.rows])
+                offset += pending.rows
+            self._record(batch, started, time.perf_counter())
+
+    def _record(self, batch: list, started: float, finished: float):
+        waits = [(started - pending.enqueued) * 1000 for pending in batch]
+        rows = sum(pending.rows for pending in batch)
+        with self._lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.rows += rows
+            self.batch_sizes[rows] = self.batch_sizes.get(rows, 0) + 1
+            self.wait_ms_total += sum(waits)
+            self.wait_ms_max = max(self.wait_ms_max, max(waits))
+            self.forward_ms_total += (finished - started) * 1000
+
+    def stats(self) -> dict:
+        """배치 크기/대기 시간 통계 (/ 엔드포인트용)"""
+        with self._lock:
+            return {
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "pending": self._queue.qsize(),
+                "batches": self.batches,
+                "requests": self.requests,
+                "images": self.rows,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "mean_batch_size": round(self.rows / self.batches, 2) if self.batches else 0.0,
+                "mean_wait_ms": round(self.wait_ms_total / self.requests, 2) if self.requests else 0.0,
+                "max_wait_ms_seen": round(self.wait_ms_max, 2),
+                "mean_forward_ms": round(self.forward_ms_total / self.batches, 1) if self.batches else 0.0,
+            }
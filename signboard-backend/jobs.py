@@ -0,0 +1,213 @@
+"""
+비동기 작업 큐 - 오래 걸리는 렌더링(AI 고품질 pix2pix)을 HTTP 요청과 분리
+
+/api/generate-hq는 CPU 전용 서버에서 수십 초 걸릴 수 있어, 요청 안에서 결과를 기다리면
+동시 요청이 쌓이고 클라이언트 타임아웃이 난다. 작업을 큐에 넣고 작업 ID를 바로 반환하면
+클라이언트는 /api/jobs/{id}로 상태를 확인하고 /api/jobs/{id}/result로 결과를 가져간다.
+
+- 렌더 풀(render_pool)과 별도의 워커에서 실행하므로 시뮬레이션 요청이 HQ 작업 뒤에서 기다리지 않음
+- HQ_WORKERS: 동시에 실행할 작업 수
+- HQ_QUEUE_SIZE: 실행 중인 작업 외에 대기할 수 있는 작업 수 (초과 시 JobQueueFull)
+- HQ_JOB_TTL: 끝난 작업의 결과를 보관하는 시간 (초, 지나면 조회 시 404)
+- HQ_JOB_MAX_FINISHED: 보관할 끝난 작업 수 (결과에 큰 base64 이미지가 들어 있으므로, 넘으면 오래된 것부터 삭제)
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+HQ_WORKERS = int(os.getenv("HQ_WORKERS", "1"))
+HQ_QUEUE_SIZE = int(os.getenv("HQ_QUEUE_SIZE", "8"))
+HQ_JOB_TTL = float(os.getenv("HQ_JOB_TTL", "600"))
+HQ_JOB_MAX_FINISHED = int(os.getenv("HQ_JOB_MAX_FINISHED", "32"))
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+class Job:
+    """큐에 들어간 작업 하나 (상태, 시각, 결과)"""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.status_code = None
+        self.result = None
+        self.error = None
+        self._future = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def describe(self, queue_position: int = None) -> dict:
+        """상태 조회 응답 (결과 본문 제외)"""
+        now = time.time()
+        info = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "queued_ms": round(((self.started or self.finished or now) - self.created) * 1000, 1),
+        }
+        if queue_position is not None:
+            info["queue_position"] = queue_position
+        if self.started is not None:
+            info["run_ms"] = round(((self.finished or now) - self.started) * 1000, 1)
+        if self.status_code is not None:
+            info["status_code"] = self.status_code
+        if self.error is not None:
+            info["error"] = self.error
+        if isinstance(self.result, dict) and "timings" in self.result:
+            info["timings"] = self.result["timings"]
+        return info
+
+
+class JobQueue:
+    """작업 ID로 상태/결과를 조회하는 제한된 작업 큐
+
+    작업 함수는 (HTTP 상태 코드, 응답 본문 dict)를 반환한다.
+    상태 코드가 400 이상이거나 예외가 나면 failed, 아니면 done.
+    """
+
+    def __init__(self, name: str, workers: int = HQ_WORKERS, queue_size: int = HQ_QUEUE_SIZE,
+                 ttl: float = HQ_JOB_TTL, max_finished: int = HQ_JOB_MAX_FINISHED):
+        self.name = name
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.ttl = ttl
+        self.max_finished = max(1, max_finished)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{name}-job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.evicted = 0
+
+    def _active(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.is_finished)
+
+    def _expire(self, now: float):
+        """보관 시간이 지난 끝난 작업 제거, 끝난 작업이 max_finished를 넘으면 오래된 것부터 제거"""
+        expired = [job_id for job_id, job in self._jobs.items() if job.is_finished and now - job.finished > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+        finished = sorted((job for job in self._jobs.values() if job.is_finished), key=lambda job: job.finished)
+        for job in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+            self.evicted += 1
+
+    def submit(self, fn, **kwargs) -> Job:
+        """작업을 큐에 넣고 바로 반환
+
+        Raises:
+            JobQueueFull: 실행 중 + 대기 중 작업이 workers + queue_size 이상
+        """
+        with self._lock:
+            self._expire(time.time())
+            active = self._active()
+            if active >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise JobQueueFull(f"{self.name} 작업 대기열이 가득 찼습니다 (active={active})")
+            job = Job(self.name)
+            self._jobs[job.id] = job
+            self.submitted += 1
+            job._future = self._executor.submit(self._run, job, fn, kwargs)
+        logger.info(f"[작업 큐] {self.name} 작업 등록: {job.id} (active={active + 1})")
+        return job
+
+    def _run(self, job: Job, fn, kwargs: dict):
+        with self._lock:
+            if job.status != QUEUED:
+                return
+            job.status = RUNNING
+            job.started = time.time()
+        try:
+            status_code, result = fn(**kwargs)
+            error = result.get("error") if status_code >= 400 and isinstance(result, dict) else None
+        except Exception as e:
+            logger.error(f"[작업 큐] {self.name} 작업 실패: {job.id}: {e}", exc_info=True)
+            status_code, result, error = 500, {"error": str(e)}, str(e)
+        with self._lock:
+            job.status_code = status_code
+            job.result = result
+            job.error = error
+            job.status = FAILED if status_code >= 400 else DONE
+            job.finished = time.time()
+            if job.status == DONE:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self._expire(job.finished)
+        logger.info(f"[작업 큐] {self.name} 작업 {job.status}: {job.id}, "
+                    f"대기 {job.started - job.created:.1f}s, 실행 {job.finished - job.started:.1f}s")
+
+    def get(self, job_id: str):
+        """작업 조회 (없거나 보관 시간이 지났으면 None)"""
+        with self._lock:
+            self._expire(time.time())
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job: Job):
+        """대기 중인 작업의 순서 (0이면 다음 실행, 대기 중이 아니면 None)"""
+        with self._lock:
+            if job.status != QUEUED:
+                return None
+            return sum(1 for other in self._jobs.values() if other.status == QUEUED and other.created < job.created)
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중인 작업 취소 (이미 실행 중이거나 끝난 작업은 False)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            job._future.cancel()
+            job.status = CANCELLED
+            job.finished = time.time()
+            self.cancelled += 1
+            return True
+
+    def stats(self) -> dict:
+        """큐 상태 (/ 엔드포인트용)"""
+        with self._lock:
+            self._expire(time.time())
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "ttl": self.ttl,
+                "max_finished": self.max_finished,
+                "queued": sum(1 for job in self._jobs.values() if job.status == QUEUED),
+                "running": sum(1 for job in self._jobs.values() if job.status == RUNNING),
+                "stored": len(self._jobs),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "cancelled": self.cancelled,
+                "evicted": self.evicted,
+            }
+
+
+# AI 고품질(pix2pix) 작업 큐
+hq_jobs = JobQueue("hq")
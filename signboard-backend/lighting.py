@@ -0,0 +1,164 @@
+"""
+조명 합성 엔진 - composite_signboard의 조명(lights) 처리
+
+프론트엔드와 동일한 타원형 조명(가로 반경 = radius, 세로 반경 = radius * 1.2)의
+아래쪽 절반 영역에서 야간 효과를 걷어내고 주간 이미지를 복원한다.
+픽셀 단위 Python 루프 대신, 반경별로 캐시된 타원 마스크를 조명의
+바운딩 박스(ROI)에만 적용한다.
+"""
+
+import time
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+import compositing
+
+logger = logging.getLogger(__name__)
+
+# 조명 색온도 (0=warm, 1=cool)
+WARM_COLOR = np.array([255, 220, 200], dtype=np.float32)
+COOL_COLOR = np.array([200, 210, 255], dtype=np.float32)
+
+# 조명 색온도 틴트 강도 (분위기용, 아주 약하게)
+LIGHT_TINT_STRENGTH = 0.08
+
+# 타원 반경 비율 (프론트엔드와 동일: width = rad * 2.0, height = rad * 2.4)
+LIGHT_WIDTH_RATIO = 2.0
+LIGHT_HEIGHT_RATIO = 2.4
+
+
+@lru_cache(maxsize=128)
+def get_light_falloff(rad: int) -> np.ndarray:
+    """반경 rad 조명의 타원 마스크 (조명 중심 기준 스탬프)
+
+    Returns:
+        (2 * ry + 1, 2 * rx + 1) float32 마스크, 중심 픽셀이 (ry, rx).
+        타원 안쪽은 1.0, 바깥은 0.0 (프론트엔드와 동일하게 균일한 밝기).
+        캐시에서 공유되므로 읽기 전용.
+    """
+    half_w = rad * LIGHT_WIDTH_RATIO / 2
+    half_h = rad * LIGHT_HEIGHT_RATIO / 2
+    rx = int(np.ceil(half_w))
+    ry = int(np.ceil(half_h))
+
+    dy = np.arange(-ry, ry + 1, dtype=np.float64)[:, np.newaxis]
+    dx = np.arange(-rx, rx + 1, dtype=np.float64)[np.newaxis, :]
+    dist = np.sqrt((dx / half_w) ** 2 + (dy / half_h) ** 2)
+
+    falloff = (dist < 1.0).astype(np.float32)
+    falloff.setflags(write=False)
+    return falloff
+
+
+def parse_light(light: dict, w: int, h: int) -> dict:
+    """프론트엔드 조명 데이터를 픽셀 좌표로 변환"""
+    lx = float(light.get("x", 0.5))
+    ly = float(light.get("y", 0.5))
+    temperature = float(light.get("temperature", 0.5))
+    return {
+        "cx": int(lx * w),
+        "cy": int(ly * h),
+        "rad": int(float(light.get("radius", 150))),
+        "intensity": float(light.get("intensity", 1.0)),
+        "color": WARM_COLOR * (1 - temperature) + COOL_COLOR * temperature,
+    }
+
+
+def compute_light_roi(cx: int, cy: int, rad: int, w: int, h: int):
+    """조명이 영향을 주는 영역 (x0, y0, x1, y1) 계산
+
+    타원의 아래쪽 절반(cy 행부터 아래)만 적용한다.
+    cy가 음수일 때는 기존 구현(mask_lower[cy:, :])과 동일하게 아래에서 |cy| 행만 남긴다.
+    영향이 없으면 None.
+    """
+    if rad <= 0:
+        return None
+    falloff = get_light_falloff(rad)
+    ry = falloff.shape[0] // 2
+    rx = falloff.shape[1] // 2
+
+    lower_start = cy if cy >= 0 else max(0, h + cy)
+
+    x0 = max(0, cx - rx)
+    x1 = min(w, cx + rx + 1)
+    y0 = max(lower_start, cy - ry, 0)
+    y1 = min(h, cy + ry + 1)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return x0, y0, x1, y1
+
+
+def light_restore_strength(light: dict, roi: tuple) -> np.ndarray:
+    """ROI 안에서의 복원 강도 (0~1) - intensity 적용
+
+    intensity = 0 → 야간 그대로, 1 → 완전히 주간으로 복원, > 1 → 더 강하게
+    """
+    x0, y0, x1, y1 = roi
+    falloff = get_light_falloff(light["rad"])
+    ry = falloff.shape[0] // 2
+    rx = falloff.shape[1] // 2
+    fy0 = y0 - light["cy"] + ry
+    fx0 = x0 - light["cx"] + rx
+    stamp = falloff[fy0:fy0 + (y1 - y0), fx0:fx0 + (x1 - x0)]
+    return np.clip(stamp * light["intensity"], 0, 1)
+
+
+def apply_lights(night_result: np.ndarray, day_result: np.ndarray, lights: list, timings: dict = None) -> np.ndarray:
+    """야간 이미지에 조명 효과 적용 (N개 조명)
+
+    Args:
+        night_result: 야간 합성 결과 (H, W, 3)
+        day_result: 주간 합성 결과 (H, W, 3) - 조명이 비추는 부분은 주간 색상으로 복원
+        lights: 프론트엔드 조명 리스트 [{"x", "y", "intensity", "radius", "temperature", "enabled"}, ...]
+        timings: 전달되면 조명별 처리 비용을 timings["lights"]에 기록
+
+    Returns:
+        조명이 적용된 야간 이미지 (uint8)
+    """
+    h, w = night_result.shape[:2]
+    t_total = time.perf_counter()
+
+    # 각 조명의 복원 강도를 ROI 단위로 한 번에 계산
+    prepared = []
+    for idx, light in enumerate(lights):
+        if not light.get("enabled", True):
+            continue
+        t0 = time.perf_counter()
+        parsed = parse_light(light, w, h)
+        roi = compute_light_roi(parsed["cx"], parsed["cy"], parsed["rad"], w, h)
+        strength = light_restore_strength(parsed, roi) if roi is not None else None
+        prepared.append((idx, parsed, roi, strength, time.perf_counter() - t0))
+
+    # 조명은 순서대로 누적 적용 (겹치는 영역은 앞 조명 결과 위에 다시 복원)
+    result = np.clip(night_result, 0, 255).astype(np.uint8)
+    light_timings = []
+    for idx, parsed, roi, strength, prep_time in prepared:
+        t0 = time.perf_counter()
+        pixels = 0
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            s = compositing.as_mask(strength)
+            region = result[y0:y1, x0:x1]
+            # 야간 효과 제거: 조명이 비추는 부분을 주간 이미지로 교체 + 색온도 틴트
+            compositing.blend(region, day_result[y0:y1, x0:x1], s, out=region)
+            tint = compositing.colorize(s, tuple(parsed["color"]), LIGHT_TINT_STRENGTH)
+            compositing.add(region, tint, out=region)
+            pixels = int(np.count_nonzero(strength))
+        elapsed_ms = (time.perf_counter() - t0 + prep_time) * 1000
+        light_timings.append({
+            "index": idx,
+            "roi": list(roi) if roi is not None else None,
+            "pixels": pixels,
+            "ms": round(elapsed_ms, 2),
+        })
+        logger.info(
+            f"[조명] #{idx} cx={parsed['cx']}, cy={parsed['cy']}, rad={parsed['rad']}, "
+            f"intensity={parsed['intensity']}, roi={roi}, 적용 픽셀={pixels}, {elapsed_ms:.1f}ms"
+        )
+
+    if timings is not None:
+        timings["lights"] = light_timings
+        timings["lights_total_ms"] = round((time.perf_counter() - t_total) * 1000, 2)
+    return result
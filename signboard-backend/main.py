@@ -1,6 +1,6 @@
-from fastapi import FastAPI, Form
+from fastapi import FastAPI, Form, File, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 import base64
 import cv2
@@ -11,6 +11,14 @@ import io
 import sys
 import logging
 import os
+import time
+import asyncio
+import inspect
+import threading
+import importlib.util
+
+# 모듈 로드 시간 (startup 로그용)
+_MODULE_LOAD_STARTED = time.perf_counter()
 
 # 로깅 설정
 logging.basicConfig(
@@ -22,41 +30,99 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# AI 브랜딩 시스템 import (선택적 - openai가 없어도 작동)
-try:
-    from ai_branding import AIBrandingSystem
-    AI_BRANDING_AVAILABLE = True
-except ImportError:
-    AI_BRANDING_AVAILABLE = False
-    AIBrandingSystem = None
-
-# pix2pix 추론 엔진 (선택적)
-try:
-    from pix2pix_inference import SignboardAIEngine
-    PIX2PIX_AVAILABLE = True
-except ImportError as e:
-    PIX2PIX_AVAILABLE = False
-    logger.warning(f"Pix2pix 추론 엔진을 사용할 수 없습니다: {e}")
+# AI 브랜딩 시스템 (선택적 - openai가 없어도 작동, openai import는 startup 워밍업에서)
+AI_BRANDING_AVAILABLE = importlib.util.find_spec("openai") is not None
+
+import compositing
+from glow import safe_gaussian_blur, render_backlight, glow_field, contour_glow, glow_cache, set_glow_scale, UPLOAD_BACKLIGHT_PASSES
+from lighting import apply_lights
+from font_registry import font_registry, fit_text_font, measure_text
+from text_cache import text_cache, text_layer_key, text_mask_key
+from text_raster import TextRaster, rasterize_text, union_bounds
+from render_pool import RenderPool, RenderQueueFull, RenderJobTimeout
+from encoding import OutputEncoding, negotiate_encoding, encode_images
+from photo_session import photo_sessions, build_photo_session, NIGHT_DARKEN
+from pipeline import PipelineRun, stage_key, stage_cache
+from jobs import hq_jobs, JobQueueFull, CANCELLED
+from warmup import readiness, DISABLED, PENDING, WARMING
+
+from inference_scheduler import InferenceScheduler, PIX2PIX_MAX_BATCH
+from tiled_inference import TiledEnhancer, PIX2PIX_TILE_OVERLAP, PIX2PIX_TILE_MAX, PIX2PIX_TILE_BUDGET_MS
+from enhance_cache import EnhanceCache, model_version
+
+# pix2pix 추론 엔진 (선택적, torch/onnxruntime은 모델을 로드할 때 import)
+# PIX2PIX_BACKEND: "onnx" (onnxruntime, torch 불필요), "torch", "auto" (ONNX 모델 파일이 있으면 onnx)
+# PIX2PIX_PRECISION: "fp32" 또는 "int8" (quantize_pix2pix.py로 양자화한 ONNX 모델, onnx 백엔드 전용)
+PIX2PIX_BACKEND = os.getenv("PIX2PIX_BACKEND", "auto").lower()
+PIX2PIX_PRECISION = os.getenv("PIX2PIX_PRECISION", "fp32").lower()
+PIX2PIX_CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), 'checkpoints', 'signboard_pix2pix_v1')
+PIX2PIX_ONNX_PATH = os.getenv("PIX2PIX_ONNX_PATH", os.path.join(
+    PIX2PIX_CHECKPOINT_DIR, '140_net_G_int8.onnx' if PIX2PIX_PRECISION == "int8" else '140_net_G.onnx'))
+
+pix2pix_backend = None  # 실제 사용할 백엔드 ("onnx" / "torch", 사용할 수 없으면 None)
+pix2pix_onnx_required = PIX2PIX_BACKEND == "onnx" or PIX2PIX_PRECISION == "int8"
+if pix2pix_onnx_required or (PIX2PIX_BACKEND == "auto" and os.path.exists(PIX2PIX_ONNX_PATH)):
+    if importlib.util.find_spec("onnxruntime") is not None:
+        pix2pix_backend = "onnx"
+    else:
+        logger.warning("ONNX 추론 엔진을 사용할 수 없습니다: onnxruntime이 설치되지 않았습니다")
+if pix2pix_backend is None and not pix2pix_onnx_required:
+    if importlib.util.find_spec("torch") is not None:
+        pix2pix_backend = "torch"
+    else:
+        logger.warning("Pix2pix 추론 엔진을 사용할 수 없습니다: torch가 설치되지 않았습니다")
+PIX2PIX_AVAILABLE = pix2pix_backend is not None
+# 큰 간판을 겹치는 512x512 타일로 나눠 추론 (tiled_inference.py, PIX2PIX_TILE_* 설정)
+PIX2PIX_TILING = os.getenv("PIX2PIX_TILING", "0") != "0"
+# 같은 Phase 1 간판의 pix2pix 결과 재사용 (enhance_cache.py, ENHANCE_CACHE_* 설정)
+ENHANCE_CACHE = os.getenv("ENHANCE_CACHE", "1") != "0"
 
 # 전역 pix2pix 엔진 (서버 시작 시 1회만 로드)
 pix2pix_engine = None
+pix2pix_scheduler = None
+pix2pix_tiler = None
+pix2pix_cache = None
+pix2pix_torch_options = None  # torch 엔진의 CPU 추론 설정 (inference_mode, channels_last, compile, bf16, 스레드 수)
+_pix2pix_engine_lock = threading.Lock()
 
 def get_pix2pix_engine():
-    """Pix2pix 엔진 싱글톤 (지연 로딩)"""
-    global pix2pix_engine
+    """Pix2pix 엔진 싱글톤 (지연 로딩, 렌더 풀 워커 스레드가 동시에 불러도 1회만 로드)
+
+    PIX2PIX_MAX_BATCH > 1이고 HQ 워커가 여러 개면 동시 enhance 호출을 배치로 묶는 InferenceScheduler로,
+    PIX2PIX_TILING이면 그 위를 타일 추론 TiledEnhancer로, ENHANCE_CACHE면 맨 앞을 결과 캐시 EnhanceCache로 감싸서 반환
+    """
+    global pix2pix_engine, pix2pix_scheduler, pix2pix_tiler, pix2pix_cache, pix2pix_torch_options
     if pix2pix_engine is None and PIX2PIX_AVAILABLE:
-        try:
-            checkpoint_path = os.path.join(
-                os.path.dirname(__file__),
-                'checkpoints',
-                'signboard_pix2pix_v1',
-                '140_net_G.pth'
-            )
-            pix2pix_engine = SignboardAIEngine(checkpoint_path)
-            logger.info(f"Pix2pix 모델 로드 완료: {checkpoint_path}")
-        except Exception as e:
-            logger.error(f"Pix2pix 모델 로드 실패: {e}", exc_info=True)
-            pix2pix_engine = None
+        with _pix2pix_engine_lock:
+            if pix2pix_engine is not None:
+                return pix2pix_engine
+            try:
+                if pix2pix_backend == "onnx":
+                    from onnx_inference import ONNXSignboardEngine
+                    checkpoint_path = PIX2PIX_ONNX_PATH
+                    engine = ONNXSignboardEngine(checkpoint_path)
+                else:
+                    from pix2pix_inference import SignboardAIEngine
+                    checkpoint_path = os.path.join(PIX2PIX_CHECKPOINT_DIR, '140_net_G.pth')
+                    engine = SignboardAIEngine(checkpoint_path)
+                    pix2pix_torch_options = engine.options()
+                # torch 엔진의 bf16 autocast는 결과가 달라지므로 캐시 키에 포함
+                torch_bf16 = bool(pix2pix_torch_options and pix2pix_torch_options["bf16"])
+                # HQ 워커가 1개면 함께 묶을 호출이 없어 대기 시간만 늘어나므로 스케줄러 없이 실행
+                if PIX2PIX_MAX_BATCH > 1 and hq_jobs.workers > 1:
+                    engine = pix2pix_scheduler = InferenceScheduler(engine)
+                if PIX2PIX_TILING:
+                    engine = pix2pix_tiler = TiledEnhancer(engine)
+                if ENHANCE_CACHE:
+                    # 체크포인트나 결과에 영향을 주는 추론 설정이 바뀌면 캐시 키가 달라짐
+                    tiling = (PIX2PIX_TILE_OVERLAP, PIX2PIX_TILE_MAX, PIX2PIX_TILE_BUDGET_MS) if PIX2PIX_TILING else None
+                    version = model_version(checkpoint_path, pix2pix_backend, tiling, *(("bf16",) if torch_bf16 else ()))
+                    engine = pix2pix_cache = EnhanceCache(engine, version)
+                pix2pix_engine = engine
+                logger.info(f"Pix2pix 모델 로드 완료 ({pix2pix_backend}): {checkpoint_path}")
+            except Exception as e:
+                logger.error(f"Pix2pix 모델 로드 실패: {e}", exc_info=True)
+                pix2pix_engine = None
     return pix2pix_engine
 
 # 전면프레임 전광/후광/전후광 디버그 전용 파일 로거
@@ -90,19 +156,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def base64_to_image(base64_string: str) -> np.ndarray:
-    """Base64 문자열을 OpenCV 이미지로 변환"""
-    image_data = base64.b64decode(base64_string.split(",")[1] if "," in base64_string else base64_string)
-    nparr = np.frombuffer(image_data, np.uint8)
+def decode_image_bytes(image_data) -> bytes:
+    """Base64 문자열(data URL 포함) 또는 업로드된 이미지 bytes를 이미지 파일 bytes로 변환
+
+    multipart 파일 파트나 raw 요청 본문으로 받은 bytes는 디코딩 없이 그대로 반환한다.
+    """
+    if isinstance(image_data, (bytes, bytearray, memoryview)):
+        return image_data
+    header, sep, payload = image_data.partition(",")
+    return base64.b64decode(payload if sep else header)
+
+def base64_to_image(base64_string) -> np.ndarray:
+    """Base64 문자열 또는 이미지 bytes를 OpenCV 이미지로 변환"""
+    nparr = np.frombuffer(decode_image_bytes(base64_string), np.uint8)
     img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
     return img
 
-def base64_to_image_pil(base64_string: str) -> Image.Image:
-    """Base64 문자열을 PIL 이미지로 변환"""
-    image_data = base64.b64decode(base64_string.split(",")[1] if "," in base64_string else base64_string)
-    img = Image.open(io.BytesIO(image_data))
+def base64_to_image_pil(base64_string) -> Image.Image:
+    """Base64 문자열 또는 이미지 bytes를 PIL 이미지로 변환"""
+    img = Image.open(io.BytesIO(decode_image_bytes(base64_string)))
     return img
 
+def decode_building_photo(building_photo) -> np.ndarray:
+    """건물 사진 파라미터 디코딩 - base64 문자열, 이미지 bytes, 또는 사진 세션의 디코딩된 사진(그대로 사용)"""
+    if isinstance(building_photo, np.ndarray):
+        return building_photo
+    return base64_to_image(building_photo)
+
 def image_to_base64(image: np.ndarray) -> str:
     """OpenCV 이미지를 Base64 문자열로 변환"""
     _, buffer = cv2.imencode('.png', image)
@@ -139,151 +219,15 @@ def remove_white_background(image_bgr: np.ndarray, threshold: int = 240) -> np.n
 def get_korean_font(font_size: int, font_family: str = "malgun", font_weight: str = "400"):
     """한글 폰트 찾기 - 폰트 종류와 굵기를 지정 (Windows/Linux 호환)
     
+    폰트 파일은 서버 시작 시 font_registry에서 1회 인덱싱되고,
+    로드된 폰트는 (family, 굵기, size) 단위로 캐시된다.
+    
     Args:
         font_size: 폰트 크기
         font_family: 폰트 종류 ("malgun", "nanumgothic", "nanumbarungothic", "gulim", "batang")
         font_weight: 폰트 굵기 ("regular", "bold") 또는 숫자 ("100", "200", ..., "900")
     """
-    import platform
-    import os
-    is_windows = platform.system() == "Windows"
-    
-    # font_weight를 숫자로 변환 (100-900)
-    weight_num = 400  # 기본값: regular
-    if isinstance(font_weight, str):
-        if font_weight == "regular":
-            weight_num = 400
-        elif font_weight == "bold":
-            weight_num = 700
-        elif font_weight.isdigit():
-            weight_num = int(font_weight)
-            weight_num = max(100, min(900, weight_num))  # 100-900 범위로 제한
-    elif isinstance(font_weight, int):
-        weight_num = max(100, min(900, font_weight))
-    
-    # 굵기 범위를 regular/bold로 매핑
-    is_bold = weight_num >= 600
-    
-    font_paths = []
-    
-    if is_windows:
-        fonts_dir = "C:/Windows/Fonts"
-        
-        if font_family == "malgun":
-            # 맑은 고딕: 여러 볼드 파일명 시도
-            if is_bold:
-                font_paths = [
-                    f"{fonts_dir}/malgunbd.ttf",  # 맑은 고딕 Bold
-                    f"{fonts_dir}/malgunb.ttf",   # 대체 이름
-                    f"{fonts_dir}/malgun.ttf",    # 폴백: 일반 폰트
-                ]
-            else:
-                font_paths = [f"{fonts_dir}/malgun.ttf"]
-                
-        elif font_family == "nanumgothic":
-            if is_bold:
-                font_paths = [
-                    f"{fonts_dir}/NanumGothicBold.ttf",
-                    f"{fonts_dir}/NanumGothic.ttf",  # 폴백
-                ]
-            else:
-                font_paths = [f"{fonts_dir}/NanumGothic.ttf"]
-                
-        elif font_family == "nanumbarungothic":
-            if is_bold:
-                font_paths = [
-                    f"{fonts_dir}/NanumBarunGothicBold.ttf",
-                    f"{fonts_dir}/NanumBarunGothic.ttf",  # 폴백
-                ]
-            else:
-                font_paths = [f"{fonts_dir}/NanumBarunGothic.ttf"]
-                
-        elif font_family == "gulim":
-            # TTC 파일: 인덱스 0=일반, 1=볼드 (일부 시스템)
-            font_paths = [f"{fonts_dir}/gulim.ttc"]
-            
-        elif font_family == "batang":
-            font_paths = [f"{fonts_dir}/batang.ttc"]
-        else:
-            # 기본값: 맑은 고딕
-            if is_bold:
-                font_paths = [
-                    f"{fonts_dir}/malgunbd.ttf",
-                    f"{fonts_dir}/malgun.ttf",
-                ]
-            else:
-                font_paths = [f"{fonts_dir}/malgun.ttf"]
-    else:
-        # Linux/macOS 경로
-        if font_family == "nanumgothic":
-            if is_bold:
-                font_paths = [
-                    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
-                    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                ]
-            else:
-                font_paths = [
-                    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                    "/usr/share/fonts/TTF/NanumGothic.ttf",
-                ]
-        elif font_family == "nanumbarungothic":
-            if is_bold:
-                font_paths = [
-                    "/usr/share/fonts/truetype/nanum/NanumBarunGothicBold.ttf",
-                    "/usr/share/fonts/truetype/nanum/NanumBarunGothic.ttf",
-                ]
-            else:
-                font_paths = ["/usr/share/fonts/truetype/nanum/NanumBarunGothic.ttf"]
-        else:
-            # 기본값: 나눔고딕
-            if is_bold:
-                font_paths = [
-                    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
-                    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                ]
-            else:
-                font_paths = [
-                    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-                    "/usr/share/fonts/TTF/NanumGothic.ttf",
-                ]
-        
-        # 폴백 폰트들
-        font_paths.extend([
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/System/Library/Fonts/AppleGothic.ttf",  # macOS
-        ])
-    
-    # 폰트 로드 시도
-    for font_path in font_paths:
-        try:
-            if os.path.exists(font_path):
-                # TTC 파일의 경우 인덱스 지정 시도
-                if font_path.endswith('.ttc'):
-                    try:
-                        # TTC 파일에서 볼드 인덱스 시도 (일부 시스템에서 1이 볼드)
-                        if is_bold:
-                            font = ImageFont.truetype(font_path, font_size, index=1)
-                        else:
-                            font = ImageFont.truetype(font_path, font_size, index=0)
-                    except:
-                        # 인덱스 지정 실패 시 기본 인덱스 사용
-                        font = ImageFont.truetype(font_path, font_size)
-                else:
-                    font = ImageFont.truetype(font_path, font_size)
-                
-                # 폰트 테스트
-                test_img = Image.new('RGB', (100, 100))
-                test_draw = ImageDraw.Draw(test_img)
-                test_draw.text((0, 0), "테스트", font=font)
-                return font
-        except Exception as e:
-            print(f"[DEBUG] 폰트 로드 실패: {font_path}, 오류: {e}")
-            continue
-    
-    # 모든 폰트 로드 실패 시 기본 폰트 반환
-    print(f"[WARNING] 폰트를 찾을 수 없음: family={font_family}, weight={font_weight}")
-    return ImageFont.load_default()
+    return font_registry.get_font(font_size, font_family, font_weight)
 
 def hex_to_rgb(hex_color: str) -> tuple:
     """Hex 색상을 RGB 튜플로 변환"""
@@ -291,17 +235,32 @@ def hex_to_rgb(hex_color: str) -> tuple:
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 def extract_text_layer(text: str, font, color: tuple, canvas_size: tuple, position: tuple) -> np.ndarray:
-    """텍스트만 추출 (RGBA)"""
+    """텍스트만 추출 (RGBA, 캔버스 전체 크기)
+    
+    합성은 가능하면 extract_text_raster()의 글자 bbox 영역에서 하고,
+    캔버스 전체 크기 레이어가 꼭 필요한 곳(야간 효과용 text_layer 등)에서만 사용
+    """
     if not text or not text.strip():
         return np.zeros((canvas_size[1], canvas_size[0], 4), dtype=np.uint8)
+    return extract_text_raster(text, font, color, canvas_size, position).to_canvas()
+
+def extract_text_raster(text: str, font, color: tuple, canvas_size: tuple, position: tuple) -> TextRaster:
+    """텍스트만 추출 (RGBA, 글자 bbox 크기 + 캔버스 내 오프셋)
     
-    text_img = Image.new('RGBA', canvas_size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(text_img)
-    draw.text(position, text, fill=color + (255,), font=font)
+    같은 (텍스트, 폰트, 색상, 캔버스 크기, 위치)는 text_cache에서 재사용 - 반환 래스터는 읽기 전용
+    """
+    return text_cache.get_or_render(
+        text_layer_key(text, font, color, canvas_size, position),
+        lambda: _rasterize_text_layer(text, font, color, canvas_size, position),
+    )
+
+def _rasterize_text_layer(text: str, font, color: tuple, canvas_size: tuple, position: tuple) -> TextRaster:
+    """텍스트 레이어 래스터화 (캐시 미스 시)"""
+    raster = rasterize_text(text, font, tuple(color) + (255,), canvas_size, position)
 
     # 텍스트 상단-좌측 그라디언트 하이라이트 (아주 미묘하게)
     try:
-        np_img = np.array(text_img)
+        np_img = raster.pixels
         alpha = np_img[:, :, 3]
         ys, xs = np.where(alpha > 0)
         if len(xs) > 0 and len(ys) > 0:
@@ -318,53 +277,20 @@ def extract_text_layer(text: str, font, color: tuple, canvas_size: tuple, positi
             region = np_img[y_min:y_end, x_min:x_end, :3].astype(np.float32)
             region = np.clip(region * 1.1, 0, 255)
             np_img[y_min:y_end, x_min:x_end, :3] = region.astype(np.uint8)
-
-        return np_img
     except Exception:
         # 하이라이트 계산 중 오류가 나도 기본 텍스트 렌더링은 유지
-        return np.array(text_img)
+        raster = rasterize_text(text, font, tuple(color) + (255,), canvas_size, position)
+    return raster
 
 def create_text_mask(text: str, font, canvas_size: tuple, position: tuple) -> np.ndarray:
-    """텍스트 마스크 생성"""
+    """텍스트 마스크 생성 (캔버스 전체 크기, 글자 래스터는 text_cache에서 재사용)"""
     if not text or not text.strip():
         return np.zeros((canvas_size[1], canvas_size[0]), dtype=np.uint8)
     
-    mask = Image.new('L', canvas_size, 0)
-    draw = ImageDraw.Draw(mask)
-    draw.text(position, text, fill=255, font=font)
-    return np.array(mask)
-
-def safe_gaussian_blur(image: np.ndarray, ksize: tuple, sigma: float) -> np.ndarray:
-    """안전한 GaussianBlur - 이미지 크기와 kernel 크기 확인"""
-    if image is None or image.size == 0:
-        return image
-    
-    h, w = image.shape[:2] if len(image.shape) == 2 else image.shape[:2]
-    ksize_w, ksize_h = ksize
-    
-    # kernel size가 홀수인지 확인하고, 이미지보다 작은지 확인
-    if ksize_w % 2 == 0:
-        ksize_w = max(3, ksize_w - 1) if ksize_w > 0 else 3
-    if ksize_h % 2 == 0:
-        ksize_h = max(3, ksize_h - 1) if ksize_h > 0 else 3
-    
-    # 이미지 크기보다 kernel이 크면 조정
-    if ksize_w > w:
-        ksize_w = w if w % 2 == 1 else max(3, w - 1)
-    if ksize_h > h:
-        ksize_h = h if h % 2 == 1 else max(3, h - 1)
-    
-    # 최소 크기 확인
-    if ksize_w < 3:
-        ksize_w = 3
-    if ksize_h < 3:
-        ksize_h = 3
-    
-    try:
-        return cv2.GaussianBlur(image, (ksize_w, ksize_h), sigma)
-    except:
-        # 실패하면 원본 반환
-        return image
+    return text_cache.get_or_render(
+        text_mask_key(text, font, canvas_size, position),
+        lambda: rasterize_text(text, font, 255, canvas_size, position, mode='L'),
+    ).to_canvas()
 
 # ========== 채널 간판 ==========
 
@@ -421,6 +347,73 @@ def add_3d_depth(image_np: np.ndarray, depth: int = 8) -> np.ndarray:
     
     return result
 
+def composite_front_frame_text(day_result: np.ndarray, side_raster: TextRaster, text_raster: TextRaster):
+    """전면프레임 채널 글자 합성 - 옆면(앞면 영역 제외) + 앞면(불투명)을 배경과 alpha 블렌딩
+    
+    글자 bbox 영역(rect)에서만 계산하고, 바깥은 배경 그대로 둔다.
+    Returns: (day_result, rect, result_alpha) - result_alpha는 rect 영역의 최종 alpha (H, W) uint8
+    """
+    rect = union_bounds(side_raster, text_raster)
+    if rect is None:
+        return day_result, None, None
+    x0, y0, x1, y1 = rect
+    side_layer_rgba = side_raster.crop(rect)
+    text_layer_rgba = text_raster.crop(rect)
+    
+    # 투명 배경에서 레이어 쌓기 (배경 색과 독립적으로, uint8 고정소수점)
+    # 1. 옆면 레이어 (앞면 영역 제외) - 입체감을 위한 옆면만
+    side_alpha = side_layer_rgba[:, :, 3]
+    text_alpha = text_layer_rgba[:, :, 3]
+    
+    # 앞면 영역 제외
+    side_alpha_adjusted = compositing.premultiply(side_alpha, 255 - text_alpha)
+    
+    # 알파 합성 (투명 배경 위이므로 옆면 색 * alpha)
+    result_rgb = compositing.premultiply(side_layer_rgba[:, :, :3], side_alpha_adjusted)
+    
+    # 2. 앞면 레이어 (100% 불투명)
+    compositing.blend(result_rgb, text_layer_rgba[:, :, :3], text_alpha, out=result_rgb)
+    result_alpha = np.maximum(side_alpha_adjusted, text_alpha)
+    
+    # 텍스트 영역의 알파를 255로 강제 설정 (전면프레임은 불투명해야 함)
+    result_alpha[text_alpha > 0] = 255
+    
+    # 3. RGB -> BGR 변환
+    result_bgr = cv2.cvtColor(result_rgb, cv2.COLOR_RGB2BGR)
+    
+    # 4. 배경과 합성 (BGR 순서로 통일)
+    region = day_result[y0:y1, x0:x1]
+    compositing.blend(region, result_bgr, result_alpha, out=region)
+    return day_result, rect, result_alpha
+
+def composite_channel_text(day_result: np.ndarray, side_raster: TextRaster, text_raster: TextRaster, alpha_blend: bool) -> np.ndarray:
+    """맨벽/프레임바 채널 글자 합성 - 옆면 다음 앞면 (글자 bbox 영역만)
+    
+    alpha_blend: True면 배경이 있으므로 alpha 블렌딩 (학습용),
+                 False면 투명 배경이므로 cv2.add (시안용, 기존 동작)
+    """
+    rect = union_bounds(side_raster, text_raster)
+    if rect is None:
+        return day_result
+    x0, y0, x1, y1 = rect
+    side_layer_rgba = side_raster.crop(rect)
+    text_layer_rgba = text_raster.crop(rect)
+    side_layer_bgr = cv2.cvtColor(side_layer_rgba, cv2.COLOR_RGBA2BGR)
+    text_layer_bgr = cv2.cvtColor(text_layer_rgba, cv2.COLOR_RGBA2BGR)
+    region = day_result[y0:y1, x0:x1]
+    
+    if alpha_blend:
+        # 옆면 alpha 블렌딩
+        compositing.blend(region, side_layer_bgr, side_layer_rgba[:, :, 3], out=region)
+        
+        # 앞면 alpha 블렌딩
+        compositing.blend(region, text_layer_bgr, text_layer_rgba[:, :, 3], out=region)
+    else:
+        cv2.add(region, side_layer_bgr, dst=region)
+        cv2.add(region, text_layer_bgr, dst=region)
+    
+    return day_result
+
 def analyze_polygon_shape(polygon_points: list) -> str:
     """선택한 폴리곤의 형태를 분석해서 텍스트 방향 결정
     Returns: 'horizontal' or 'vertical'
@@ -954,7 +947,32 @@ def render_scashi_signboard(text: str, bg_color: str, text_color: str, logo_img:
     
     return result
 
-def render_combined_signboard(installation_type: str, sign_type: str, text: str, bg_color: str, text_color: str, logo_img: Image.Image = None, logo_type: str = "channel", text_direction: str = "horizontal", font_size: int = 100, text_position_x: int = 50, text_position_y: int = 50, width: int = 1200, height: int = 300, use_actual_bg_for_training: bool = False, lights_enabled: bool = False, white_background: bool = False, building_photo: np.ndarray = None, polygon_points: list = None, font_family: str = "malgun", font_weight: str = "400"):
+def fit_signboard_text(text: str, installation_type: str, width: int, height: int, font_size: int,
+                       font_family: str = "malgun", font_weight: str = "400",
+                       text_direction: str = "horizontal") -> tuple:
+    """간판(width x height)에 들어가도록 자동 맞춘 폰트와 텍스트 크기 (render_combined_signboard와 같은 여백)
+
+    Returns:
+        (font, metrics) - fit_text_font와 같음
+    """
+    # 유리창시트시공: 패딩 없이 높이에 딱 맞게
+    if installation_type == "유리창시트시공":
+        min_padding_x = 0
+        min_padding_y = 0
+    # 프레임바인 경우 더 여유있게 (텍스트가 프레임바 안에 완전히 들어가야 함)
+    elif installation_type == "프레임바":
+        min_padding_x = int(width * 0.1)   # 좌우 여백 더 여유있게
+        min_padding_y = int(height * 0.1)  # 상하 여백 더 여유있게
+    else:
+        min_padding_x = int(width * 0.05)
+        min_padding_y = int(height * 0.05)
+    return fit_text_font(
+        text, width - (min_padding_x * 2), height - (min_padding_y * 2), font_size,
+        font_family=font_family, font_weight=font_weight,
+        text_direction=text_direction, min_font_size=20,  # 최소 폰트 크기
+    )
+
+def render_combined_signboard(installation_type: str, sign_type: str, text: str, bg_color: str, text_color: str, logo_img: Image.Image = None, logo_type: str = "channel", text_direction: str = "horizontal", font_size: int = 100, text_position_x: int = 50, text_position_y: int = 50, width: int = 1200, height: int = 300, use_actual_bg_for_training: bool = False, lights_enabled: bool = False, white_background: bool = False, building_photo: np.ndarray = None, polygon_points: list = None, font_family: str = "malgun", font_weight: str = "400", text_metrics: dict = None):
     """설치 방식 + 간판 종류 조합 렌더링
     Returns: (signboard_image, text_layer)
     - 전광채널: (signboard, text_layer) - text_layer는 텍스트만 분리
@@ -965,6 +983,8 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
         use_actual_bg_for_training: True면 맨벽/프레임바도 실제 배경색 사용 (학습 데이터용)
                                     False면 맨벽/프레임바는 투명 배경 (시안 생성용, 기본값)
         white_background: True면 모든 설치 방식에 대해 흰색 배경 강제 (평면 시안용)
+        text_metrics: dict를 전달하면 자동 맞춤된 폰트 크기/텍스트 bbox/위치를 채워줌
+                      (font_size, bbox, text_width, text_height, measurements, position)
     """
     # 스카시 재질 파싱
     material = None
@@ -1071,30 +1091,23 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
                 frame_mask_binary = cv2.dilate(frame_mask_binary, kernel, iterations=2)
                 frame_mask_binary = cv2.erode(frame_mask_binary, kernel, iterations=1)
                 
-                # 프레임 마스크를 0~1 범위로 정규화 (프레임 부분 = 0, 유리창 부분 = 1)
-                frame_mask = (255 - frame_mask_binary).astype(np.float32) / 255.0
+                # 프레임 마스크 (프레임 부분 = 0, 유리창 부분 = 255)
+                frame_mask = 255 - frame_mask_binary
                 
                 # 텍스트 렌더링 시 사용할 프레임 마스크 저장
                 window_frame_mask = frame_mask.copy()
                 
                 # 시트지 색상(bg_color) 반영: 유리창 부분만 시트지 색상 블렌딩
                 bg_rgb = hex_to_rgb(bg_color) if bg_color.startswith('#') else (220, 220, 220)
-                sheet_color = np.full((height, width, 3), bg_rgb, dtype=np.float32)
+                sheet_color = np.full((height, width, 3), bg_rgb, dtype=np.uint8)
                 
-                # 건물 사진 영역과 시트지 색상 블렌딩 (유리창 부분만)
-                warped_region_float = warped_region.astype(np.float32)
                 # BGR 순서를 RGB로 변환
-                warped_region_rgb_float = cv2.cvtColor(warped_region_float, cv2.COLOR_BGR2RGB)
-                
-                # 프레임 마스크를 3채널로 확장
-                frame_mask_3ch = np.stack([frame_mask, frame_mask, frame_mask], axis=2)
+                warped_region_rgb = cv2.cvtColor(warped_region, cv2.COLOR_BGR2RGB)
                 
                 # 프레임 부분은 원본 유지, 유리창 부분만 시트지 색상 블렌딩
                 # 건물 사진 40% + 시트지 색상 60% (유리창 부분만)
-                blended = warped_region_rgb_float * frame_mask_3ch * 0.4 + sheet_color * frame_mask_3ch * 0.6
-                # 프레임 부분은 원본 그대로
-                blended = blended + warped_region_rgb_float * (1 - frame_mask_3ch)
-                blended = np.clip(blended, 0, 255).astype(np.uint8)
+                glass_color = cv2.addWeighted(warped_region_rgb, 0.4, sheet_color, 0.6, 0)
+                blended = compositing.blend(warped_region_rgb, glass_color, frame_mask)
                 
                 # 텍스트 렌더링 시 사용할 원본 배경 이미지 저장 (프레임 부분 복원용)
                 window_background_before_text = blended.copy()
@@ -1125,58 +1138,15 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
             return signboard_np, None
         return signboard_np, None
     
-    # 폰트 크기 자동 조정: 텍스트가 영역 안에 들어가도록
-    min_font_size = 20  # 최소 폰트 크기
-    current_font_size = font_size
-    text_width = 0
-    text_height = 0
-    font = None
-    
-    # 텍스트가 영역 안에 들어갈 때까지 폰트 크기 조정
-    draw_temp = ImageDraw.Draw(Image.new('RGB', (width, height)))
-    # 유리창시트시공: 패딩 없이 높이에 딱 맞게
-    if is_window_sheet:
-        min_padding_x = 0
-        min_padding_y = 0
-    # 프레임바인 경우 더 여유있게 (텍스트가 프레임바 안에 완전히 들어가야 함)
-    elif is_frame_bar:
-        min_padding_x = int(width * 0.1)   # 좌우 여백 더 여유있게
-        min_padding_y = int(height * 0.1)  # 상하 여백 더 여유있게
-    else:
-        min_padding_x = int(width * 0.05)
-        min_padding_y = int(height * 0.05)
-    max_text_width = width - (min_padding_x * 2)
-    max_text_height = height - (min_padding_y * 2)
-    
-    while current_font_size >= min_font_size:
-        font = get_korean_font(current_font_size, font_family, font_weight)
-        
-        if text_direction == "vertical":
-            text_vertical = '\n'.join(list(text))
-            bbox = draw_temp.multiline_textbbox((0, 0), text_vertical, font=font)
-        else:
-            bbox = draw_temp.textbbox((0, 0), text, font=font)
-        
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        # 텍스트가 영역 안에 들어가는지 확인
-        if text_width <= max_text_width and text_height <= max_text_height:
-            break
-        
-        # 폰트 크기 줄이기
-        current_font_size -= 2
-        if current_font_size < min_font_size:
-            current_font_size = min_font_size
-            font = get_korean_font(current_font_size, font_family, font_weight)
-            if text_direction == "vertical":
-                text_vertical = '\n'.join(list(text))
-                bbox = draw_temp.multiline_textbbox((0, 0), text_vertical, font=font)
-            else:
-                bbox = draw_temp.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            break
+    # 폰트 크기 자동 조정: 텍스트가 영역 안에 들어가도록 (이진 탐색)
+    font, fit_metrics = fit_signboard_text(
+        text, installation_type, width, height, font_size,
+        font_family=font_family, font_weight=font_weight, text_direction=text_direction,
+    )
+    current_font_size = fit_metrics["font_size"]
+    bbox = fit_metrics["bbox"]
+    text_width = fit_metrics["text_width"]
+    text_height = fit_metrics["text_height"]
     
     # 최종 선택된 bbox의 상단/하단 (baseline 기준 오프셋)
     bbox_top = bbox[1]
@@ -1230,6 +1200,10 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
     
     position = (x_offset, y_offset)
     
+    if text_metrics is not None:
+        text_metrics.update(fit_metrics)
+        text_metrics["position"] = position
+    
     # 프레임바인 경우: 텍스트 위치를 기준으로 프레임바를 중앙에 배치
     # 실제 텍스트 렌더링 위치를 정확히 계산하기 위해 실제 bbox를 다시 측정
     if is_frame_bar:
@@ -1239,11 +1213,9 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
         # 실제 렌더링 위치에서 텍스트 bbox를 다시 측정
         # position은 (x_offset, y_offset)이고, 이게 draw.text()의 baseline 위치
         # textbbox를 position 기준으로 다시 측정하면 실제 텍스트 위치를 알 수 있음
-        if text_direction == "vertical":
-            text_vertical = '\n'.join(list(text))
-            actual_bbox = draw_temp.multiline_textbbox(position, text_vertical, font=font)
-        else:
-            actual_bbox = draw_temp.textbbox(position, text, font=font)
+        # (0, 0) 기준 bbox를 position만큼 이동 (textbbox(position, ...)과 같음)
+        bbox_x0, bbox_y0, bbox_x1, bbox_y1 = measure_text(text, font, text_direction)
+        actual_bbox = (bbox_x0 + position[0], bbox_y0 + position[1], bbox_x1 + position[0], bbox_y1 + position[1])
         
         # 실제 텍스트의 상단과 하단
         text_actual_top = actual_bbox[1]
@@ -1289,51 +1261,46 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
             text_to_render = text
         
         # 실제 텍스트 레이어 먼저 추출 (안티앨리어싱 포함된 alpha 채널 사용)
-        text_layer_rgba = extract_text_layer(text_to_render, font, text_rgb, (width, height), position)
-        text_layer_bgr = cv2.cvtColor(text_layer_rgba, cv2.COLOR_RGBA2BGR)
-        
-        # 실제 alpha 채널로 프레임바 마스킹 (안티앨리어싱 정보 포함)
-        text_alpha_3ch = np.repeat(
-            text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0,
-            3,
-            axis=2
-        )  # (h, w, 3) 형태, 0-1 범위
-        
-        # 프레임바를 별도 레이어로 생성 (numpy 배열로)
-        frame_layer = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        # 알루미늄 막대 (은색, 약간 어두운 회색) - BGR 형식
-        bar_color_bgr = (130, 120, 120)  # RGB(120, 120, 130) -> BGR(130, 120, 120)
-        frame_layer[bar_y:bar_y + bar_height, bar_left:bar_right] = bar_color_bgr
-        
-        # 막대 입체감 (상단 하이라이트) - BGR 형식
-        highlight_color_bgr = (170, 160, 160)  # RGB(160, 160, 170) -> BGR(170, 160, 160)
-        frame_layer[bar_y:bar_y + 2, bar_left:bar_right] = highlight_color_bgr
-        
-        # 막대 하단 그림자 - BGR 형식
-        shadow_color_bgr = (90, 80, 80)  # RGB(80, 80, 90) -> BGR(90, 80, 80)
-        frame_layer[bar_y + bar_height - 2:bar_y + bar_height, bar_left:bar_right] = shadow_color_bgr
-        
-        # 텍스트 영역을 프레임바에서 부드럽게 제외 (실제 alpha 값 사용)
-        # alpha=255(1.0) → 프레임바 0% (완전 제거)
-        # alpha=127(0.5) → 프레임바 50% (반만 제거)
-        # alpha=0(0.0) → 프레임바 100% (유지)
-        frame_layer = (frame_layer.astype(np.float32) * (1 - text_alpha_3ch)).astype(np.uint8)
+        text_raster = extract_text_raster(text_to_render, font, text_rgb, (width, height), position)
         
-        # 프레임바 레이어를 signboard_np에 합성
-        if use_actual_bg_for_training or white_background:
-            # 학습용 또는 흰색 배경: 배경이 있으므로 alpha 블렌딩 사용
-            # 막대가 있는 영역만 alpha 1.0 (frame_layer는 이미 텍스트 영역 제외됨)
-            frame_alpha = (frame_layer.sum(axis=2) > 0).astype(np.float32)
-            frame_alpha_3ch = np.stack([frame_alpha, frame_alpha, frame_alpha], axis=2)
+        # 프레임바 영역(막대 사각형)만 계산 (텍스트가 캔버스 밖이면 막대 없음)
+        bar_rect = (bar_left, bar_y, bar_right, bar_y + bar_height)
+        if bar_width > 0:
+            # 실제 alpha 채널로 프레임바 마스킹 (안티앨리어싱 정보 포함)
+            text_alpha = text_raster.crop(bar_rect)[:, :, 3]  # 0-255
             
-            signboard_np = (
-                signboard_np.astype(np.float32) * (1 - frame_alpha_3ch) +
-                frame_layer.astype(np.float32) * frame_alpha_3ch
-            ).astype(np.uint8)
-        else:
-            # 시안용: 투명 배경이므로 cv2.add 사용 (기존 동작)
-            signboard_np = cv2.add(signboard_np, frame_layer)
+            # 프레임바를 별도 레이어로 생성 (numpy 배열로)
+            frame_layer = np.zeros((bar_height, bar_width, 3), dtype=np.uint8)
+            
+            # 알루미늄 막대 (은색, 약간 어두운 회색) - BGR 형식
+            bar_color_bgr = (130, 120, 120)  # RGB(120, 120, 130) -> BGR(130, 120, 120)
+            frame_layer[:, :] = bar_color_bgr
+            
+            # 막대 입체감 (상단 하이라이트) - BGR 형식
+            highlight_color_bgr = (170, 160, 160)  # RGB(160, 160, 170) -> BGR(170, 160, 160)
+            frame_layer[0:2] = highlight_color_bgr
+            
+            # 막대 하단 그림자 - BGR 형식
+            shadow_color_bgr = (90, 80, 80)  # RGB(80, 80, 90) -> BGR(90, 80, 80)
+            frame_layer[bar_height - 2:bar_height] = shadow_color_bgr
+            
+            # 텍스트 영역을 프레임바에서 부드럽게 제외 (실제 alpha 값 사용)
+            # alpha=255(1.0) → 프레임바 0% (완전 제거)
+            # alpha=127(0.5) → 프레임바 50% (반만 제거)
+            # alpha=0(0.0) → 프레임바 100% (유지)
+            # (내림 나눗셈: 막대로 취급되는 픽셀(0이 아닌 픽셀) 판정을 기존과 동일하게 유지)
+            frame_layer = (frame_layer.astype(np.uint16) * (255 - text_alpha)[:, :, np.newaxis] // 255).astype(np.uint8)
+            
+            # 프레임바 레이어를 signboard_np에 합성
+            bar_region = signboard_np[bar_y:bar_y + bar_height, bar_left:bar_right]
+            if use_actual_bg_for_training or white_background:
+                # 학습용 또는 흰색 배경: 배경이 있으므로 alpha 블렌딩 사용
+                # 막대가 있는 영역만 alpha 1.0 (frame_layer는 이미 텍스트 영역 제외됨)
+                frame_alpha = frame_layer.any(axis=2)
+                np.copyto(bar_region, frame_layer, where=frame_alpha[:, :, np.newaxis])
+            else:
+                # 시안용: 투명 배경이므로 cv2.add 사용 (기존 동작)
+                signboard_np[bar_y:bar_y + bar_height, bar_left:bar_right] = cv2.add(bar_region, frame_layer)
     
     # 간판 종류에 따라 렌더링
     # 전광채널은 모든 설치방식에 대해 동일한 텍스트 렌더링 적용
@@ -1358,17 +1325,18 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
     
     if sign_type == "전광채널":
         # 전광채널: 모든 설치방식(맨벽, 프레임바, 프레임판)에 대해 옆면, 앞면을 사용한 입체적 렌더링 (glow 없음)
-        # 1) 텍스트 앞면(원본 색상)
-        text_layer_rgba = extract_text_layer(text_to_render, font, text_rgb, (width, height), position)
-        text_layer_bgr = cv2.cvtColor(text_layer_rgba, cv2.COLOR_RGBA2BGR)
+        # 1) 텍스트 앞면(원본 색상) - 글자 bbox 영역만 래스터화
+        text_raster = extract_text_raster(text_to_render, font, text_rgb, (width, height), position)
 
         # 2) 텍스트 옆면(원본보다 50% 더 어두운 색상, 오른쪽 아래로 대각선 offset)
         side_color = tuple(int(c * 0.5) for c in text_rgb)
         side_offset_x = 2
         side_offset_y = 1
         side_position = (position[0] + side_offset_x, position[1] + side_offset_y)
-        side_layer_rgba = extract_text_layer(text_to_render, font, side_color, (width, height), side_position)
-        side_layer_bgr = cv2.cvtColor(side_layer_rgba, cv2.COLOR_RGBA2BGR)
+        side_raster = extract_text_raster(text_to_render, font, side_color, (width, height), side_position)
+
+        # 야간 효과용 text_layer는 캔버스 전체 크기로 반환
+        text_layer_bgr = cv2.cvtColor(text_raster.to_canvas(), cv2.COLOR_RGBA2BGR)
 
         day_result = signboard_np.copy()
 
@@ -1377,54 +1345,17 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
             sys.stdout.write(f"[전면프레임 블렌딩] 시작: text_color={text_color}, bg_color={bg_color}\n")
             sys.stdout.flush()
             print(f"[전면프레임 블렌딩] 시작: text_color={text_color}, bg_color={bg_color}", flush=True)
-            # 투명 배경에서 레이어 쌓기 (배경 색과 독립적으로)
             # 전면프레임은 그림자 없음 (프레임에 붙어있어서 그림자가 생기지 않음)
-            h, w = day_result.shape[:2]
-            result = np.zeros((h, w, 4), dtype=np.float32)  # RGBA
-            
-            # 1. 옆면 레이어 (앞면 영역 제외) - 입체감을 위한 옆면만
-            side_alpha = side_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-            side_rgb = side_layer_rgba[:, :, :3].astype(np.float32)
-            text_mask = text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-            
-            # 앞면 영역 제외
-            side_alpha_adjusted = side_alpha * (1 - text_mask)
-            
-            # 알파 합성
-            result[:, :, :3] = result[:, :, :3] * (1 - side_alpha_adjusted) + side_rgb * side_alpha_adjusted
-            result[:, :, 3:4] = np.maximum(result[:, :, 3:4], side_alpha_adjusted)
-            
-            # 2. 앞면 레이어 (100% 불투명)
-            text_alpha = text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-            text_rgb = text_layer_rgba[:, :, :3].astype(np.float32)
-            
-            # 알파 합성
-            result[:, :, :3] = result[:, :, :3] * (1 - text_alpha) + text_rgb * text_alpha
-            result[:, :, 3:4] = np.maximum(result[:, :, 3:4], text_alpha)
-            
-            # 텍스트 영역의 알파를 1.0으로 강제 설정 (전면프레임은 불투명해야 함)
-            text_mask = text_layer_rgba[:, :, 3] > 0
-            result[text_mask, 3] = 1.0
-            
-            # 3. RGB -> BGR 변환 (result[:, :, :3]은 RGB 순서이므로 BGR로 변환 필요)
-            result_rgb = result[:, :, :3].astype(np.uint8)
-            result_bgr = cv2.cvtColor(result_rgb, cv2.COLOR_RGB2BGR).astype(np.float32)
-            
-            # 4. 배경과 합성 (BGR 순서로 통일)
-            result_alpha = result[:, :, 3:4]  # 이미 0-1 범위
-            bg = day_result.astype(np.float32)
-            
-            final = bg * (1 - result_alpha) + result_bgr * result_alpha
-            day_result = np.clip(final, 0, 255).astype(np.uint8)
+            day_result, blend_rect, _ = composite_front_frame_text(day_result, side_raster, text_raster)
             
             # 샘플 확인 (텍스트 영역)
-            text_region_mask = text_layer_rgba[:, :, 3] > 0
-            if text_region_mask.any():
-                sample_y, sample_x = np.where(text_region_mask)
+            if blend_rect is not None:
+                text_layer_rgba = text_raster.crop(blend_rect)
+                sample_y, sample_x = np.where(text_layer_rgba[:, :, 3] > 0)
                 if len(sample_y) > 0:
                     idx = len(sample_y) // 2
-                    y, x = sample_y[idx], sample_x[idx]
-                    text_rgb_value = text_layer_rgba[y, x, :3]
+                    y, x = sample_y[idx] + blend_rect[1], sample_x[idx] + blend_rect[0]
+                    text_rgb_value = text_layer_rgba[sample_y[idx], sample_x[idx], :3]
                     text_bgr_value = text_layer_bgr[y, x]
                     final_value = day_result[y, x]
                     sys.stdout.write(f"[전면프레임 블렌딩] 완료 - 텍스트 샘플[{y},{x}]: text_rgba={text_rgb_value}, text_bgr={text_bgr_value}, 최종={final_value}\n")
@@ -1433,31 +1364,9 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
             
             # 전면프레임은 add_3d_depth를 적용하지 않음 (이미 블렌딩 완료)
         else:
-            # 맨벽/프레임바: 기존 방식 (투명 배경이므로 add 사용 가능)
-            day_f = day_result.astype(np.float32)
-
-            # 옆면, 앞면 합성 (glow 없이)
-            if use_actual_bg_for_training:
-                # 학습용: 배경이 있으므로 alpha 블렌딩 사용
-                # 옆면 alpha 블렌딩
-                side_alpha = side_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-                side_alpha_3ch = np.repeat(side_alpha, 3, axis=2)
-                day_result = (
-                    day_f * (1 - side_alpha_3ch) +
-                    side_layer_bgr.astype(np.float32) * side_alpha_3ch
-                ).astype(np.uint8)
-                
-                # 앞면 alpha 블렌딩
-                text_alpha = text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-                text_alpha_3ch = np.repeat(text_alpha, 3, axis=2)
-                day_result = (
-                    day_result.astype(np.float32) * (1 - text_alpha_3ch) +
-                    text_layer_bgr.astype(np.float32) * text_alpha_3ch
-                ).astype(np.uint8)
-            else:
-                # 시안용: 투명 배경이므로 cv2.add 사용 (기존 동작)
-                day_result = cv2.add(day_f.astype(np.uint8), side_layer_bgr)
-                day_result = cv2.add(day_result, text_layer_bgr)
+            # 맨벽/프레임바: 옆면, 앞면 합성 (glow 없이)
+            # 학습용은 배경이 있으므로 alpha 블렌딩, 시안용은 투명 배경이므로 cv2.add (기존 동작)
+            day_result = composite_channel_text(day_result, side_raster, text_raster, alpha_blend=use_actual_bg_for_training)
             
             # 맨벽/프레임바는 입체감 추가
             if installation_type == "프레임바":
@@ -1499,19 +1408,19 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
         # render_combined_signboard는 주간 이미지만 생성하므로 항상 원본 색상 사용
         text_rgb_for_layer = text_rgb
         
-        # 1) 텍스트 앞면(원본 색상 또는 밝게 조정된 색상)
-        text_layer_rgba = extract_text_layer(text_to_render, font, text_rgb_for_layer, (width, height), position)
+        # 1) 텍스트 앞면(원본 색상 또는 밝게 조정된 색상) - 글자 bbox 영역만 래스터화
+        text_raster = extract_text_raster(text_to_render, font, text_rgb_for_layer, (width, height), position)
+        text_layer_rgba = text_raster.to_canvas()
         text_layer_bgr = cv2.cvtColor(text_layer_rgba, cv2.COLOR_RGBA2BGR)
-        print(f"[DEBUG] 후광/전후광: text_layer_rgba 생성 후 shape={text_layer_rgba.shape}, RGB.min()={text_layer_rgba[:, :, :3].min()}, max()={text_layer_rgba[:, :, :3].max()}, mean()={text_layer_rgba[:, :, :3].mean()}, alpha.max()={text_layer_rgba[:, :, 3].max()}, mean()={text_layer_rgba[:, :, 3].mean()}")
+        print(f"[DEBUG] 후광/전후광: text_raster 생성 후 bounds={text_raster.bounds()}, canvas={text_raster.canvas_size}")
 
         # 2) 텍스트 옆면(원본보다 50% 더 어두운 색상, 오른쪽 아래로 대각선 offset)
         side_color = tuple(int(c * 0.5) for c in text_rgb)
         side_offset_x = 2
         side_offset_y = 1
         side_position = (position[0] + side_offset_x, position[1] + side_offset_y)
-        side_layer_rgba = extract_text_layer(text_to_render, font, side_color, (width, height), side_position)
-        side_layer_bgr = cv2.cvtColor(side_layer_rgba, cv2.COLOR_RGBA2BGR)
-        print(f"[DEBUG] 후광/전후광: side_layer_rgba 생성 후 shape={side_layer_rgba.shape}, RGB.min()={side_layer_rgba[:, :, :3].min()}, max()={side_layer_rgba[:, :, :3].max()}, mean()={side_layer_rgba[:, :, :3].mean()}, alpha.max()={side_layer_rgba[:, :, 3].max()}, mean()={side_layer_rgba[:, :, 3].mean()}")
+        side_raster = extract_text_raster(text_to_render, font, side_color, (width, height), side_position)
+        print(f"[DEBUG] 후광/전후광: side_raster 생성 후 bounds={side_raster.bounds()}")
 
         day_result = signboard_np.copy()
         print(f"[DEBUG] 후광/전후광: signboard_np.shape={signboard_np.shape}, day_result.shape={day_result.shape}, width={width}, height={height}")
@@ -1519,91 +1428,28 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
         # 전면프레임인 경우 alpha 블렌딩 사용 (배경색과 섞이지 않도록) - 전광채널과 완전히 동일
         if installation_type == "전면프레임":
             debug_logger.info(f"[후광/전후광 전면프레임 블렌딩] 시작: sign_type={sign_type}, text_color={text_color}, bg_color={bg_color}")
-            # 투명 배경에서 레이어 쌓기 (배경 색과 독립적으로)
             # 전면프레임은 그림자 없음 (프레임에 붙어있어서 그림자가 생기지 않음)
-            h, w = day_result.shape[:2]
-            result = np.zeros((h, w, 4), dtype=np.float32)  # RGBA
-            
-            # 1. 옆면 레이어 (앞면 영역 제외) - 입체감을 위한 옆면만
-            side_alpha = side_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-            side_rgb = side_layer_rgba[:, :, :3].astype(np.float32)
-            text_mask = text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-            
-            # 앞면 영역 제외
-            side_alpha_adjusted = side_alpha * (1 - text_mask)
-            
-            # 알파 합성
-            result[:, :, :3] = result[:, :, :3] * (1 - side_alpha_adjusted) + side_rgb * side_alpha_adjusted
-            result[:, :, 3:4] = np.maximum(result[:, :, 3:4], side_alpha_adjusted)
-            
-            # 2. 앞면 레이어 (100% 불투명)
-            text_alpha = text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-            text_rgb = text_layer_rgba[:, :, :3].astype(np.float32)
-            
-            # 알파 합성
-            result[:, :, :3] = result[:, :, :3] * (1 - text_alpha) + text_rgb * text_alpha
-            result[:, :, 3:4] = np.maximum(result[:, :, 3:4], text_alpha)
-            
-            # 텍스트 영역의 알파를 1.0으로 강제 설정 (전면프레임은 불투명해야 함)
-            text_mask = text_layer_rgba[:, :, 3] > 0
-            result[text_mask, 3] = 1.0
-            debug_logger.debug(f"텍스트 알파 강제 설정: text_mask 픽셀 수={text_mask.sum()}, result[text_mask, 3].min()={result[text_mask, 3].min()}, max()={result[text_mask, 3].max()}")
-            
-            # 3. RGB -> BGR 변환 (result[:, :, :3]은 RGB 순서이므로 BGR로 변환 필요)
-            result_rgb = result[:, :, :3].astype(np.uint8)
-            result_bgr = cv2.cvtColor(result_rgb, cv2.COLOR_RGB2BGR).astype(np.float32)
-            
-            # 4. 배경과 합성 (BGR 순서로 통일)
-            result_alpha = result[:, :, 3:4]  # 이미 0-1 범위
-            bg = day_result.astype(np.float32)
-            debug_logger.debug(f"배경 정보: bg_color={bg_color}, bg_rgb={hex_to_rgb(bg_color) if bg_color.startswith('#') else (107, 45, 143)}, bg.shape={bg.shape}, bg.mean()={bg.mean():.2f}")
-            debug_logger.debug(f"텍스트 레이어: result_bgr.shape={result_bgr.shape}, result_bgr.mean()={result_bgr.mean():.2f}, result_alpha.mean()={result_alpha.mean():.4f}, result_alpha.max()={result_alpha.max():.4f}")
-            
-            final = bg * (1 - result_alpha) + result_bgr * result_alpha
-            day_result = np.clip(final, 0, 255).astype(np.uint8)
-            debug_logger.debug(f"블렌딩 결과: final.shape={final.shape}, final.mean()={final.mean():.2f}, day_result.mean()={day_result.mean():.2f}")
+            day_result, blend_rect, result_alpha = composite_front_frame_text(day_result, side_raster, text_raster)
+            debug_logger.debug(f"블렌딩 결과: rect={blend_rect}, day_result.mean()={day_result.mean():.2f}")
             
             # 샘플 확인 (텍스트 영역)
-            text_region_mask = text_layer_rgba[:, :, 3] > 0
-            if text_region_mask.any():
-                sample_y, sample_x = np.where(text_region_mask)
+            if blend_rect is not None:
+                sample_y, sample_x = np.where(text_raster.crop(blend_rect)[:, :, 3] > 0)
                 if len(sample_y) > 0:
                     idx = len(sample_y) // 2
-                    y, x = sample_y[idx], sample_x[idx]
+                    y, x = sample_y[idx] + blend_rect[1], sample_x[idx] + blend_rect[0]
                     text_rgb_value = text_layer_rgba[y, x, :3]
                     text_bgr_value = text_layer_bgr[y, x]
                     final_value = day_result[y, x]
-                    debug_logger.info(f"텍스트 샘플[{y},{x}]: text_rgba={text_rgb_value}, text_bgr={text_bgr_value}, 최종={final_value}, result_alpha[{y},{x}]={result_alpha[y, x, 0]:.4f}")
+                    debug_logger.info(f"텍스트 샘플[{y},{x}]: text_rgba={text_rgb_value}, text_bgr={text_bgr_value}, 최종={final_value}, result_alpha[{y},{x}]={result_alpha[sample_y[idx], sample_x[idx]] / 255.0:.4f}")
             
             # 전면프레임은 add_3d_depth를 적용하지 않음 (이미 블렌딩 완료)
             # glow 처리를 위해 result 설정
             result = day_result.copy()
         else:
-            # 맨벽/프레임바: 기존 방식 (투명 배경이므로 add 사용 가능)
-            day_f = day_result.astype(np.float32)
-
-            # 옆면, 앞면 합성
-            if use_actual_bg_for_training:
-                # 학습용: 배경이 있으므로 alpha 블렌딩 사용
-                # 옆면 alpha 블렌딩
-                side_alpha = side_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-                side_alpha_3ch = np.repeat(side_alpha, 3, axis=2)
-                day_result = (
-                    day_f * (1 - side_alpha_3ch) +
-                    side_layer_bgr.astype(np.float32) * side_alpha_3ch
-                ).astype(np.uint8)
-                
-                # 앞면 alpha 블렌딩
-                text_alpha = text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-                text_alpha_3ch = np.repeat(text_alpha, 3, axis=2)
-                day_result = (
-                    day_result.astype(np.float32) * (1 - text_alpha_3ch) +
-                    text_layer_bgr.astype(np.float32) * text_alpha_3ch
-                ).astype(np.uint8)
-            else:
-                # 시안용: 투명 배경이므로 cv2.add 사용 (기존 동작)
-                day_result = cv2.add(day_f.astype(np.uint8), side_layer_bgr)
-                day_result = cv2.add(day_result, text_layer_bgr)
+            # 맨벽/프레임바: 옆면, 앞면 합성
+            # 학습용은 배경이 있으므로 alpha 블렌딩, 시안용은 투명 배경이므로 cv2.add (기존 동작)
+            day_result = composite_channel_text(day_result, side_raster, text_raster, alpha_blend=use_actual_bg_for_training)
             
             # 맨벽/프레임바는 입체감 추가
             if installation_type == "프레임바":
@@ -1618,54 +1464,20 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
             # 후광채널: lights_enabled=True일 때만 주간에도 후광 glow 효과 적용
             if lights_enabled:
                 # 후광 효과: 텍스트 뒤에서 빛나는 효과 (더 강하게)
-                # text_mask를 (H, W) 형태로 변환 (Gaussian blur를 위해)
-                text_mask = text_layer_rgba[:, :, 3].astype(np.float32) / 255.0  # (H, W)
-                
-
-                
-                # ============ 이미지 크기 기반 동적 후광 조정 ============
-                image_area = width * height
-                
-                # 작은 이미지 (512x512=262,144 이하): pix2pix용 자연스러운 후광
-                if image_area <= 300000:  # 약 548x548 이하
-                    # 작은 blur로 자연스러운 후광
-                    blur_size1, blur_size2, blur_size3 = (31, 31), (31, 31), (21, 21)
-                    sigma1, sigma2, sigma3 = 15, 15, 10
-                    intensity = 1.8  # 낮은 강도
-                else:
-                    # 큰 이미지: 기존 설정 유지 (웹 간판시안생성기)
-                    blur_size1, blur_size2, blur_size3 = (141, 141), (141, 141), (121, 121)
-                    sigma1, sigma2, sigma3 = 70, 70, 60
-                    intensity = 4.0
-                
-                # 동적 blur 적용
-                backlight = safe_gaussian_blur(text_mask, blur_size1, sigma1)  # 첫 번째 blur
-                backlight = safe_gaussian_blur(backlight, blur_size2, sigma2)  # 두 번째 blur
-                backlight = safe_gaussian_blur(backlight, blur_size3, sigma3)  # 세 번째 blur로 더 부드럽게
-                # ========================================================
-                
-                # 후광 색상: 기본 따뜻한 흰색 LED (대부분 후광채널이 이 색상 사용)
-                glow_color_bgr = np.array([220, 245, 255], dtype=np.float32)  # BGR: 따뜻한 흰색
-                
-                # (H, W) -> (H, W, 3)으로 변환, 따뜻한 흰색 LED 적용
-                backlight_3d = backlight[:, :, np.newaxis]  # (H, W, 1)
-                # 후광 glow: 동적 강도 적용
-                backlight_glow = (backlight_3d * glow_color_bgr[np.newaxis, np.newaxis, :] * intensity).clip(0, 255).astype(np.float32)
+                # 이미지 크기 기반 동적 후광 (작은 이미지는 pix2pix용 자연스러운 후광, 큰 이미지는 넓고 강한 후광)
+                # 넓은 blur는 glow 엔진이 피라미드에서 계산하고, 같은 텍스트 마스크는 캐시에서 재사용
+                text_mask_u8 = text_layer_rgba[:, :, 3]
+                backlight_glow = render_backlight(text_mask_u8, width * height)
                 
                 # day_result와 크기 확인 및 리사이즈
                 if day_result.shape[:2] != backlight_glow.shape[:2]:
                     backlight_glow = cv2.resize(backlight_glow, (day_result.shape[1], day_result.shape[0]), interpolation=cv2.INTER_AREA)
-                # ============ 수정: text_mask도 크기 조정 ============
-                # text_mask를 day_result 크기에 맞춤
-                if day_result.shape[:2] != text_mask.shape[:2]:
-                    text_mask = cv2.resize(text_mask, (day_result.shape[1], day_result.shape[0]), interpolation=cv2.INTER_AREA)
+                # text_mask(uint8)도 day_result 크기에 맞춤
+                if day_result.shape[:2] != text_mask_u8.shape[:2]:
+                    text_mask_u8 = cv2.resize(text_mask_u8, (day_result.shape[1], day_result.shape[0]), interpolation=cv2.INTER_AREA)
 
-                # ============ 수정 부분 ============
                 # 글자 영역 제외하고 후광만 적용
-                text_mask_3ch = np.stack([text_mask, text_mask, text_mask], axis=2)
-                backlight_only = backlight_glow * (1 - text_mask_3ch)
-                day_result = day_result.astype(np.float32) + backlight_only
-                day_result = np.clip(day_result, 0, 255).astype(np.uint8)
+                day_result = compositing.add(day_result, backlight_glow, 255 - text_mask_u8)
                 # ==================================
                 
         else:
@@ -1691,11 +1503,10 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
                 
                 # day_result에서 텍스트 영역(밝은 부분) 추출
                 gray = cv2.cvtColor(day_result, cv2.COLOR_BGR2GRAY)
-                bright_mask = (gray > 50).astype(np.float32)  # 밝은 부분 마스크
-                bright_mask_3ch = np.stack([bright_mask, bright_mask, bright_mask], axis=2)
-                bright_area = day_result.astype(np.float32) * bright_mask_3ch
-                text_glow = safe_gaussian_blur(bright_area.astype(np.uint8), mixed_blur_size, mixed_sigma)
-                debug_logger.debug(f"전후광채널 전면프레임 glow: bright_mask 픽셀 수={bright_mask.sum()}, text_glow.mean()={text_glow.mean():.2f}")
+                bright_mask = gray > 50  # 밝은 부분 마스크
+                bright_area = np.where(bright_mask[:, :, np.newaxis], day_result, np.uint8(0))
+                text_glow = safe_gaussian_blur(bright_area, mixed_blur_size, mixed_sigma)
+                debug_logger.debug(f"전후광채널 전면프레임 glow: bright_mask 픽셀 수={int(np.count_nonzero(bright_mask))}, text_glow.mean()={text_glow.mean():.2f}")
                 day_result = cv2.addWeighted(day_result, 1.0, text_glow, mixed_intensity, 0)
                 debug_logger.debug(f"전후광채널 전면프레임 glow 완료: day_result.mean()={day_result.mean():.2f}")
             else:
@@ -1728,41 +1539,48 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
     
     elif sign_type == "스카시":
         # 스카시: 비조명 입체
-        # 1) 텍스트 앞면
-        text_layer_rgba = extract_text_layer(text_to_render, font, text_rgb, (width, height), position)
-        text_layer_bgr = cv2.cvtColor(text_layer_rgba, cv2.COLOR_RGBA2BGR)
+        # 1) 텍스트 앞면 - 글자 bbox 영역만 래스터화
+        text_raster = extract_text_raster(text_to_render, font, text_rgb, (width, height), position)
 
         # 2) 텍스트 옆면 (원본보다 50% 더 어두운 색상, 오른쪽 아래로 대각선 offset)
         side_color = tuple(int(c * 0.5) for c in text_rgb)  # 0.5x (원래대로)
         side_offset_x = 2
         side_offset_y = 1
         side_position = (position[0] + side_offset_x, position[1] + side_offset_y)
-        side_layer_rgba = extract_text_layer(text_to_render, font, side_color, (width, height), side_position)
-        side_layer_bgr = cv2.cvtColor(side_layer_rgba, cv2.COLOR_RGBA2BGR)
-
-        result_f = signboard_np.copy().astype(np.float32)
-
-        # 옆면, 앞면 합성 (alpha blending 사용 - 색상 간섭 방지)
-        # 옆면 alpha blending
-        side_alpha = side_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-        side_alpha_3ch = np.repeat(side_alpha, 3, axis=2)
-        result_f = result_f * (1 - side_alpha_3ch) + side_layer_bgr.astype(np.float32) * side_alpha_3ch
-        
-        # 앞면 alpha blending
-        text_alpha = text_layer_rgba[:, :, 3:4].astype(np.float32) / 255.0
-        text_alpha_3ch = np.repeat(text_alpha, 3, axis=2)
-        result_f = result_f * (1 - text_alpha_3ch) + text_layer_bgr.astype(np.float32) * text_alpha_3ch
+        side_raster = extract_text_raster(text_to_render, font, side_color, (width, height), side_position)
 
-        # 살짝 하이라이트 추가 (기존 스카시 느낌 유지)
+        # 3) 살짝 하이라이트 (기존 스카시 느낌 유지)
         highlight_pos = (position[0] - 1, position[1] - 1)
         highlight_rgb = tuple(min(255, c + 30) for c in text_rgb)
-        highlight_layer_rgba = extract_text_layer(text_to_render, font, highlight_rgb, (width, height), highlight_pos)
-        highlight_layer_bgr = cv2.cvtColor(highlight_layer_rgba, cv2.COLOR_RGBA2BGR)
-        result_f = cv2.addWeighted(result_f, 0.95, highlight_layer_bgr.astype(np.float32), 0.15, 0)
+        highlight_raster = extract_text_raster(text_to_render, font, highlight_rgb, (width, height), highlight_pos)
+
+        # 하이라이트 합성은 전체를 0.95배 한 뒤 글자 영역에만 하이라이트를 더함
+        result_np = compositing.scale(signboard_np, 0.95)
+
+        rect = union_bounds(side_raster, text_raster, highlight_raster)
+        if rect is not None:
+            x0, y0, x1, y1 = rect
+            region = signboard_np[y0:y1, x0:x1].copy()
+
+            # 옆면, 앞면 합성 (alpha blending 사용 - 색상 간섭 방지)
+            # 옆면 alpha blending
+            side_layer_rgba = side_raster.crop(rect)
+            side_layer_bgr = cv2.cvtColor(side_layer_rgba, cv2.COLOR_RGBA2BGR)
+            compositing.blend(region, side_layer_bgr, side_layer_rgba[:, :, 3], out=region)
+
+            # 앞면 alpha blending
+            text_layer_rgba = text_raster.crop(rect)
+            text_layer_bgr = cv2.cvtColor(text_layer_rgba, cv2.COLOR_RGBA2BGR)
+            compositing.blend(region, text_layer_bgr, text_layer_rgba[:, :, 3], out=region)
+
+            # 하이라이트
+            highlight_layer_bgr = cv2.cvtColor(highlight_raster.crop(rect), cv2.COLOR_RGBA2BGR)
+            result_np[y0:y1, x0:x1] = cv2.addWeighted(region, 0.95, highlight_layer_bgr, 0.15, 0)
 
         # 금속/아크릴 질감 노이즈 유지
-        texture = np.random.randint(-3, 3, result_f.shape, dtype=np.int16).astype(np.float32)
-        result_f = np.clip(result_f + texture, 0, 255).astype(np.uint8)
+        texture = np.random.randint(-3, 3, result_np.shape, dtype=np.int16)
+        texture += result_np
+        result_f = np.clip(texture, 0, 255).astype(np.uint8)
 
         # 유리창시트시공: 입체감 없음 (유리창에 딱 붙는 시트지)
         if not is_window_sheet:
@@ -1822,17 +1640,10 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
         # 유리창시트시공: 프레임 마스크 적용하여 격자무늬 부분의 텍스트 제거
         if is_window_sheet and window_frame_mask is not None and window_background_before_text is not None:
             # 텍스트가 그려진 이미지를 RGB로 변환 (프레임 마스크와 블렌딩하기 위해)
-            result_rgb = cv2.cvtColor(result_np, cv2.COLOR_BGR2RGB).astype(np.float32)
-            
-            # 프레임 마스크를 3채널로 확장 (프레임 부분 = 0, 유리창 부분 = 1)
-            frame_mask_3ch = np.stack([window_frame_mask, window_frame_mask, window_frame_mask], axis=2)
-            
-            # 원본 배경 이미지(RGB)를 float32로 변환
-            background_rgb = window_background_before_text.astype(np.float32)
+            result_rgb = cv2.cvtColor(result_np, cv2.COLOR_BGR2RGB)
             
-            # 프레임 부분(마스크 = 0)에서는 원본 배경 이미지를 사용하고, 유리창 부분(마스크 = 1)에서는 텍스트가 그려진 이미지를 사용
-            result_rgb = background_rgb * (1 - frame_mask_3ch) + result_rgb * frame_mask_3ch
-            result_rgb = np.clip(result_rgb, 0, 255).astype(np.uint8)
+            # 프레임 부분(마스크 = 0)에서는 원본 배경 이미지를 사용하고, 유리창 부분(마스크 = 255)에서는 텍스트가 그려진 이미지를 사용
+            result_rgb = compositing.blend(window_background_before_text, result_rgb, window_frame_mask)
             
             # RGB를 BGR로 변환
             result_np = cv2.cvtColor(result_rgb, cv2.COLOR_RGB2BGR)
@@ -1844,7 +1655,7 @@ def render_combined_signboard(installation_type: str, sign_type: str, text: str,
             result = result_np
         return result, None
 
-def render_signboard(text: str, logo_path: str, logo_type: str, installation_type: str, sign_type: str, bg_color: str, text_color: str, text_direction: str = "horizontal", font_size: int = 100, text_position_x: int = 50, text_position_y: int = 50, width: int = 1200, height: int = 300, use_actual_bg_for_training: bool = False, lights_enabled: bool = False, white_background: bool = False, building_photo: np.ndarray = None, polygon_points: list = None, font_family: str = "malgun", font_weight: str = "400") -> tuple:
+def render_signboard(text: str, logo_path: str, logo_type: str, installation_type: str, sign_type: str, bg_color: str, text_color: str, text_direction: str = "horizontal", font_size: int = 100, text_position_x: int = 50, text_position_y: int = 50, width: int = 1200, height: int = 300, use_actual_bg_for_training: bool = False, lights_enabled: bool = False, white_background: bool = False, building_photo: np.ndarray = None, polygon_points: list = None, font_family: str = "malgun", font_weight: str = "400", text_metrics: dict = None) -> tuple:
     """간판 이미지 생성 - 설치 방식 + 간판 종류
     Returns: (day_image, text_layer) - text_layer는 전광채널만 분리, 나머지는 None
     
@@ -1865,32 +1676,32 @@ def render_signboard(text: str, logo_path: str, logo_type: str, installation_typ
     # 야간 합성에서만 전광/후광 차이를 둔다.
     if sign_type == "전광채널":
         # 전광채널: 직접 처리 (주간은 그림자+옆면+앞면, 야간은 별도 처리)
-        result, text_layer = render_combined_signboard(installation_type, "전광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, text_layer = render_combined_signboard(installation_type, "전광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, text_layer
     elif sign_type == "후광채널":
-        result, text_layer = render_combined_signboard(installation_type, "후광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, text_layer = render_combined_signboard(installation_type, "후광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, text_layer
     elif sign_type == "전후광채널":
-        result, text_layer = render_combined_signboard(installation_type, "전후광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, text_layer = render_combined_signboard(installation_type, "전후광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, text_layer
     elif sign_type.startswith("스카시"):
         # 스카시_금속, 스카시_아크릴 등 모든 스카시 변형 지원
         print(f"[DEBUG] render_signboard: 스카시 감지, sign_type={sign_type}, render_combined_signboard 호출")
-        result, _ = render_combined_signboard(installation_type, sign_type, text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, _ = render_combined_signboard(installation_type, sign_type, text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, None
     elif sign_type == "플렉스":
-        result, _ = render_combined_signboard(installation_type, "플렉스", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, _ = render_combined_signboard(installation_type, "플렉스", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, None
     elif sign_type == "어닝간판":
-        result, _ = render_combined_signboard(installation_type, "어닝간판", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, _ = render_combined_signboard(installation_type, "어닝간판", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, None
     elif sign_type == "시트시공":
         # 시트시공: 유리창에 시트지 부착 (유리창시트시공 설치 방식과 함께 사용)
-        result, _ = render_combined_signboard(installation_type, "시트시공", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, _ = render_combined_signboard(installation_type, "시트시공", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, None
     else:
         # 기본값: 전광채널
-        result, text_layer = render_combined_signboard(installation_type, "전광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight)
+        result, text_layer = render_combined_signboard(installation_type, "전광채널", text, bg_color, text_color, logo_img, logo_type, text_direction, font_size, text_position_x, text_position_y, width, height, use_actual_bg_for_training, lights_enabled, white_background, building_photo, polygon_points, font_family, font_weight, text_metrics)
         return result, text_layer
 
 def order_points(pts):
@@ -1927,6 +1738,66 @@ def order_points(pts):
     
     return np.array([top_left, top_right, bottom_right, bottom_left], dtype=np.float32)
 
+# composite_signboard ROI 여백 (px): 폴리곤 마스크 blur(2) + 거리 기반 후광(15) + 19x19 blur 두 번(18)보다 크게
+COMPOSITE_ROI_MARGIN = 48
+
+def composite_roi(points: np.ndarray, width: int, height: int, margin: int = COMPOSITE_ROI_MARGIN) -> tuple:
+    """간판 합성 영역: 폴리곤 바운딩 박스 + 여백 (사진 범위로 잘림)
+    Returns: (x0, y0, x1, y1)
+    """
+    x0 = max(0, int(np.floor(points[:, 0].min())) - margin)
+    y0 = max(0, int(np.floor(points[:, 1].min())) - margin)
+    x1 = min(width, int(np.ceil(points[:, 0].max())) + margin + 1)
+    y1 = min(height, int(np.ceil(points[:, 1].max())) + margin + 1)
+    if x0 >= x1 or y0 >= y1:
+        # 폴리곤이 사진 밖에 있으면 전체 사진 사용 (기존 동작)
+        return 0, 0, width, height
+    return x0, y0, x1, y1
+
+# 미리보기 모드(quality="preview") 기본 출력 너비 (px)
+PREVIEW_WIDTH = int(os.getenv("PREVIEW_WIDTH", "960"))
+
+def downscale_for_preview(image: np.ndarray, width: int, source: np.ndarray = None) -> tuple:
+    """미리보기용 축소 사진과 원본 대비 배율 (원본 가로가 width 이하이면 그대로, 배율 1.0)
+
+    source: 축소를 시작할 더 작은 사진 (사진 세션의 피라미드 레벨, 가로 width 이상)
+    """
+    h, w = image.shape[:2]
+    if width <= 0 or w <= width:
+        return image, 1.0
+    scale = width / w
+    source = image if source is None else source
+    return cv2.resize(source, (width, max(1, round(h * scale))), interpolation=cv2.INTER_AREA), scale
+
+def scale_points(points: list, scale: float) -> list:
+    """폴리곤 점 좌표에 배율 적용"""
+    if scale == 1.0:
+        return points
+    return [[p[0] * scale, p[1] * scale] for p in points]
+
+def scale_lights(lights: list, scale: float) -> list:
+    """조명 반경(px)에 배율 적용 (위치는 0~1 비율이라 그대로)"""
+    if scale == 1.0:
+        return lights
+    return [{**light, "radius": float(light.get("radius", 150)) * scale} for light in lights]
+
+# outputs 파라미터로 고를 수 있는 결과물 → 응답 키
+# - day: 주간 합성, night: 야간 합성 (후광/조명 포함), sign: 건물에 합성하기 전 간판 이미지
+OUTPUT_KEYS = {"day": "day_simulation", "night": "night_simulation", "sign": "sign_layer"}
+DEFAULT_OUTPUTS = "day,night"
+
+def parse_outputs(value: str) -> set:
+    """outputs 파라미터 ("day,night,sign" 중 일부, 쉼표 구분) 파싱
+
+    Raises:
+        ValueError: 알 수 없는 이름이거나 비어 있는 경우
+    """
+    names = {name.strip().lower() for name in (value or DEFAULT_OUTPUTS).split(",") if name.strip()}
+    unknown = names - set(OUTPUT_KEYS)
+    if unknown or not names:
+        raise ValueError(f"알 수 없는 outputs: {value} ({', '.join(OUTPUT_KEYS)} 중 쉼표로 구분)")
+    return names
+
 def generate_flat_design(
     building_photo: np.ndarray,  # 원본 건물 사진
     polygon_points: list,
@@ -2068,13 +1939,10 @@ def generate_flat_design(
     # 검은색 부분은 건물 배경을 보여주고, 나머지는 간판을 보여줌
     signboard_gray = cv2.cvtColor(signboard_resized, cv2.COLOR_BGR2GRAY)
     _, mask = cv2.threshold(signboard_gray, 10, 255, cv2.THRESH_BINARY)  # 검은색(0~10)은 배경, 나머지는 간판
-    mask = mask.astype(np.float32) / 255.0
-    mask = np.stack([mask, mask, mask], axis=2)
     
     # 알파 블렌딩: 간판이 있는 부분은 간판, 없는 부분은 건물 배경
     canvas_region = canvas_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width]
-    blended = (signboard_resized * mask + canvas_region * (1 - mask)).astype(np.uint8)
-    canvas_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width] = blended
+    compositing.blend(canvas_region, signboard_resized, mask, out=canvas_region)
     
     # 10. 치수 표시 (우측에)
     if show_dimensions:
@@ -2137,7 +2005,7 @@ def apply_night_glow_to_signboard(
         if len(text_layer_resized.shape) == 3 and text_layer_resized.shape[2] == 4:
             # RGBA -> BGR 변환
             text_layer_bgr = cv2.cvtColor(text_layer_resized[:, :, :3], cv2.COLOR_RGB2BGR)
-            text_mask = text_layer_resized[:, :, 3].astype(np.float32) / 255.0  # (H, W)
+            text_mask_u8 = text_layer_resized[:, :, 3]
             
             if sign_type == "전광채널":
                 # 전광: 텍스트 앞에서 빛남
@@ -2146,67 +2014,30 @@ def apply_night_glow_to_signboard(
                 
             elif sign_type == "후광채널":
                 # 후광: Phase 1의 1407-1459줄 로직 그대로 재사용
-                # ============ 이미지 크기 기반 동적 후광 조정 ============
-                if image_area <= 300000:  # 약 548x548 이하
-                    blur_size1, blur_size2, blur_size3 = (31, 31), (31, 31), (21, 21)
-                    sigma1, sigma2, sigma3 = 15, 15, 10
-                    intensity = 1.8
-                else:
-                    blur_size1, blur_size2, blur_size3 = (141, 141), (141, 141), (121, 121)
-                    sigma1, sigma2, sigma3 = 70, 70, 60
-                    intensity = 4.0
-                
-                # 동적 blur 적용
-                backlight = safe_gaussian_blur(text_mask, blur_size1, sigma1)
-                backlight = safe_gaussian_blur(backlight, blur_size2, sigma2)
-                backlight = safe_gaussian_blur(backlight, blur_size3, sigma3)
-                
-                # 후광 색상: 기본 따뜻한 흰색 LED (Phase 1과 동일)
-                glow_color_bgr = np.array([220, 245, 255], dtype=np.float32)  # BGR
-                backlight_3d = backlight[:, :, np.newaxis]  # (H, W, 1)
-                backlight_glow = (backlight_3d * glow_color_bgr[np.newaxis, np.newaxis, :] * intensity).clip(0, 255).astype(np.float32)
+                # 이미지 크기 기반 동적 후광 (넓은 blur는 glow 엔진의 피라미드 계산 + 마스크 캐시)
+                backlight_glow = render_backlight(text_mask_u8, image_area)
                 
                 # 크기 확인 및 리사이즈
                 if signboard_resized.shape[:2] != backlight_glow.shape[:2]:
                     backlight_glow = cv2.resize(backlight_glow, (signboard_resized.shape[1], signboard_resized.shape[0]), interpolation=cv2.INTER_AREA)
-                if signboard_resized.shape[:2] != text_mask.shape[:2]:
-                    text_mask = cv2.resize(text_mask, (signboard_resized.shape[1], signboard_resized.shape[0]), interpolation=cv2.INTER_AREA)
+                if signboard_resized.shape[:2] != text_mask_u8.shape[:2]:
+                    text_mask_u8 = cv2.resize(text_mask_u8, (signboard_resized.shape[1], signboard_resized.shape[0]), interpolation=cv2.INTER_AREA)
                 
                 # 글자 영역 제외하고 후광만 적용 (Phase 1과 동일)
-                text_mask_3ch = np.stack([text_mask, text_mask, text_mask], axis=2)
-                backlight_only = backlight_glow * (1 - text_mask_3ch)
-                signboard_resized = signboard_resized.astype(np.float32) + backlight_only
-                signboard_resized = np.clip(signboard_resized, 0, 255).astype(np.uint8)
+                signboard_resized = compositing.add(signboard_resized, backlight_glow, 255 - text_mask_u8)
                 
             elif sign_type == "전후광채널":
                 # 전후광: 후광 + 전광
                 # 1) 후광 효과 먼저 적용 (후광채널과 동일)
-                if image_area <= 300000:
-                    blur_size1, blur_size2, blur_size3 = (31, 31), (31, 31), (21, 21)
-                    sigma1, sigma2, sigma3 = 15, 15, 10
-                    intensity = 1.8
-                else:
-                    blur_size1, blur_size2, blur_size3 = (141, 141), (141, 141), (121, 121)
-                    sigma1, sigma2, sigma3 = 70, 70, 60
-                    intensity = 4.0
-                
-                backlight = safe_gaussian_blur(text_mask, blur_size1, sigma1)
-                backlight = safe_gaussian_blur(backlight, blur_size2, sigma2)
-                backlight = safe_gaussian_blur(backlight, blur_size3, sigma3)
-                
-                glow_color_bgr = np.array([220, 245, 255], dtype=np.float32)
-                backlight_3d = backlight[:, :, np.newaxis]
-                backlight_glow = (backlight_3d * glow_color_bgr[np.newaxis, np.newaxis, :] * intensity).clip(0, 255).astype(np.float32)
+                # 이미지 크기 기반 동적 후광 (넓은 blur는 glow 엔진의 피라미드 계산 + 마스크 캐시)
+                backlight_glow = render_backlight(text_mask_u8, image_area)
                 
                 if signboard_resized.shape[:2] != backlight_glow.shape[:2]:
                     backlight_glow = cv2.resize(backlight_glow, (signboard_resized.shape[1], signboard_resized.shape[0]), interpolation=cv2.INTER_AREA)
-                if signboard_resized.shape[:2] != text_mask.shape[:2]:
-                    text_mask = cv2.resize(text_mask, (signboard_resized.shape[1], signboard_resized.shape[0]), interpolation=cv2.INTER_AREA)
+                if signboard_resized.shape[:2] != text_mask_u8.shape[:2]:
+                    text_mask_u8 = cv2.resize(text_mask_u8, (signboard_resized.shape[1], signboard_resized.shape[0]), interpolation=cv2.INTER_AREA)
                 
-                text_mask_3ch = np.stack([text_mask, text_mask, text_mask], axis=2)
-                backlight_only = backlight_glow * (1 - text_mask_3ch)
-                signboard_resized = signboard_resized.astype(np.float32) + backlight_only
-                signboard_resized = np.clip(signboard_resized, 0, 255).astype(np.uint8)
+                signboard_resized = compositing.add(signboard_resized, backlight_glow, 255 - text_mask_u8)
                 
                 # 2) 전광 효과 추가 적용
                 text_glow = safe_gaussian_blur(text_layer_bgr, (25, 25), 10)
@@ -2220,16 +2051,12 @@ def apply_night_glow_to_signboard(
             glow = safe_gaussian_blur(signboard_resized, (25, 25), 10)
             signboard_resized = cv2.addWeighted(signboard_resized, 1.0, glow, 0.6, 0)
         elif sign_type == "후광채널":
-            backlight = safe_gaussian_blur(mask, (81, 81), 40)
-            backlight = safe_gaussian_blur(backlight, (81, 81), 40)
-            backlight_bgr = cv2.cvtColor(backlight, cv2.COLOR_GRAY2BGR)
-            backlight_bgr = (backlight_bgr.astype(np.float32) * 1.5).clip(0, 255).astype(np.uint8)
+            backlight = glow_field(mask, UPLOAD_BACKLIGHT_PASSES)
+            backlight_bgr = compositing.colorize(backlight, (255, 255, 255), 1.5)
             signboard_resized = cv2.add(signboard_resized, backlight_bgr)
         elif sign_type == "전후광채널":
-            backlight = safe_gaussian_blur(mask, (81, 81), 40)
-            backlight = safe_gaussian_blur(backlight, (81, 81), 40)
-            backlight_bgr = cv2.cvtColor(backlight, cv2.COLOR_GRAY2BGR)
-            backlight_bgr = (backlight_bgr.astype(np.float32) * 1.5).clip(0, 255).astype(np.uint8)
+            backlight = glow_field(mask, UPLOAD_BACKLIGHT_PASSES)
+            backlight_bgr = compositing.colorize(backlight, (255, 255, 255), 1.5)
             signboard_resized = cv2.add(signboard_resized, backlight_bgr)
             
             glow = safe_gaussian_blur(signboard_resized, (25, 25), 10)
@@ -2429,14 +2256,12 @@ def generate_dual_flat_design(
         else:
             # 주간 모드: text_layer 사용
             text_layer_resized = cv2.resize(text_layer, (frame_width, frame_height), interpolation=cv2.INTER_LINEAR)
-            alpha = text_layer_resized[:, :, 3:4].astype(np.float32) / 255.0
-            alpha_3ch = np.repeat(alpha, 3, axis=2)
-            
             text_rgb = text_layer_resized[:, :, :3]
             
             # RGBA -> RGB 변환 (흰색 배경에 합성)
-            blended_rgb = (np.ones((frame_height, frame_width, 3), dtype=np.float32) * 255) * (1 - alpha_3ch) + text_rgb * alpha_3ch
-            signboard_final = cv2.cvtColor(blended_rgb.astype(np.uint8), cv2.COLOR_RGB2BGR)
+            white = np.full((frame_height, frame_width, 3), 255, dtype=np.uint8)
+            blended_rgb = compositing.blend(white, text_rgb, text_layer_resized[:, :, 3], out=white)
+            signboard_final = cv2.cvtColor(blended_rgb, cv2.COLOR_RGB2BGR)
     else:
         # text_layer가 없으면 간판 이미지 그대로 사용
         signboard_final = signboard_resized
@@ -2476,38 +2301,25 @@ def generate_dual_flat_design(
             # 발광 효과가 적용된 signboard_resized를 배경에 합성
             # text_layer의 알파 채널을 마스크로 사용
             text_layer_resized = cv2.resize(text_layer, (frame_width, frame_height), interpolation=cv2.INTER_LINEAR)
-            alpha = text_layer_resized[:, :, 3:4].astype(np.float32) / 255.0
-            alpha_3ch = np.repeat(alpha, 3, axis=2)
             
             # 배경과 합성 (발광 효과가 적용된 signboard_resized 사용)
-            canvas_region = canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width].astype(np.float32)
-            blended = canvas_region * (1 - alpha_3ch) + signboard_resized.astype(np.float32) * alpha_3ch
-            canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width] = blended.astype(np.uint8)
+            canvas_region = canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width]
+            compositing.blend(canvas_region, signboard_resized, text_layer_resized[:, :, 3], out=canvas_region)
         else:
             # 주간 모드: 기존 방식 (text_layer 사용)
             text_layer_resized = cv2.resize(text_layer, (frame_width, frame_height), interpolation=cv2.INTER_LINEAR)
-            alpha = text_layer_resized[:, :, 3:4].astype(np.float32) / 255.0
-            alpha_3ch = np.repeat(alpha, 3, axis=2)
-            
-            text_rgb = text_layer_resized[:, :, :3]
+            text_bgr = cv2.cvtColor(text_layer_resized[:, :, :3], cv2.COLOR_RGB2BGR)
             
             # 배경과 합성
-            canvas_region = canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width].astype(np.float32)
-            canvas_region_rgb = cv2.cvtColor(canvas_region.astype(np.uint8), cv2.COLOR_BGR2RGB)
-            
-            blended_rgb = canvas_region_rgb * (1 - alpha_3ch) + text_rgb * alpha_3ch
-            blended_bgr = cv2.cvtColor(blended_rgb.astype(np.uint8), cv2.COLOR_RGB2BGR)
-            canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width] = blended_bgr
+            canvas_region = canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width]
+            compositing.blend(canvas_region, text_bgr, text_layer_resized[:, :, 3], out=canvas_region)
     else:
         # text_layer가 없으면 검정 배경 처리 (기존 방식)
         signboard_gray = cv2.cvtColor(signboard_resized, cv2.COLOR_BGR2GRAY)
         _, mask = cv2.threshold(signboard_gray, 10, 255, cv2.THRESH_BINARY)
-        mask = mask.astype(np.float32) / 255.0
-        mask_3ch = np.stack([mask, mask, mask], axis=2)
         
-        canvas_region = canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width].astype(np.float32)
-        blended = (signboard_resized.astype(np.float32) * mask_3ch + canvas_region * (1 - mask_3ch)).astype(np.uint8)
-        canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width] = blended
+        canvas_region = canvas_context_np[frame_y:frame_y + frame_height, frame_x:frame_x + frame_width]
+        compositing.blend(canvas_region, signboard_resized, mask, out=canvas_region)
     
     # 6. 치수 표시 (두 이미지 모두)
     dimensions_dict = {}
@@ -2680,23 +2492,37 @@ def composite_signboard(
     building_photo_night: np.ndarray = None,
     pre_darkened: bool = False,
     installation_type: str = "맨벽",  # 추가: 전면프레임에서 transparency_mask 제외하기 위해
+    timings: dict = None,  # 전달되면 단계별 처리 시간(조명별 비용 포함)을 기록
+    render_night: bool = True,  # False면 주간만 합성 (야간 결과는 None)
 ) -> tuple:
     """이미지 합성 - 주간/야간 버전 생성 (폴리곤 지원)
     text_layer: 전광채널의 경우 텍스트만 분리된 레이어 (None이면 전체 간판 사용)
+    render_night=False면 야간 경로(배경 어둡게, 후광/glow, 조명)를 건너뛰고 (주간, None) 반환
     """
     # 전면프레임-전후광채널 디버그: 실제 들어온 값 확인
     debug_logger.info(f"[composite_signboard 진입] installation_type='{installation_type}', sign_type='{sign_type}', installation_type==전면프레임={installation_type == '전면프레임'}, sign_type==전후광채널={sign_type == '전후광채널'}")
-    h, w = building_photo.shape[:2]
+    photo_h, photo_w = building_photo.shape[:2]
     sh, sw = signboard_image.shape[:2]
     
     # 폴리곤 점을 numpy 배열로 변환
     src_points = np.array(polygon_points, dtype=np.float32)
+    if len(polygon_points) == 4:
+        # 점들을 올바른 순서로 정렬 (좌상, 우상, 우하, 좌하)
+        src_points = order_points(polygon_points)
+    
+    # 간판 ROI (폴리곤 bbox + glow 여백): 이후 모든 warp/마스크/glow/블렌딩은 ROI 좌표계에서 수행하고
+    # 마지막에 ROI만 사진 크기 결과에 써넣는다 (비용이 사진 크기가 아니라 간판 크기에 비례)
+    roi_x0, roi_y0, roi_x1, roi_y1 = composite_roi(src_points, photo_w, photo_h)
+    if timings is not None:
+        timings["composite_roi"] = [roi_x0, roi_y0, roi_x1, roi_y1]
+    full_building_photo = building_photo
+    building_photo = full_building_photo[roi_y0:roi_y1, roi_x0:roi_x1]
+    h, w = building_photo.shape[:2]
+    src_points = src_points - np.array([roi_x0, roi_y0], dtype=np.float32)
     
     # 폴리곤이 정확히 4점이면 원근 변환 사용, 아니면 바운딩 박스 + 마스크
     M = None  # M 변수를 미리 정의
     if len(polygon_points) == 4:
-        # 점들을 올바른 순서로 정렬 (좌상, 우상, 우하, 좌하)
-        src_points = order_points(polygon_points)
         # 4점: 기존 원근 변환 방식
         dst_points = np.array([
             [0, 0],
@@ -2714,9 +2540,9 @@ def composite_signboard(
         else:
             warped_text_full = None
     else:
-        # n점 (n != 4): 바운딩 박스에 간판을 배치하고 폴리곤 마스크 적용
-        xs = [p[0] for p in polygon_points]
-        ys = [p[1] for p in polygon_points]
+        # n점 (n != 4): 바운딩 박스에 간판을 배치하고 폴리곤 마스크 적용 (ROI 좌표)
+        xs = src_points[:, 0]
+        ys = src_points[:, 1]
         min_x, max_x = int(min(xs)), int(max(xs))
         min_y, max_y = int(min(ys)), int(max(ys))
         bbox_w = max_x - min_x
@@ -2733,7 +2559,7 @@ def composite_signboard(
             resized_sign = signboard_image
             resized_text = text_layer
         
-        # 건물 사진 크기의 빈 이미지에 배치
+        # ROI 크기의 빈 이미지에 배치
         warped_sign = np.zeros((h, w, 3), dtype=np.uint8)
         if resized_sign is not None and resized_sign.size > 0:
             if min_y + bbox_h <= h and min_x + bbox_w <= w:
@@ -2749,13 +2575,11 @@ def composite_signboard(
         else:
             warped_text_full = None
     
-    # 폴리곤 마스크 생성
+    # 폴리곤 마스크 생성 (uint8 한 채널, 0~255)
     mask = np.zeros((h, w), dtype=np.uint8)
     cv2.fillPoly(mask, [src_points.astype(np.int32)], 255)
     mask = safe_gaussian_blur(mask, (5, 5), 0)
-    mask = mask.astype(np.float32) / 255.0
-    mask = np.stack([mask, mask, mask], axis=2)
-    print(f"[DEBUG] composite_signboard: mask 생성 후 min()={mask.min()}, max()={mask.max()}, sum()={mask.sum()}")
+    print(f"[DEBUG] composite_signboard: mask 생성 후 min()={mask.min()}, max()={mask.max()}, 면적={np.count_nonzero(mask)}")
     
     # 주간 버전: 자연스러운 블렌딩
     # 검은색 부분은 건물 사진을 투과 (프레임바/맨벽 등 투명 배경 처리)
@@ -2766,19 +2590,17 @@ def composite_signboard(
         sys.stdout.write(f"[composite_signboard] 전면프레임 감지 - transparency_mask 전체 영역으로 설정\n")
         sys.stdout.flush()
         print(f"[composite_signboard] 전면프레임 감지 - transparency_mask 전체 영역으로 설정", flush=True)
-        transparency_mask = np.ones((h, w, 3), dtype=np.float32)  # 전면프레임은 전체 영역 사용
+        transparency_mask = np.ones((h, w), dtype=bool)  # 전면프레임은 전체 영역 사용
         combined_mask = mask
     else:
         # 프레임바/맨벽: 검은색 마스크 생성 (밝기 임계값) - 투명 배경 처리
         gray_sign = cv2.cvtColor(warped_sign, cv2.COLOR_BGR2GRAY)
         brightness_threshold = 30  # 밝기 30 이하는 투명으로 처리
-        transparency_mask = (gray_sign > brightness_threshold).astype(np.float32)
-        transparency_mask = np.stack([transparency_mask, transparency_mask, transparency_mask], axis=2)
+        transparency_mask = gray_sign > brightness_threshold
         
         # 폴리곤 마스크와 투명도 마스크를 결합
-        combined_mask = mask * transparency_mask
+        combined_mask = np.where(transparency_mask, mask, np.uint8(0))
     
-    day_result = building_photo.copy().astype(np.float32)
     # warped_sign과 combined_mask가 제대로 생성되었는지 확인
     if warped_sign is None or warped_sign.size == 0:
         print(f"[ERROR] composite_signboard: warped_sign이 비어있음: warped_sign={warped_sign}")
@@ -2788,32 +2610,40 @@ def composite_signboard(
         combined_mask = mask
     print(f"[DEBUG] composite_signboard: building_photo.shape={building_photo.shape}, warped_sign.shape={warped_sign.shape}, combined_mask.shape={combined_mask.shape}")
     print(f"[DEBUG] composite_signboard: warped_sign.min()={warped_sign.min()}, warped_sign.max()={warped_sign.max()}, warped_sign.sum()={warped_sign.sum()}")
-    print(f"[DEBUG] composite_signboard: combined_mask.min()={combined_mask.min()}, combined_mask.max()={combined_mask.max()}, combined_mask.sum()={combined_mask.sum()}")
-    day_result = day_result * (1 - combined_mask) + warped_sign.astype(np.float32) * combined_mask
-    day_result = day_result.astype(np.uint8)
+    print(f"[DEBUG] composite_signboard: combined_mask.min()={combined_mask.min()}, combined_mask.max()={combined_mask.max()}, 면적={np.count_nonzero(combined_mask)}")
+    day_result = compositing.blend(building_photo, warped_sign, combined_mask)
     print(f"[DEBUG] composite_signboard: day_result.shape={day_result.shape}, day_result.min()={day_result.min()}, day_result.max()={day_result.max()}")
     # day_result에서 warped_sign 영역 확인
-    if combined_mask.sum() > 0:
-        mask_area = day_result[combined_mask[:,:,0] > 0.5]
-        if mask_area.size > 0:
-            print(f"[DEBUG] composite_signboard: mask 영역 day_result.min()={mask_area.min()}, max()={mask_area.max()}, mean()={mask_area.mean()}")
+    mask_region = combined_mask > 127
+    if mask_region.any():
+        mask_area = day_result[mask_region]
+        print(f"[DEBUG] composite_signboard: mask 영역 day_result.min()={mask_area.min()}, max()={mask_area.max()}, mean()={mask_area.mean()}")
         # warped_sign의 mask 영역도 확인
-        warped_mask_area = warped_sign[combined_mask[:,:,0] > 0.5]
-        if warped_mask_area.size > 0:
-            print(f"[DEBUG] composite_signboard: mask 영역 warped_sign.min()={warped_mask_area.min()}, max()={warped_mask_area.max()}, mean()={warped_mask_area.mean()}")
+        warped_mask_area = warped_sign[mask_region]
+        print(f"[DEBUG] composite_signboard: mask 영역 warped_sign.min()={warped_mask_area.min()}, max()={warped_mask_area.max()}, mean()={warped_mask_area.mean()}")
         # building_photo의 mask 영역도 확인
-        building_mask_area = building_photo[combined_mask[:,:,0] > 0.5]
-        if building_mask_area.size > 0:
-            print(f"[DEBUG] composite_signboard: mask 영역 building_photo.min()={building_mask_area.min()}, max()={building_mask_area.max()}, mean()={building_mask_area.mean()}")
+        building_mask_area = building_photo[mask_region]
+        print(f"[DEBUG] composite_signboard: mask 영역 building_photo.min()={building_mask_area.min()}, max()={building_mask_area.max()}, mean()={building_mask_area.mean()}")
+    
+    if not render_night:
+        # 주간만 요청: ROI 결과만 사진 크기 결과에 써넣고 야간 경로는 생략
+        full_day = full_building_photo.copy()
+        full_day[roi_y0:roi_y1, roi_x0:roi_x1] = day_result
+        return full_day, None
     
     # 야간 버전: 배경 어둡게
     # building_photo_night가 주어지면 그걸 기준으로 사용 (멀티 간판에서 이미 어둡게 된 야간 이미지)
-    night_src = building_photo_night if building_photo_night is not None else building_photo
+    night_src = building_photo_night if building_photo_night is not None else full_building_photo
     if pre_darkened:
         # 이미 한 번 어둡게 처리된 야간 이미지 위에 추가 합성
-        night_base = night_src.copy().astype(np.float32)
+        full_night_base = night_src
     else:
-        night_base = night_src.copy().astype(np.float32) * 0.25  # 전체 배경 어둡게
+        full_night_base = compositing.scale(night_src, 0.25)  # 전체 배경 어둡게
+    night_base = full_night_base[roi_y0:roi_y1, roi_x0:roi_x1]
+    
+    # 야간 간판 바탕: 배경은 야간, 간판 영역은 주간 간판의 25% 밝기
+    def darkened_sign_base(sign_scale: float = 0.25) -> np.ndarray:
+        return compositing.blend(night_base, compositing.scale(warped_sign, sign_scale), combined_mask)
     
     # 검은색 부분 투명도 처리 (야간에도 적용)
     # gray_sign과 transparency_mask는 이미 위에서 계산됨
@@ -2828,7 +2658,7 @@ def composite_signboard(
         # ---- 1) 텍스트 방식 (text_layer가 있는 경우) ----
         if text_layer is not None:
             # 텍스트/배경 분리
-            bg_layer = signboard_image.copy()
+            bg_layer = signboard_image
 
             # text_layer 크기가 signboard_image와 다를 수 있으므로 리사이즈
             if text_layer.shape[:2] != signboard_image.shape[:2]:
@@ -2837,30 +2667,27 @@ def composite_signboard(
                 text_layer_resized = text_layer
 
             # 텍스트 마스크 생성 (전광/후광/전후광 공통)
-            text_mask = (text_layer_resized.sum(axis=2) > 0).astype(np.float32)
-            text_mask_3 = np.stack([text_mask, text_mask, text_mask], axis=2)
+            text_mask = text_layer_resized.any(axis=2)
 
             # 배경만 추출 (텍스트 제외)
-            bg_only = bg_layer * (1 - text_mask_3)
+            bg_only = np.where(text_mask[:, :, np.newaxis], np.uint8(0), bg_layer)
 
             # 배경/텍스트를 각각 건물 사진 크기로 변환
             if len(polygon_points) == 4 and M is not None:
                 warped_bg = cv2.warpPerspective(bg_only, M, (w, h))
                 warped_text = cv2.warpPerspective(text_layer_resized, M, (w, h))
-                text_mask_warped = cv2.warpPerspective(text_mask_3, M, (w, h))
+                text_mask_warped = cv2.warpPerspective(text_mask.astype(np.uint8) * np.uint8(255), M, (w, h))
             else:
-                warped_bg = np.zeros((h, w, 3), dtype=np.float32)
+                warped_bg = np.zeros((h, w, 3), dtype=np.uint8)
                 if bbox_w > 0 and bbox_h > 0:
                     resized_bg = cv2.resize(bg_only, (bbox_w, bbox_h))
                     warped_bg[min_y:min_y+bbox_h, min_x:min_x+bbox_w] = resized_bg
 
                 warped_text = warped_text_full if warped_text_full is not None else np.zeros((h, w, 3), dtype=np.uint8)
-                text_mask_warped = (warped_text.sum(axis=2) > 0).astype(np.float32)
-                text_mask_warped = np.stack([text_mask_warped, text_mask_warped, text_mask_warped], axis=2)
+                text_mask_warped = compositing.as_mask(warped_text.any(axis=2))
 
             # ----- 전광/전후광용 night_front 계산 -----
-            warped_bg_dark = warped_bg.astype(np.float32) * 0.25
-            base_night_front = night_base * (1 - combined_mask) + warped_bg_dark * combined_mask
+            base_night_front = compositing.blend(night_base, compositing.scale(warped_bg, 0.25), combined_mask)
             
             # 전광채널과 전후광채널은 다르게 처리
             if sign_type == "전광채널":
@@ -2869,61 +2696,28 @@ def composite_signboard(
                 night_front = base_night_front
             else:
                 # 전후광채널: 텍스트 포함
-                text_contrib = warped_text.astype(np.float32) * text_mask_warped * transparency_mask
+                text_contrib = compositing.premultiply(warped_text, np.where(transparency_mask, text_mask_warped, np.uint8(0)))
                 night_front = np.maximum(base_night_front, text_contrib)
 
             # ----- 후광용 night_back 계산 -----
             if sign_type in ["후광채널", "전후광채널"]:
-                # text_mask_warped가 제대로 생성되었는지 확인
+                # text_mask_warped가 제대로 생성되었는지 확인 (uint8 한 채널, 텍스트 영역 255)
                 if text_mask_warped is not None and text_mask_warped.size > 0:
-                    # 1채널 마스크 (텍스트 영역만 1)
-                    # text_mask_warped가 3채널이면 첫 번째 채널 사용, 아니면 그대로 사용
-                    if len(text_mask_warped.shape) == 3 and text_mask_warped.shape[2] == 3:
-                        text_mask_1ch = text_mask_warped[:, :, 0].astype(np.float32)
-                    elif len(text_mask_warped.shape) == 2:
-                        text_mask_1ch = text_mask_warped.astype(np.float32)
-                    else:
-                        # 예외 처리: text_mask_warped 형식이 다를 경우
-                        text_mask_1ch = np.zeros((h, w), dtype=np.float32)
+                    text_mask_uint8 = text_mask_warped
                 else:
                     # text_mask_warped가 없으면 night_back 생성 안 함
-                    text_mask_1ch = None
+                    text_mask_uint8 = None
                 
-                if text_mask_1ch is not None:
-                    # 텍스트 마스크를 uint8로 변환
-                    text_mask_uint8 = (text_mask_1ch * 255).astype(np.uint8)
-                    
-                    # Distance Transform: 글자 바깥쪽에서의 거리 계산
-                    text_mask_inv = 255 - text_mask_uint8
-                    dist_transform = cv2.distanceTransform(text_mask_inv, cv2.DIST_L2, 5)
-                    
-                    # 글자 윤곽선 주변에 glow 적용
-                    # 제일 밝은 부분(0-2px)은 줄이고, 그라디언트 범위(2-15px)는 넓히기
-                    max_dist = 15.0
-                    inner_dist = 2.0
-                    
-                    glow_mask = np.zeros_like(dist_transform, dtype=np.float32)
-                    bright_mask = (dist_transform > 0) & (dist_transform <= inner_dist)
-                    glow_mask[bright_mask] = 0.6 * (1.0 - (dist_transform[bright_mask] / inner_dist))
-                    
-                    gradient_mask = (dist_transform > inner_dist) & (dist_transform <= max_dist)
-                    if gradient_mask.any():
-                        glow_mask[gradient_mask] = 0.6 * (1.0 - ((dist_transform[gradient_mask] - inner_dist) / (max_dist - inner_dist)))
-                    
-                    glow_mask[text_mask_1ch > 0.5] = 0
-                    
-                    # 부드러운 blur 적용 (더 타이트하게)
-                    glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)
-                    glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)
+                if text_mask_uint8 is not None:
+                    # 글자 윤곽선 주변 후광 (0-2px는 밝기 제한, 2-15px는 점진적으로 옅어짐, 글자 내부 제외)
+                    glow_mask = contour_glow(text_mask_uint8, text_mask_uint8 > 127)
                     
                     # 따뜻한 흰색 LED 색상 적용
-                    glow_color_bgr = np.array([220, 245, 255], dtype=np.float32)
-                    glow_mask_3d = glow_mask[:, :, np.newaxis]
-                    backlight_glow = (glow_mask_3d * glow_color_bgr[np.newaxis, np.newaxis, :] * 3.5).clip(0, 255).astype(np.float32)
+                    glow_color_bgr = (220, 245, 255)
+                    backlight_glow = compositing.colorize(glow_mask, glow_color_bgr, 3.5)
 
-                    base_night_back = night_base * (1 - combined_mask)
-                    signboard_dark = warped_sign.astype(np.float32) * combined_mask * 0.25 if warped_sign is not None else base_night_back
-                    night_back = base_night_back + signboard_dark + backlight_glow
+                    # 배경 + 어두운 간판 + 후광
+                    night_back = compositing.add(darkened_sign_base(), backlight_glow)
                 else:
                     # text_mask_warped가 없으면 night_back 생성 안 함 (None 유지)
                     night_back = None
@@ -2934,23 +2728,18 @@ def composite_signboard(
                 # 모든 설치방식(맨벽, 프레임바, 프레임판)에 동일하게 적용
                 
                 # 1) 주간 결과 전체를 어둡게 만듦
-                warped_sign_dark = warped_sign.astype(np.float32) * 0.25
-                night_result_base = night_base.astype(np.float32) * (1 - combined_mask) + warped_sign_dark * combined_mask
+                night_result_base = darkened_sign_base()
                 
                 # 2) 주간 결과에서 앞면 부분만 추출 - warped_text_full의 마스크 사용 (정확한 텍스트 앞면 영역)
                 # warped_text_full은 text_layer를 warped한 것으로, 앞면만 포함하므로 정확함
                 if warped_text_full is not None:
-                    front_mask_full = (warped_text_full.sum(axis=2) > 0).astype(np.float32)
-                    front_mask_3ch = np.stack([front_mask_full, front_mask_full, front_mask_full], axis=2)
+                    front_mask = warped_text_full.any(axis=2)
                 else:
                     # warped_text_full이 없으면 text_mask_warped 사용
-                    front_mask_3ch = text_mask_warped.astype(np.float32)
-                
-                # 주간 결과에서 앞면 부분만 추출 (주간 결과 이미지 그대로 사용)
-                day_front_from_sign = warped_sign.astype(np.float32) * front_mask_3ch
+                    front_mask = text_mask_warped
                 
                 # 앞면 부분만 주간 색상으로 복원 (나머지는 어두운 야간 색상 유지)
-                night_result = night_result_base * (1 - front_mask_3ch) + day_front_from_sign
+                night_result = compositing.blend(night_result_base, warped_sign, front_mask, out=night_result_base)
 
             elif sign_type == "후광채널":
                 # 후광채널: 기존 night_back 로직 그대로 사용
@@ -2961,28 +2750,21 @@ def composite_signboard(
                 # 전후광채널: 후광 효과 + 글자 윗면만 주간 색상으로 복원
                 if night_back is not None:
                     # 1) 후광 효과를 기본으로 사용 (night_back)
-                    night_result = night_back.astype(np.float32)
+                    night_result = night_back
                     
                     # 2) 글자 윗면(앞면) 부분만 주간 색상으로 복원 (전광 효과)
                     if warped_text_full is not None:
                         # warped_text_full은 text_layer를 warped한 것으로, 앞면만 포함
-                        front_mask_full = (warped_text_full.sum(axis=2) > 0).astype(np.float32)
-                        front_mask_3ch = np.stack([front_mask_full, front_mask_full, front_mask_full], axis=2)
-                    elif text_mask_warped is not None and len(text_mask_warped.shape) >= 2:
-                        # text_mask_warped가 3채널이면 그대로, 1채널이면 3채널로 변환
-                        if len(text_mask_warped.shape) == 2:
-                            front_mask_3ch = np.stack([text_mask_warped, text_mask_warped, text_mask_warped], axis=2)
-                        else:
-                            front_mask_3ch = text_mask_warped.astype(np.float32)
+                        front_mask = warped_text_full.any(axis=2)
+                    elif text_mask_warped is not None:
+                        front_mask = text_mask_warped
                     else:
                         # text_mask_warped도 없으면 기본 마스크 생성
-                        front_mask_3ch = combined_mask.astype(np.float32)
+                        front_mask = combined_mask
                     
-                    # 주간 결과에서 앞면 부분만 추출
+                    # 앞면 부분만 주간 색상으로 복원 (나머지는 후광 효과 유지)
                     if warped_sign is not None:
-                        day_front_from_sign = warped_sign.astype(np.float32) * front_mask_3ch
-                        # 앞면 부분만 주간 색상으로 복원 (나머지는 후광 효과 유지)
-                        night_result = night_result * (1 - front_mask_3ch) + day_front_from_sign
+                        night_result = compositing.blend(night_result, warped_sign, front_mask, out=night_result)
                 else:
                     # night_back이 None인 경우: text_layer가 없거나 text_mask_warped가 없는 경우
                     # 기본 야간 처리 후 이미지 업로드 방식으로 넘어감
@@ -2991,61 +2773,31 @@ def composite_signboard(
         # ---- 2) 텍스트 레이어가 없을 때 (이미지 업로드 방식) ----
         if night_result is None:
             # 이미지 업로드 방식: 기존 로직 유지 (전/후/전후 광)
-            base_night = night_base * (1 - combined_mask)
-            image_contrib = warped_sign.astype(np.float32) * combined_mask
-
             if sign_type == "전후광채널":
                 # 로고 마스크 생성 (밝은 부분 감지)
                 gray_sign = cv2.cvtColor(warped_sign, cv2.COLOR_BGR2GRAY)
-                logo_mask = (gray_sign > 10).astype(np.float32)
+                logo_mask = gray_sign > 10
 
-                logo_mask_1ch = logo_mask
                 # 로고 마스크를 distance transform으로 처리 (글자 윤곽선 따라)
-                logo_mask_uint8 = (logo_mask_1ch * 255).astype(np.uint8)
-                # 로고 바깥쪽에서의 거리 계산
-                logo_mask_inv = 255 - logo_mask_uint8
-                dist_transform = cv2.distanceTransform(logo_mask_inv, cv2.DIST_L2, 5)
-                
-                # 로고 윤곽선 주변에 glow 적용
-                # 제일 밝은 부분(0-2px)은 줄이고, 그라디언트 범위(2-15px)는 넓히기
-                max_dist = 15.0
-                inner_dist = 2.0
-                
-                glow_mask = np.zeros_like(dist_transform, dtype=np.float32)
-                bright_mask = (dist_transform > 0) & (dist_transform <= inner_dist)
-                glow_mask[bright_mask] = 0.6 * (1.0 - (dist_transform[bright_mask] / inner_dist))
-                
-                gradient_mask = (dist_transform > inner_dist) & (dist_transform <= max_dist)
-                if gradient_mask.any():
-                    glow_mask[gradient_mask] = 0.6 * (1.0 - ((dist_transform[gradient_mask] - inner_dist) / (max_dist - inner_dist)))
-                
-                glow_mask[logo_mask_1ch > 0.5] = 0
-                
-                # 부드러운 blur 적용 (더 타이트하게)
-                glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)
-                glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)
+                logo_mask_uint8 = compositing.as_mask(logo_mask)
+                # 로고 윤곽선 주변 후광 (0-2px는 밝기 제한, 2-15px는 점진적으로 옅어짐, 로고 내부 제외)
+                glow_mask = contour_glow(logo_mask_uint8, logo_mask)
                 
                 # 따뜻한 흰색 LED 색상 적용
-                glow_color_bgr = np.array([220, 245, 255], dtype=np.float32)
-                glow_mask_3d = glow_mask[:, :, np.newaxis]
-                backlight_glow = (glow_mask_3d * glow_color_bgr[np.newaxis, np.newaxis, :] * 3.5).clip(0, 255).astype(np.float32)
-
-                # 후광 효과 적용
-                logo_mask_3ch = np.stack([logo_mask, logo_mask, logo_mask], axis=2)
-                signboard_dark = warped_sign.astype(np.float32) * combined_mask * 0.25
-                backlight_glow_masked = backlight_glow * (1 - logo_mask_3ch)
-                night_with_backlight = base_night + signboard_dark + backlight_glow_masked
+                glow_color_bgr = (220, 245, 255)
+                backlight_glow = compositing.colorize(glow_mask, glow_color_bgr, 3.5)
+
+                # 후광 효과 적용 (로고 영역 제외)
+                backlight_glow[logo_mask] = 0
+                night_with_backlight = compositing.add(darkened_sign_base(), backlight_glow)
                 
                 # 로고 영역에서 야간 효과를 80% 제거 (주간 밝기로 80% 복원) - 전광 효과
-                day_logo = warped_sign.astype(np.float32) * logo_mask_3ch
-                logo_restore_mask = logo_mask_3ch * 0.8  # 80% 복원
+                logo_restore_mask = np.where(logo_mask, np.uint8(204), np.uint8(0))  # 80% 복원
                 
                 # 후광 효과 + 로고 영역 전광 효과 합성
-                night_result = night_with_backlight * (1 - logo_restore_mask) + day_logo * logo_restore_mask
+                night_result = compositing.blend(night_with_backlight, warped_sign, logo_restore_mask, out=night_with_backlight)
             else:
-                night_result = base_night + image_contrib
-
-        night_result = np.clip(night_result, 0, 255).astype(np.uint8)
+                night_result = compositing.blend(night_base, warped_sign, combined_mask)
 
     else:
         # 다른 간판 종류: 전체 간판에 발광 강도 적용
@@ -3055,249 +2807,86 @@ def composite_signboard(
             if text_layer is not None and warped_text_full is not None:
                 # warped_text_full은 이미 건물 사진 크기로 변환된 텍스트 레이어
                 # 텍스트 마스크 생성 (건물 사진 크기에서)
-                text_mask_warped = (warped_text_full.sum(axis=2) > 0).astype(np.float32)
+                text_mask_warped = warped_text_full.any(axis=2)
                 
                 # 글자 뒤에서 빛나는 효과 - 글자 윤곽선을 따라 정확하게 빛나도록
                 # 1) 텍스트 마스크를 uint8로 변환
-                text_mask_uint8 = (text_mask_warped * 255).astype(np.uint8)
-                
-                # 2) Distance Transform: 글자에서의 거리 계산 (글자 바깥쪽만)
-                # 글자 마스크를 invert해서 글자 바깥쪽에서의 거리 계산
-                text_mask_inv = 255 - text_mask_uint8
-                dist_transform = cv2.distanceTransform(text_mask_inv, cv2.DIST_L2, 5)
-                
-                # 3) 글자 윤곽선 주변에 glow 적용
-                # 제일 밝은 부분(0-2px)은 줄이고, 그라디언트 범위(2-15px)는 넓히기
-                max_dist = 15.0  # 그라디언트 범위 확장
-                inner_dist = 2.0  # 제일 밝은 부분 범위
-                
-                glow_mask = np.zeros_like(dist_transform, dtype=np.float32)
-                # 제일 밝은 부분(0-2px): 밝기 제한 (0.6 정도)
-                bright_mask = (dist_transform > 0) & (dist_transform <= inner_dist)
-                glow_mask[bright_mask] = 0.6 * (1.0 - (dist_transform[bright_mask] / inner_dist))
-                
-                # 그라디언트 부분(2-15px): 점진적으로 옅어짐
-                gradient_mask = (dist_transform > inner_dist) & (dist_transform <= max_dist)
-                if gradient_mask.any():
-                    # 2px에서 0.6, 15px에서 0.0으로 선형 감소
-                    glow_mask[gradient_mask] = 0.6 * (1.0 - ((dist_transform[gradient_mask] - inner_dist) / (max_dist - inner_dist)))
+                text_mask_uint8 = compositing.as_mask(text_mask_warped)
                 
-                # 글자 내부는 제외 (원본 마스크가 1인 곳은 0으로)
-                glow_mask[text_mask_warped > 0.5] = 0
+                # 2) 글자 윤곽선 주변 후광 (0-2px는 밝기 제한, 2-15px는 점진적으로 옅어짐, 글자 내부 제외)
+                glow_mask = contour_glow(text_mask_uint8, text_mask_warped)
                 
-                # 4) 부드러운 blur 적용 (윤곽선 따라 자연스럽게, 더 타이트하게)
-                glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)
-                glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)  # 두 번째 blur
+                # 3) 따뜻한 흰색 LED 색상 적용
+                glow_color_bgr = (220, 245, 255)
+                backlight_glow = compositing.colorize(glow_mask, glow_color_bgr, 3.5)
                 
-                # 5) 따뜻한 흰색 LED 색상 적용
-                glow_color_bgr = np.array([220, 245, 255], dtype=np.float32)
-                glow_mask_3d = glow_mask[:, :, np.newaxis]
-                backlight_glow = (glow_mask_3d * glow_color_bgr[np.newaxis, np.newaxis, :] * 3.5).clip(0, 255).astype(np.float32)
-                
-                # 배경은 어둡게, 글자 뒤에서만 빛나는 효과 추가
-                base_night = night_base * (1 - combined_mask)
-                signboard_dark = warped_sign.astype(np.float32) * combined_mask * 0.25
-
-                # 기본 야간 이미지 (배경 + 후광)
-                night_with_backlight = base_night + signboard_dark + backlight_glow
+                # 기본 야간 이미지 (어두운 배경 + 어두운 간판 + 후광)
+                night_result = compositing.add(darkened_sign_base(), backlight_glow)
 
                 # 글자 영역을 어두운 실루엣으로 (주간 밝기의 20% 정도)
-                text_dark = warped_sign.astype(np.float32) * combined_mask * 0.2
-                text_mask_3ch = np.stack([text_mask_warped, text_mask_warped, text_mask_warped], axis=2)
-                bg_mask_3ch = 1.0 - text_mask_3ch
-
-                night_result = night_with_backlight * bg_mask_3ch + text_dark * text_mask_3ch
-                night_result = np.clip(night_result, 0, 255).astype(np.uint8)
+                text_dark = compositing.premultiply(compositing.scale(warped_sign, 0.2), combined_mask)
+                night_result[text_mask_warped] = text_dark[text_mask_warped]
             else:
                 # 이미지 업로드 방식: 로고 윤곽을 따라 후광 효과 적용
                 # 투명 처리된 이미지의 경우 검은색(0,0,0)이 아닌 부분이 로고 영역
                 # 로고 마스크 생성 (밝은 부분 감지)
                 gray_sign = cv2.cvtColor(warped_sign, cv2.COLOR_BGR2GRAY)
                 # 검은색이 아닌 부분을 로고로 간주 (밝기 10 이상)
-                logo_mask = (gray_sign > 10).astype(np.float32)
+                logo_mask = gray_sign > 10
                 
                 # 로고 마스크를 distance transform으로 처리해서 후광 효과 생성 (글자 윤곽선 따라)
-                logo_mask_uint8 = (logo_mask * 255).astype(np.uint8)
-                # 로고 바깥쪽에서의 거리 계산
-                logo_mask_inv = 255 - logo_mask_uint8
-                dist_transform = cv2.distanceTransform(logo_mask_inv, cv2.DIST_L2, 5)
-                
-                # 로고 윤곽선 주변에 glow 적용
-                # 제일 밝은 부분(0-2px)은 줄이고, 그라디언트 범위(2-15px)는 넓히기
-                max_dist = 15.0
-                inner_dist = 2.0
-                
-                glow_mask = np.zeros_like(dist_transform, dtype=np.float32)
-                bright_mask = (dist_transform > 0) & (dist_transform <= inner_dist)
-                glow_mask[bright_mask] = 0.6 * (1.0 - (dist_transform[bright_mask] / inner_dist))
-                
-                gradient_mask = (dist_transform > inner_dist) & (dist_transform <= max_dist)
-                if gradient_mask.any():
-                    glow_mask[gradient_mask] = 0.6 * (1.0 - ((dist_transform[gradient_mask] - inner_dist) / (max_dist - inner_dist)))
-                
-                glow_mask[logo_mask > 0.5] = 0
-                
-                # 부드러운 blur 적용 (더 타이트하게)
-                glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)
-                glow_mask = safe_gaussian_blur(glow_mask, (19, 19), 8)
+                logo_mask_uint8 = compositing.as_mask(logo_mask)
+                # 로고 윤곽선 주변 후광 (0-2px는 밝기 제한, 2-15px는 점진적으로 옅어짐, 로고 내부 제외)
+                glow_mask = contour_glow(logo_mask_uint8, logo_mask)
                 
                 # 따뜻한 흰색 LED 색상 적용
-                glow_color_bgr = np.array([220, 245, 255], dtype=np.float32)
-                glow_mask_3d = glow_mask[:, :, np.newaxis]
-                backlight_glow = (glow_mask_3d * glow_color_bgr[np.newaxis, np.newaxis, :] * 3.5).clip(0, 255).astype(np.float32)
+                glow_color_bgr = (220, 245, 255)
+                backlight_glow = compositing.colorize(glow_mask, glow_color_bgr, 3.5)
                 
-                # 배경은 어둡게, 로고 뒤에서만 빛나는 효과 추가
-                base_night = night_base * (1 - combined_mask)
-                # 간판 배경은 어둡게
-                signboard_dark = warped_sign.astype(np.float32) * combined_mask * 0.25
+                # 배경은 어둡게, 간판 배경도 어둡게, 로고 뒤에서만 빛나는 효과 추가
+                night_with_logo_restore = compositing.add(darkened_sign_base(), backlight_glow)
                 
                 # 로고 영역에서 야간 효과를 절반 제거 (후광 때문에 로고가 더 밝게 보이도록)
-                logo_mask_3ch = np.stack([logo_mask, logo_mask, logo_mask], axis=2)
-                # 주간 결과 이미지에서 로고 부분 추출
-                day_logo = day_result.astype(np.float32) * logo_mask_3ch
-                # 로고 영역에서 야간 효과를 50% 제거 (주간 밝기로 50% 복원)
-                logo_restore_mask = logo_mask_3ch * 0.5  # 50%만 복원
-                night_with_logo_restore = base_night + signboard_dark + backlight_glow
-                # 로고 영역을 50% 주간 밝기로 복원
-                night_result = night_with_logo_restore * (1 - logo_restore_mask) + day_logo * logo_restore_mask
-                night_result = np.clip(night_result, 0, 255).astype(np.uint8)
+                # 주간 결과 이미지에서 로고 부분을 50% 밝기로 복원
+                logo_restore_mask = np.where(logo_mask, np.uint8(128), np.uint8(0))  # 50%만 복원
+                night_result = compositing.blend(night_with_logo_restore, day_result, logo_restore_mask, out=night_with_logo_restore)
         elif sign_type == "플렉스_LED":
             # LED 플렉스: 내부 LED 백라이트로 야간에도 밝게 유지
             # 복잡한 glow 없이 단순하게 원본 밝기 유지
-            night_result = night_base * (1 - combined_mask) + warped_sign.astype(np.float32) * combined_mask
-            night_result = np.clip(night_result, 0, 255).astype(np.uint8)
+            night_result = compositing.blend(night_base, warped_sign, combined_mask)
             
         elif sign_type in ["플렉스_기본", "플렉스"]:
             # 기본 플렉스: LED 없음 → 비조명 간판처럼 야간에 어두워짐
             glow_intensity = 0.3  # 스카시와 동일하게 어둡게
-            night_result = night_base * (1 - combined_mask) + warped_sign.astype(np.float32) * combined_mask * glow_intensity
-            night_result = np.clip(night_result, 0, 255).astype(np.uint8)
+            night_result = darkened_sign_base(glow_intensity)
         elif sign_type == "스카시" or sign_type.startswith("스카시_"):
             # 비조명: 야간에는 전체를 어둡게(배경과 동일 수준)
             glow_intensity = 0.3
-            night_result = night_base * (1 - combined_mask) + warped_sign.astype(np.float32) * combined_mask * glow_intensity
+            night_result = darkened_sign_base(glow_intensity)
         elif sign_type == "시트시공" or installation_type == "유리창시트시공":
             # 시트시공: 비조명 간판이므로 야간에 어두워짐
             glow_intensity = 0.3
-            night_result = night_base * (1 - combined_mask) + warped_sign.astype(np.float32) * combined_mask * glow_intensity
+            night_result = darkened_sign_base(glow_intensity)
         else:
             glow_intensity = 1.8
-            night_result = night_base * (1 - combined_mask) + warped_sign.astype(np.float32) * combined_mask * glow_intensity
+            night_result = darkened_sign_base(glow_intensity)
 
-    # 조명 합성 (간판 표면 집중)
+    # ROI 결과를 사진 크기 결과에 써넣기 (ROI 밖은 원본 사진 / 어두운 야간 배경 그대로)
+    full_day = full_building_photo.copy()
+    full_day[roi_y0:roi_y1, roi_x0:roi_x1] = day_result
+    full_night = full_night_base.copy() if full_night_base is night_src else full_night_base
+    full_night[roi_y0:roi_y1, roi_x0:roi_x1] = night_result
+    day_result, night_result = full_day, full_night
+    
+    # 조명 합성 (간판 표면 집중) - 조명별 ROI에만 벡터 연산으로 적용
     if lights_enabled and lights:
         print(f"[DEBUG] 조명 처리 시작: {len(lights)}개의 조명")
-        # 간판 영역 마스크: 투명도 고려하지 않고 폴리곤 마스크만 사용!
-        # combined_mask는 투명한 배경을 제외하므로, 조명 계산에는 전체 폴리곤 사용
-        signboard_mask_single = mask[:, :, 0]  # 폴리곤 영역 전체
-        
-        # 간판의 실제 위치 확인
-        signboard_ys, signboard_xs = np.where(signboard_mask_single > 0.5)
-        signboard_y_center = h // 2  # 기본값
-        if len(signboard_ys) > 0:
-            signboard_y_min = signboard_ys.min()
-            signboard_y_max = signboard_ys.max()
-            signboard_y_center = (signboard_y_min + signboard_y_max) // 2
-            print(f"[DEBUG] 간판 Y 위치: min={signboard_y_min}, max={signboard_y_max}, center={signboard_y_center}")
-        
-        for light in lights:
-            print(f"[DEBUG] 조명 처리 중: intensity={light.get('intensity')}, radius={light.get('radius')}")
-            
-            # 로그 파일에도 저장
-            with open("debug.log", "a", encoding="utf-8") as f:
-                f.write(f"\n=== 조명 처리 시작 ===\n")
-                f.write(f"조명 데이터: {light}\n")
-            
-            if not light.get("enabled", True):
-                continue
-            lx = float(light.get("x", 0.5))
-            ly = float(light.get("y", 0.5))
-            intensity = float(light.get("intensity", 1.0))
-            radius = float(light.get("radius", 150))
-            temperature = float(light.get("temperature", 0.5))  # 0=warm, 1=cool
-
-            cx = int(lx * w)
-            cy = int(ly * h)  # 사용자가 설정한 위치 그대로 사용
-            rad = int(radius)
-            
-            print(f"[DEBUG] 이미지 크기: h={h}, w={w}")
-            print(f"[DEBUG] 조명 위치: cx={cx}, cy={cy}, rad={rad}")
-            print(f"[DEBUG] signboard_mask_single 범위: min={signboard_mask_single.min():.3f}, max={signboard_mask_single.max():.3f}")
-            print(f"[DEBUG] signboard_mask_single에서 0이 아닌 픽셀 수: {np.sum(signboard_mask_single > 0.1)}")
-
-            # 조명 색온도
-            warm = np.array([255, 220, 200], dtype=np.float32)
-            cool = np.array([200, 210, 255], dtype=np.float32)
-            light_color = warm * (1 - temperature) + cool * temperature
-
-            # 조명 마스크 (타원형: 위에서 아래로 비추는 형태)
-            # 프론트엔드와 동일하게
-            mask_light = np.zeros((h, w), dtype=np.float32)
-            light_width = rad * 2.0  # 가로 반경
-            light_height = rad * 2.4  # 세로 반경
-            
-            # 파일에 로그 저장 (light_width 정의 후)
-            with open("debug.log", "a", encoding="utf-8") as f:
-                f.write(f"이미지 크기: h={h}, w={w}\n")
-                if len(signboard_ys) > 0:
-                    f.write(f"간판 Y 위치: min={signboard_y_min}, max={signboard_y_max}, center={signboard_y_center}\n")
-                f.write(f"조명 위치: cx={cx}, cy={cy}, rad={rad}\n")
-                f.write(f"조명 크기: width={light_width}, height={light_height}\n")
-                f.write(f"간판 픽셀 수: {np.sum(signboard_mask_single > 0.1)}\n")
-            
-            for i in range(h):
-                for j in range(w):
-                    # 조명에서의 거리
-                    dx = j - cx
-                    dy = i - cy
-                    
-                    # 타원형 거리 계산 (프론트엔드와 동일)
-                    dist = np.sqrt((dx / (light_width / 2))**2 + (dy / (light_height / 2))**2)
-                    
-                    if dist < 1.0:
-                        # 타원형 안에 있으면 균일하게 1.0 (프론트엔드와 동일)
-                        mask_light[i, j] = 1.0
-            
-            print(f"[DEBUG] mask_light 범위: min={mask_light.min():.3f}, max={mask_light.max():.3f}")
-            print(f"[DEBUG] mask_light에서 0이 아닌 픽셀 수: {np.sum(mask_light > 0.01)}")
-            
-            # ===== 구버전 (간판과의 교집합) =====
-            # light_on_signboard = mask_light * signboard_mask_single
-            
-            # ===== 신버전 (타원형의 아래쪽 절반만, 프론트엔드와 동일) =====
-            # 조명 중심(cy)부터 아래쪽만 적용
-            mask_lower = np.zeros((h, w), dtype=np.float32)
-            mask_lower[cy:, :] = 1.0  # cy부터 아래쪽만
-            light_on_signboard = mask_light * mask_lower  # 타원의 아래쪽 절반만
-            
-            # intensity 적용: 야간 효과를 얼마나 제거할지
-            # intensity = 0 → 야간 그대로 (제거 안함)
-            # intensity = 1 → 완전히 주간으로 복원
-            # intensity > 1 → 더 강하게 (최대 3까지)
-            restore_strength = np.clip(light_on_signboard * intensity, 0, 1)
-            restore_strength_3ch = np.stack([restore_strength, restore_strength, restore_strength], axis=2)
-            
-            # 야간 효과 제거: 조명이 비추는 간판 부분을 주간 이미지로 교체
-            print(f"[DEBUG] restore_strength 범위: min={restore_strength.min():.3f}, max={restore_strength.max():.3f}, mean={restore_strength.mean():.3f}")
-            print(f"[DEBUG] 조명이 적용되는 픽셀 수: {np.sum(restore_strength > 0.1)}")
-            
-            # 파일에도 저장
-            with open("debug.log", "a", encoding="utf-8") as f:
-                f.write(f"restore_strength 최대값: {restore_strength.max():.3f}\n")
-                f.write(f"조명 적용 픽셀 수: {np.sum(restore_strength > 0.1)}\n")
-                f.write(f"---\n")
-            
-            night_result = night_result.astype(np.float32) * (1 - restore_strength_3ch) + day_result.astype(np.float32) * restore_strength_3ch
-            
-            # 조명 색온도 약하게 추가 (분위기)
-            light_tint = light_color * restore_strength_3ch * 0.08
-            night_result = night_result + light_tint
-            
-            print(f"[DEBUG] 조명 처리 완료")
-            
-            night_result = np.clip(night_result, 0, 255)
+        night_result = apply_lights(night_result, day_result, lights, timings=timings)
+        if timings is not None:
+            print(f"[DEBUG] 조명 처리 완료: {timings.get('lights_total_ms')}ms, 조명별={[t['ms'] for t in timings.get('lights', [])]}")
     
-    night_result = np.clip(night_result, 0, 255).astype(np.uint8)
+    if night_result.dtype != np.uint8:
+        night_result = np.clip(night_result, 0, 255).astype(np.uint8)
 
     # 전면프레임-전후광채널 디버그: 실제 들어온 값 확인 및 이미지 저장 (예외 처리 포함)
     try:
@@ -3307,7 +2896,6 @@ def composite_signboard(
         if installation_type == "전면프레임" and sign_type == "전후광채널":
             debug_dir = os.path.join(os.path.dirname(__file__), "debug_images")
             os.makedirs(debug_dir, exist_ok=True)
-            import time
             timestamp = int(time.time() * 1000)
             day_path = os.path.join(debug_dir, f"composite_day_{timestamp}.png")
             night_path = os.path.join(debug_dir, f"composite_night_{timestamp}.png")
@@ -3338,9 +2926,316 @@ def log_error(message, error=None):
     except Exception as e:
         print(f"[로그 기록 실패] {e}")
 
+def init_render_worker():
+    """렌더 풀 워커 초기화 (워커마다 1회) - 기본 폰트 로딩
+
+    pix2pix는 렌더 풀이 아닌 HQ 작업 큐에서 쓰므로 여기서 로드하지 않음 (startup 워밍업에서 백그라운드 로드)
+    """
+    for weight in ("400", "700"):
+        get_korean_font(100, "malgun", weight)
+
+# 렌더링 워커 풀 (RENDER_POOL_KIND / RENDER_WORKERS / RENDER_QUEUE_SIZE / RENDER_JOB_TIMEOUT)
+render_pool = RenderPool(initializer=init_render_worker)
+
+@app.on_event("startup")
+async def start_render_pool():
+    render_pool.start()
+
+@app.on_event("shutdown")
+async def stop_render_pool():
+    render_pool.shutdown()
+
+# 워밍업 (WARMUP=0이면 폰트/렌더링/pix2pix는 첫 요청에서 초기화)
+WARMUP = os.getenv("WARMUP", "1") != "0"
+# 워밍업 렌더링: 간판 종류마다 1회 (작은 크기)
+WARMUP_SIGN_TYPES = ("전광채널", "후광채널", "전후광채널", "스카시", "플렉스", "어닝간판", "시트시공")
+
+readiness.register("fonts")
+readiness.register("render")
+readiness.register("pix2pix", required=False)
+readiness.register("ai_branding", required=False)
+_warmup_task = None
+
+def warm_render() -> dict:
+    """간판 종류마다 작은 간판을 1회 렌더링 (폰트 래스터, glow 커널 등 첫 호출 비용을 미리 지불)"""
+    timings = {}
+    for sign_type in WARMUP_SIGN_TYPES:
+        t0 = time.perf_counter()
+        render_signboard("간판", "", "channel", "맨벽", sign_type, "#FFFFFF", "#000000", width=600, height=150)
+        timings[sign_type] = round((time.perf_counter() - t0) * 1000, 1)
+    return timings
+
+def warm_pix2pix():
+    """pix2pix 모델 로드 + 더미 이미지로 forward 1회 (결과 캐시는 거치지 않음)"""
+    engine = get_pix2pix_engine()
+    if engine is None:
+        raise RuntimeError("Pix2pix 모델 로드 실패 (로그 확인)")
+    if pix2pix_cache is not None:
+        engine = pix2pix_cache.engine
+    engine.enhance(np.zeros((128, 512, 3), dtype=np.uint8))
+
+async def _warm_step(name: str, fn, in_render_pool: bool = False):
+    """워밍업 단계 하나를 실행하고 상태/소요 시간 기록 (실패해도 다른 단계는 계속)"""
+    readiness.start(name)
+    try:
+        if in_render_pool:
+            detail = await render_pool.run(fn)
+        else:
+            detail = await asyncio.get_running_loop().run_in_executor(None, fn)
+    except Exception as e:
+        readiness.finish(name, error=str(e))
+        return
+    readiness.finish(name, detail=detail if isinstance(detail, dict) else None)
+
+async def warm_up():
+    """서브시스템 워밍업 - 폰트 → 간판 렌더링, AI 브랜딩과 pix2pix는 각각 동시에 (백그라운드)"""
+    async def core():
+        if WARMUP:
+            # 폰트/렌더링은 렌더 풀 워커에서 (워커 초기화도 함께)
+            await _warm_step("fonts", init_render_worker, in_render_pool=True)
+            await _warm_step("render", warm_render, in_render_pool=True)
+
+    async def ai_branding():
+        # 폰트/렌더링과 무관하므로 기다리지 않고 바로 초기화 (WARMUP=0이어도 시작할 때 초기화)
+        if AI_BRANDING_AVAILABLE:
+            await _warm_step("ai_branding", init_branding_system)
+
+    async def pix2pix():
+        if WARMUP and PIX2PIX_AVAILABLE:
+            await _warm_step("pix2pix", warm_pix2pix)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(core(), ai_branding(), pix2pix())
+    logger.info(f"[워밍업] 전체 완료: {(time.perf_counter() - t0) * 1000:.0f}ms")
+
+@app.on_event("startup")
+async def start_warmup():
+    """워밍업을 백그라운드로 시작 (요청은 바로 받고, 준비 상태는 /api/ready로 확인)"""
+    global _warmup_task
+    logger.info(f"[시작] main 모듈 로드: {(time.perf_counter() - _MODULE_LOAD_STARTED) * 1000:.0f}ms")
+    if not WARMUP:
+        for name in ("fonts", "render", "pix2pix"):
+            readiness.disable(name, "WARMUP=0 (첫 요청에서 초기화)")
+    if not PIX2PIX_AVAILABLE and readiness.status("pix2pix") != DISABLED:
+        readiness.disable("pix2pix", "torch/onnxruntime 없음")
+    if not AI_BRANDING_AVAILABLE:
+        readiness.disable("ai_branding", "openai 모듈 없음")
+    _warmup_task = asyncio.create_task(warm_up())
+
+@app.get("/api/ready")
+async def ready():
+    """준비 상태 - 필수 서브시스템(fonts, render)이 준비되면 200, 아니면 503 (서브시스템별 상태/소요 시간 포함)"""
+    report = readiness.report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+async def run_render_job(job, **params):
+    """렌더링 작업을 워커 풀에서 실행 - 대기열 초과는 503, 타임아웃은 504"""
+    try:
+        return await render_pool.run(job, **params)
+    except RenderQueueFull as e:
+        logger.warning(f"[렌더 풀] 작업 거절: {e}")
+        return JSONResponse(
+            status_code=503,
+            content={"error": "렌더링 요청이 많습니다. 잠시 후 다시 시도해주세요."},
+            headers={"Retry-After": "5"},
+        )
+    except RenderJobTimeout as e:
+        log_error(f"[렌더 풀] {job.__name__} 타임아웃", e)
+        return JSONResponse(status_code=504, content={"error": str(e)})
+
+def response_content(result) -> tuple:
+    """작업 함수 반환값(dict 또는 JSONResponse)을 (상태 코드, 본문 dict)로"""
+    if isinstance(result, JSONResponse):
+        return result.status_code, json.loads(result.body)
+    return 200, result
+
+def _queued_job_result(job, params: dict) -> tuple:
+    """작업 큐 워커에서 작업 함수 실행 (작업 큐는 (상태 코드, 본문)을 받음)"""
+    return response_content(job(**params))
+
+async def queue_hq_job(job, **params):
+    """작업을 HQ 작업 큐에 넣고 작업 ID를 바로 반환 (202) - 대기열 초과는 503"""
+    try:
+        queued = hq_jobs.submit(_queued_job_result, job=job, params=params)
+    except JobQueueFull as e:
+        logger.warning(f"[작업 큐] 작업 거절: {e}")
+        return JSONResponse(
+            status_code=503,
+            content={"error": "AI 고품질 작업이 많습니다. 잠시 후 다시 시도해주세요."},
+            headers={"Retry-After": "10"},
+        )
+    return JSONResponse(
+        status_code=202,
+        content={
+            **queued.describe(hq_jobs.queue_position(queued)),
+            "status_url": f"/api/jobs/{queued.id}",
+            "result_url": f"/api/jobs/{queued.id}/result",
+        },
+    )
+
+# 이미지 파라미터 - base64 문자열 Form 필드 대신 multipart 파일 파트 `<이름>_file`로도 받을 수 있음
+UPLOAD_IMAGE_FIELDS = ("building_photo", "logo", "signboard_image")
+
+# 요청 파라미터로 받지 않고 엔드포인트가 채워서 작업 함수에 넘기는 인자
+JOB_INTERNAL_PARAMS = ("building_photo", "night_base", "preview_source", "photo_key", "output_encoding")
+
+def resolve_output_encoding(output_format: str, request: Request):
+    """output_format 필드 / Accept 헤더로 응답 이미지 포맷 결정 (잘못된 값이면 400 응답 반환)
+
+    Returns: (OutputEncoding 또는 None, 오류 JSONResponse 또는 None)
+    """
+    try:
+        return negotiate_encoding(output_format, request.headers.get("accept")), None
+    except ValueError as e:
+        return None, JSONResponse(status_code=400, content={"error": str(e)})
+
+def apply_photo_session(job, params: dict, session):
+    """사진 세션의 디코딩된 사진과 미리 계산된 값을 작업 인자로 설정"""
+    params["building_photo"] = session.photo
+    job_params = inspect.signature(job).parameters
+    if "photo_key" in job_params:
+        params["photo_key"] = session.photo_hash
+    if params.get("quality") == "preview" and "preview_source" in job_params:
+        # 미리보기는 원본 대신 피라미드 레벨에서 축소 (야간 배경은 축소 사진으로 다시 계산)
+        params["preview_source"] = session.preview_source(params.get("preview_width") or PREVIEW_WIDTH)
+    elif "night_base" in job_params:
+        params["night_base"] = session.night_base
+
+async def prepare_render_params(job, params: dict):
+    """엔드포인트 인자를 작업 인자로 변환 (params를 직접 수정)
+
+    UploadFile은 워커로 넘길 수 없으므로(process 모드는 pickle 불가) 여기서 bytes로 읽고,
+    작업 함수는 base64 문자열과 bytes를 모두 base64_to_image로 디코딩한다.
+    응답 이미지 포맷은 output_format 필드와 Accept 헤더로 정해 output_encoding으로 넘긴다.
+
+    Returns: 오류 JSONResponse (출력 포맷 400, 세션 만료 410, 건물 사진 없음 400) 또는 None
+    """
+    output_encoding, error = resolve_output_encoding(params.pop("output_format", None), params.pop("request"))
+    if error is not None:
+        return error
+    params["output_encoding"] = output_encoding
+
+    for name in UPLOAD_IMAGE_FIELDS:
+        upload = params.pop(f"{name}_file", None)
+        if upload is not None:
+            params[name] = await upload.read()
+            await upload.close()
+
+    # 사진 세션: 디코딩된 사진과 미리 계산된 야간 배경을 그대로 사용
+    session_id = params.pop("photo_session", None)
+    if session_id:
+        session = photo_sessions.get(session_id)
+        if session is None:
+            return JSONResponse(
+                status_code=410,
+                content={"error": "사진 세션이 만료되었습니다. 건물 사진을 다시 업로드해주세요.", "session_expired": True},
+            )
+        apply_photo_session(job, params, session)
+
+    if params.get("building_photo") is None or len(params["building_photo"]) == 0:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "building_photo (base64 필드, building_photo_file 파트 또는 photo_session)가 필요합니다."},
+        )
+    return None
+
+async def run_image_render_job(job, params: dict):
+    """엔드포인트 인자를 작업 인자로 변환한 뒤 렌더링 작업 실행"""
+    error = await prepare_render_params(job, params)
+    if error is not None:
+        return error
+    return await run_render_job(job, **params)
+
+def add_raw_photo_route(path: str, job, runner=None):
+    """건물 사진을 요청 본문(image/jpeg 등)으로, 나머지 파라미터는 query string으로 받는 라우트 추가
+
+    본문 bytes를 그대로 cv2.imdecode에 넘기므로 base64 인코딩/multipart 파싱이 필요 없다.
+    파라미터 이름과 기본값은 작업 함수 시그니처를 따른다.
+    runner: 작업 실행 함수 (기본 run_render_job, HQ는 queue_hq_job)
+    """
+    runner = runner or run_render_job
+    job_params = inspect.signature(job).parameters
+
+    async def endpoint(request: Request):
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        if not (content_type.startswith("image/") or content_type == "application/octet-stream"):
+            return JSONResponse(
+                status_code=415,
+                content={"error": f"본문은 이미지여야 합니다 (Content-Type: {content_type or '없음'})"},
+            )
+
+        params = {}
+        for name, value in request.query_params.items():
+            spec = job_params.get(name)
+            if spec is None or name in JOB_INTERNAL_PARAMS:
+                continue
+            try:
+                params[name] = spec.annotation(value) if spec.annotation in (int, float) else value
+            except ValueError:
+                return JSONResponse(status_code=422, content={"error": f"{name} 값이 올바르지 않습니다: {value}"})
+
+        missing = [
+            name for name, spec in job_params.items()
+            if spec.default is inspect.Parameter.empty and name not in JOB_INTERNAL_PARAMS and name not in params
+        ]
+        if missing:
+            return JSONResponse(status_code=422, content={"error": f"필수 파라미터 누락: {', '.join(missing)}"})
+
+        params["output_encoding"], error = resolve_output_encoding(request.query_params.get("output_format"), request)
+        if error is not None:
+            return error
+
+        params["building_photo"] = await request.body()
+        if not params["building_photo"]:
+            return JSONResponse(status_code=400, content={"error": "요청 본문에 건물 사진이 없습니다."})
+        return await runner(job, **params)
+
+    endpoint.__name__ = f"{job.__name__.strip('_')}_raw"
+    app.add_api_route(path, endpoint, methods=["POST"])
+
+def _create_photo_session_job(*, building_photo):
+    """건물 사진 디코딩 + 세션 값 계산 (렌더 풀 워커에서 실행, 디코딩 실패 시 None)"""
+    photo = base64_to_image(building_photo)
+    if photo is None:
+        return None
+    return build_photo_session(photo)
+
+@app.post("/api/photo-session")
+async def create_photo_session(
+    building_photo: str = Form(None),
+    building_photo_file: UploadFile = File(None),
+):
+    """
+    건물 사진 세션 생성: 사진을 한 번 업로드하고 이후 렌더링 요청에는 photo_session ID만 전달
+    """
+    if building_photo_file is not None:
+        building_photo = await building_photo_file.read()
+        await building_photo_file.close()
+    if not building_photo:
+        return JSONResponse(status_code=400, content={"error": "building_photo 또는 building_photo_file이 필요합니다."})
+
+    session = await run_render_job(_create_photo_session_job, building_photo=building_photo)
+    if isinstance(session, JSONResponse):
+        return session
+    if session is None:
+        return JSONResponse(status_code=400, content={"error": "건물 사진을 디코딩할 수 없습니다."})
+    try:
+        session = photo_sessions.add(session)
+    except ValueError as e:
+        return JSONResponse(status_code=413, content={"error": str(e)})
+    return session.describe()
+
+@app.delete("/api/photo-session/{session_id}")
+async def delete_photo_session(session_id: str):
+    """건물 사진 세션 삭제"""
+    if not photo_sessions.delete(session_id):
+        return JSONResponse(status_code=404, content={"error": "사진 세션이 없습니다."})
+    return {"deleted": session_id}
+
 @app.post("/api/generate-simulation")
 async def generate_simulation(
-    building_photo: str = Form(...),
+    request: Request,
+    building_photo: str = Form(None),
     polygon_points: str = Form(...),
     signboard_input_type: str = Form("text"),
     text: str = Form(""),
@@ -3366,8 +3261,58 @@ async def generate_simulation(
     lights: str = Form("[]"),
     lights_enabled: str = Form("true"),
     # 복수 간판용: 프론트에서 JSON 문자열로 전달
-    signboards: str = Form(None)
+    signboards: str = Form(None),
+    quality: str = Form("full"),  # "preview"면 축소 사진으로 빠르게 렌더링 (슬라이더 조정용)
+    preview_width: int = Form(PREVIEW_WIDTH),  # 미리보기 출력 너비 (px)
+    outputs: str = Form(DEFAULT_OUTPUTS),  # 만들 결과물 (day, night, sign 중 쉼표 구분)
+    photo_session: str = Form(None),  # building_photo 대신 사진 세션 ID (/api/photo-session)
+    output_format: str = Form(None),  # 응답 이미지 포맷 (png, jpeg:80, webp 등, 없으면 Accept 헤더)
+    # base64 필드 대신 보낼 수 있는 multipart 파일 파트
+    building_photo_file: UploadFile = File(None),
+    logo_file: UploadFile = File(None),
+    signboard_image_file: UploadFile = File(None),
 ):
+    # 렌더링은 렌더 풀 워커에서 실행 (이벤트 루프를 막지 않도록)
+    return await run_image_render_job(_generate_simulation_job, locals())
+
+def _generate_simulation_job(
+    *,
+    building_photo: str,
+    polygon_points: str,
+    signboard_input_type: str = "text",
+    text: str = "",
+    logo: str = "",
+    logo_type: str = "channel",
+    signboard_image: str = "",
+    installation_type: str = "맨벽",
+    sign_type: str,
+    bg_color: str,
+    text_color: str,
+    text_direction: str = "horizontal",
+    font_size: int = 100,
+    font_family: str = "malgun",
+    font_weight: str = "400",
+    text_position_x: int = 50,
+    text_position_y: int = 50,
+    orientation: str = "auto",
+    flip_horizontal: str = "false",
+    flip_vertical: str = "false",
+    rotate90: int = 0,
+    rotation: float = 0.0,  # 회전 각도 (도 단위, -180 ~ 180)
+    remove_white_bg: str = "false",  # 흰색 배경 투명 처리
+    lights: str = "[]",
+    lights_enabled: str = "true",
+    # 복수 간판용: 프론트에서 JSON 문자열로 전달
+    signboards: str = None,
+    quality: str = "full",
+    preview_width: int = PREVIEW_WIDTH,
+    outputs: str = DEFAULT_OUTPUTS,
+    night_base: np.ndarray = None,  # 사진 세션의 미리 계산된 야간 배경
+    preview_source: np.ndarray = None,  # 사진 세션의 미리보기용 피라미드 레벨
+    photo_key: str = None,  # 사진 세션의 사진 해시 (단계 캐시 키)
+    output_encoding: OutputEncoding = None
+):
+    """간판 시뮬레이션 렌더링 (렌더 풀 워커에서 실행)"""
     # 최상단에 로그 출력 (함수 진입 시 즉시)
     sys.stdout.write(f"[API 진입] generate_simulation 호출: installation_type={installation_type}, sign_type={sign_type}, bg_color={bg_color}, text_color={text_color}\n")
     sys.stdout.flush()
@@ -3378,11 +3323,45 @@ async def generate_simulation(
         # 진입 로그 (복수 간판 디버깅용)
         log_error(f"[ENTRY] signboards raw: {str(signboards)[:200]}")
 
-        # Base64 이미지 디코딩
-        building_img = base64_to_image(building_photo)
+        # 요청한 결과물만 만든다 (야간이 없으면 야간 배경/후광/조명 단계 생략)
+        try:
+            wanted = parse_outputs(outputs)
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+        render_night = "night" in wanted
+
+        # 단계별 실행 기록 (각 단계 결과는 입력 해시로 캐시되어, 바뀐 파라미터의 하위 단계만 다시 계산)
+        pipeline = PipelineRun()
+
+        # [decode] 건물 사진 디코딩
+        # 미리보기 모드면 축소 사진에서 렌더링 (폴리곤/조명/후광도 같은 배율로)
+        def decode_stage():
+            img = decode_building_photo(building_photo)
+            if quality == "preview":
+                return downscale_for_preview(img, preview_width, preview_source)
+            return img, 1.0
+
+        photo_inputs = (photo_key or building_photo, quality, preview_width if quality == "preview" else None)
+        if isinstance(building_photo, np.ndarray) and quality != "preview":
+            # 사진 세션: 이미 디코딩된 사진
+            decode_key, (building_img, preview_scale) = pipeline.given(
+                "decode", stage_key("decode", *photo_inputs), (building_photo, 1.0))
+        else:
+            decode_key, (building_img, preview_scale) = pipeline.run("decode", photo_inputs, decode_stage)
+        if preview_scale < 1.0:
+            set_glow_scale(preview_scale)
+
+        # [night_base] 야간 배경 (사진 세션에서 미리 계산된 것이 있으면 그대로)
+        if not render_night:
+            night_key, night_base = None, None
+        elif night_base is not None and preview_scale == 1.0:
+            night_key, night_base = pipeline.given("night_base", stage_key("night_base", decode_key), night_base)
+        else:
+            night_key, night_base = pipeline.run(
+                "night_base", (decode_key,), lambda: compositing.scale(building_img, NIGHT_DARKEN))
 
         # 조명 정보 파싱
-        lights_list = json.loads(lights) if lights else []
+        lights_list = scale_lights(json.loads(lights) if lights else [], preview_scale)
         lights_on = lights_enabled.lower() != "false"
         
         print(f"[DEBUG] lights_enabled 값: {lights_enabled}")
@@ -3402,6 +3381,8 @@ async def generate_simulation(
 
             current_day = building_img.copy()
             current_night = None
+            composited = 0  # 합성에 성공한 간판 수
+            multi_timings = []
 
             # 여러 간판을 순차적으로 합성 (앞에서부터 쌓아가기)
             for idx, sb in enumerate(signboards_data):
@@ -3439,7 +3420,7 @@ async def generate_simulation(
                     # 이하 로직은 기존 단일 간판 처리와 동일하게, sb_* 값을 사용
 
                     # 폴리곤 점 파싱
-                    points = sb_points
+                    points = scale_points(sb_points, preview_scale)
 
                     # 4점인 경우: 실제 변 길이 계산 (정확한 방향 파악)
                     if len(points) == 4:
@@ -3529,24 +3510,19 @@ async def generate_simulation(
                         actual_text_width = None
                         actual_text_height = None
                     else:
+                        sb_text_metrics = {}
                         signboard_img, text_layer = render_signboard(
                             sb_text, sb_logo, sb_logo_type, sb_installation_type, sb_sign_type,
                             sb_bg_color, sb_text_color, final_direction, final_font_size,
                             sb_text_position_x, sb_text_position_y, region_width, region_height,
                             building_photo=building_img, polygon_points=points,
-                            font_family=sb_font_family, font_weight=sb_font_weight
+                            font_family=sb_font_family, font_weight=sb_font_weight,
+                            text_metrics=sb_text_metrics
                         )
 
-                        from PIL import Image, ImageDraw, ImageFont
-                        font = get_korean_font(final_font_size)
-                        draw_temp = ImageDraw.Draw(Image.new('RGB', (region_width, region_height)))
-                        if final_direction == "vertical":
-                            text_vertical = '\n'.join(list(sb_text))
-                            bbox = draw_temp.multiline_textbbox((0, 0), text_vertical, font=font)
-                        else:
-                            bbox = draw_temp.textbbox((0, 0), sb_text, font=font)
-                        actual_text_width = bbox[2] - bbox[0]
-                        actual_text_height = bbox[3] - bbox[1]
+                        # 렌더링 시 자동 맞춤된 실제 텍스트 크기 (빈 텍스트면 None)
+                        actual_text_width = sb_text_metrics.get("text_width")
+                        actual_text_height = sb_text_metrics.get("text_height")
 
                     rotation_value = 0.0
                     try:
@@ -3580,9 +3556,15 @@ async def generate_simulation(
                     # - 주간: 항상 current_day 기준으로 추가 합성
                     # - 야간: 처음 한 번만 배경을 어둡게 하고, 이후에는 이미 어두운 current_night 위에만 간판 추가
                     base_day = current_day
-                    base_night = current_night if current_night is not None else building_img
-                    pre_dark = current_night is not None
+                    if current_night is not None:
+                        base_night, pre_dark = current_night, True
+                    elif night_base is not None:
+                        base_night, pre_dark = night_base, True
+                    else:
+                        base_night, pre_dark = building_img, False
 
+                    sb_timings = {"index": idx}
+                    t_composite = time.perf_counter()
                     day_sim, night_sim = composite_signboard(
                         base_day,
                         signboard_img,
@@ -3594,15 +3576,20 @@ async def generate_simulation(
                         building_photo_night=base_night,
                         pre_darkened=pre_dark,
                         installation_type=sb_installation_type,
+                        timings=sb_timings,
+                        render_night=render_night,
                     )
+                    sb_timings["composite_ms"] = round((time.perf_counter() - t_composite) * 1000, 2)
+                    multi_timings.append(sb_timings)
                     current_day = day_sim
                     current_night = night_sim
+                    composited += 1
 
                 except Exception as e:
                     log_error(f"[ERROR] 복수 간판 처리 중 오류 (index={idx})", e)
                     continue
 
-            if current_night is None:
+            if composited == 0:
                 # 간판이 하나도 제대로 처리되지 않은 경우
                 day_sim = building_img
                 night_sim = building_img
@@ -3610,12 +3597,21 @@ async def generate_simulation(
                 day_sim = current_day
                 night_sim = current_night
 
-            day_base64 = image_to_base64(day_sim)
-            night_base64 = image_to_base64(night_sim)
+            # 요청한 주간/야간 동시 인코딩 (복수 간판은 sign 결과물 없음)
+            results = {"day": day_sim, "night": night_sim}
+            images, encoding_info = encode_images(
+                {OUTPUT_KEYS[name]: image for name, image in results.items() if name in wanted},
+                output_encoding or negotiate_encoding(),
+            )
 
             response_data = {
-                "day_simulation": day_base64,
-                "night_simulation": night_base64
+                **images,
+                "timings": {"signboards": multi_timings},
+                "encoding": encoding_info,
+                "quality": quality,
+                "preview_scale": preview_scale,
+                "outputs": [name for name in OUTPUT_KEYS if name in wanted],
+                "pipeline": pipeline.report(),
             }
 
             return JSONResponse(content=response_data)
@@ -3637,215 +3633,261 @@ async def generate_simulation(
         print(f"[DEBUG] API 요청 받음 - rotation (원본): {rotation}, rotation (변환): {rotation_value}, rotate90: {rotate90}, type: {type(rotation)}")
         log_error(f"API 요청 받음 - rotation: {rotation}, rotation_value: {rotation_value}, rotate90: {rotate90}")
 
-        # 폴리곤 점 파싱
-        points = json.loads(polygon_points)
+        # [geometry] 폴리곤 정렬, 간판 영역 크기, 글자 방향/크기
+        def compute_geometry(scale):
+            # 폴리곤 점 파싱 (미리보기면 축소 사진 좌표로)
+            points = scale_points(json.loads(polygon_points), scale)
         
-        # 4점인 경우: 실제 변 길이 계산 (정확한 방향 파악)
-        if len(points) == 4:
-            # 점들을 정렬 (좌상, 우상, 우하, 좌하)
-            ordered = order_points(points)
+            # 4점인 경우: 실제 변 길이 계산 (정확한 방향 파악)
+            if len(points) == 4:
+                # 점들을 정렬 (좌상, 우상, 우하, 좌하)
+                ordered = order_points(points)
             
-            # 상단 변 길이 (좌상 -> 우상)
-            top_width = np.sqrt((ordered[1][0] - ordered[0][0])**2 + (ordered[1][1] - ordered[0][1])**2)
-            # 좌측 변 길이 (좌상 -> 좌하)
-            left_height = np.sqrt((ordered[3][0] - ordered[0][0])**2 + (ordered[3][1] - ordered[0][1])**2)
+                # 상단 변 길이 (좌상 -> 우상)
+                top_width = np.sqrt((ordered[1][0] - ordered[0][0])**2 + (ordered[1][1] - ordered[0][1])**2)
+                # 좌측 변 길이 (좌상 -> 좌하)
+                left_height = np.sqrt((ordered[3][0] - ordered[0][0])**2 + (ordered[3][1] - ordered[0][1])**2)
             
-            region_width = int(top_width)
-            region_height = int(left_height)
-        else:
-            # n점인 경우: 바운딩 박스 사용
-            xs = [p[0] for p in points]
-            ys = [p[1] for p in points]
-            region_width = int(max(xs) - min(xs))
-            region_height = int(max(ys) - min(ys))
-        
-        # 최소 크기 보장
-        region_width = max(300, region_width)
-        region_height = max(100, region_height)
-        
-        # 간판 방향 처리
-        if orientation == "vertical":
-            # 세로 강제: width와 height를 swap
-            region_width, region_height = region_height, region_width
-        elif orientation == "horizontal":
-            # 가로 강제: 그대로 유지
-            pass
-        # orientation == "auto": 계산된 값 그대로 사용
-        
-        # 영역 형태 분석 (가로/세로/비스듬함)
-        auto_direction = analyze_polygon_shape(points)
-        final_direction = auto_direction if text_direction == "auto" else text_direction
-        
-        # ===== 글자 자동 크기 계산 (영역을 최대한 가득 채우기) =====
-        # 설치 방식에 따라 기본으로 채우는 정도만 다르게 설정
-        # - 유리창시트시공: 거의 가득 (0.9)
-        # - 프레임바: 막대 안에 여유를 조금 두고 (0.7)
-        # - 그 외 대부분: 꽉 차게 (0.85)
-        if installation_type == "유리창시트시공":
-            base_ratio = 0.9
-        elif installation_type == "프레임바":
-            base_ratio = 0.7
-        else:
-            base_ratio = 0.85
+                region_width = int(top_width)
+                region_height = int(left_height)
+            else:
+                # n점인 경우: 바운딩 박스 사용
+                xs = [p[0] for p in points]
+                ys = [p[1] for p in points]
+                region_width = int(max(xs) - min(xs))
+                region_height = int(max(ys) - min(ys))
+        
+            # 최소 크기 보장
+            region_width = max(300, region_width)
+            region_height = max(100, region_height)
+        
+            # 간판 방향 처리
+            if orientation == "vertical":
+                # 세로 강제: width와 height를 swap
+                region_width, region_height = region_height, region_width
+            elif orientation == "horizontal":
+                # 가로 강제: 그대로 유지
+                pass
+            # orientation == "auto": 계산된 값 그대로 사용
+        
+            # 영역 형태 분석 (가로/세로/비스듬함)
+            auto_direction = analyze_polygon_shape(points)
+            final_direction = auto_direction if text_direction == "auto" else text_direction
+        
+            # ===== 글자 자동 크기 계산 (영역을 최대한 가득 채우기) =====
+            # 설치 방식에 따라 기본으로 채우는 정도만 다르게 설정
+            # - 유리창시트시공: 거의 가득 (0.9)
+            # - 프레임바: 막대 안에 여유를 조금 두고 (0.7)
+            # - 그 외 대부분: 꽉 차게 (0.85)
+            if installation_type == "유리창시트시공":
+                base_ratio = 0.9
+            elif installation_type == "프레임바":
+                base_ratio = 0.7
+            else:
+                base_ratio = 0.85
+
+            auto_font_size = int(region_height * base_ratio)
+            # 최소/최대 가드
+            auto_font_size = max(20, min(auto_font_size, int(region_height * 0.98)))
+        
+            # ===== 슬라이더 font_size를 "배율(%)"로 해석 =====
+            # 100 → 기본, 50 → 0.5배, 200 → 2배
+            if font_size != 100:
+                scale_factor = font_size / 100.0
+                scale_factor = max(0.3, min(3.0, scale_factor))  # 30%~300% 범위 제한
+                final_font_size = int(auto_font_size * scale_factor)
+            else:
+                final_font_size = auto_font_size
+            return points, region_width, region_height, final_direction, final_font_size
 
-        auto_font_size = int(region_height * base_ratio)
-        # 최소/최대 가드
-        auto_font_size = max(20, min(auto_font_size, int(region_height * 0.98)))
-        
-        # ===== 슬라이더 font_size를 "배율(%)"로 해석 =====
-        # 100 → 기본, 50 → 0.5배, 200 → 2배
-        if font_size != 100:
-            scale_factor = font_size / 100.0
-            scale_factor = max(0.3, min(3.0, scale_factor))  # 30%~300% 범위 제한
-            final_font_size = int(auto_font_size * scale_factor)
-        else:
-            final_font_size = auto_font_size
+        geometry_key, (points, region_width, region_height, final_direction, final_font_size) = pipeline.run(
+            "geometry",
+            (polygon_points, preview_scale, orientation, text_direction, installation_type, font_size),
+            lambda: compute_geometry(preview_scale),
+        )
         
-        # 간판 렌더링 (텍스트 or 이미지)
-        if signboard_input_type == "image" and signboard_image:
-            # 이미지 업로드 방식
-            uploaded_img = base64_to_image(signboard_image)
+        # [sign] 간판 렌더링 (텍스트 or 이미지) + 회전
+        def sign_stage():
+            actual_text_width = actual_text_height = None
+            # 간판 렌더링 (텍스트 or 이미지)
+            if signboard_input_type == "image" and signboard_image:
+                # 이미지 업로드 방식
+                uploaded_img = base64_to_image(signboard_image)
             
-            # 사용자 지정 변환 적용 (우선순위: 회전 → 좌우반전 → 상하반전)
+                # 사용자 지정 변환 적용 (우선순위: 회전 → 좌우반전 → 상하반전)
             
-            # 1. 회전 (90도 단위)
-            if rotate90 == 90:
-                uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_CLOCKWISE)
-            elif rotate90 == 180:
-                uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_180)
-            elif rotate90 == 270:
-                uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_COUNTERCLOCKWISE)
+                # 1. 회전 (90도 단위)
+                if rotate90 == 90:
+                    uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_CLOCKWISE)
+                elif rotate90 == 180:
+                    uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_180)
+                elif rotate90 == 270:
+                    uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_COUNTERCLOCKWISE)
             
-            # 2. 좌우반전
-            if flip_horizontal.lower() == "true":
-                uploaded_img = cv2.flip(uploaded_img, 1)  # 1 = 좌우반전
+                # 2. 좌우반전
+                if flip_horizontal.lower() == "true":
+                    uploaded_img = cv2.flip(uploaded_img, 1)  # 1 = 좌우반전
             
-            # 3. 상하반전
-            if flip_vertical.lower() == "true":
-                uploaded_img = cv2.flip(uploaded_img, 0)  # 0 = 상하반전
+                # 3. 상하반전
+                if flip_vertical.lower() == "true":
+                    uploaded_img = cv2.flip(uploaded_img, 0)  # 0 = 상하반전
             
-            # orientation이 지정되어 있고, 사용자가 직접 변환하지 않은 경우에만 자동 회전
-            if rotate90 == 0 and flip_horizontal.lower() == "false" and flip_vertical.lower() == "false":
-                h_img, w_img = uploaded_img.shape[:2]
-                img_ratio = w_img / h_img
-                region_ratio = region_width / region_height
+                # orientation이 지정되어 있고, 사용자가 직접 변환하지 않은 경우에만 자동 회전
+                if rotate90 == 0 and flip_horizontal.lower() == "false" and flip_vertical.lower() == "false":
+                    h_img, w_img = uploaded_img.shape[:2]
+                    img_ratio = w_img / h_img
+                    region_ratio = region_width / region_height
                 
-                # orientation 처리
-                if orientation == "auto":
-                    # 자동: 비율이 비슷하면 그대로, 많이 다르면 회전
-                    if (img_ratio > 1 and region_ratio < 1) or (img_ratio < 1 and region_ratio > 1):
-                        uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-                elif orientation == "vertical":
-                    # 세로 강제: 이미지가 가로로 길면 반시계방향 회전
-                    if img_ratio > 1:
-                        uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-                elif orientation == "horizontal":
-                    # 가로 강제: 이미지가 세로로 길면 시계방향 회전
-                    if img_ratio < 1:
-                        uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_CLOCKWISE)
+                    # orientation 처리
+                    if orientation == "auto":
+                        # 자동: 비율이 비슷하면 그대로, 많이 다르면 회전
+                        if (img_ratio > 1 and region_ratio < 1) or (img_ratio < 1 and region_ratio > 1):
+                            uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_COUNTERCLOCKWISE)
+                    elif orientation == "vertical":
+                        # 세로 강제: 이미지가 가로로 길면 반시계방향 회전
+                        if img_ratio > 1:
+                            uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_COUNTERCLOCKWISE)
+                    elif orientation == "horizontal":
+                        # 가로 강제: 이미지가 세로로 길면 시계방향 회전
+                        if img_ratio < 1:
+                            uploaded_img = cv2.rotate(uploaded_img, cv2.ROTATE_90_CLOCKWISE)
             
-            # 흰색 배경 투명 처리
-            if remove_white_bg.lower() == "true":
-                image_rgba = remove_white_background(uploaded_img)
-                # RGBA를 BGR로 변환 (투명 부분은 검은색으로)
-                image_rgb = image_rgba[:, :, :3]
-                alpha = image_rgba[:, :, 3:4] / 255.0
-                # 투명 부분을 검은색으로 처리 (composite_signboard의 transparency_mask가 처리)
-                uploaded_img = (image_rgb * alpha + (1 - alpha) * 0).astype(np.uint8)
-                uploaded_img = cv2.cvtColor(uploaded_img, cv2.COLOR_RGB2BGR)
+                # 흰색 배경 투명 처리
+                if remove_white_bg.lower() == "true":
+                    image_rgba = remove_white_background(uploaded_img)
+                    # RGBA를 BGR로 변환 (투명 부분은 검은색으로)
+                    image_rgb = image_rgba[:, :, :3]
+                    alpha = image_rgba[:, :, 3:4] / 255.0
+                    # 투명 부분을 검은색으로 처리 (composite_signboard의 transparency_mask가 처리)
+                    uploaded_img = (image_rgb * alpha + (1 - alpha) * 0).astype(np.uint8)
+                    uploaded_img = cv2.cvtColor(uploaded_img, cv2.COLOR_RGB2BGR)
             
-            # 영역 크기에 맞춰 리사이즈
-            signboard_img = cv2.resize(uploaded_img, (region_width, region_height))
-            text_layer = None
-        else:
-            # 텍스트 방식 (영역 크기에 맞게)
-            logger.info(f"[API] render_signboard 호출: installation_type={installation_type}, sign_type={sign_type}, bg_color={bg_color}, text_color={text_color}")
-            print(f"[API] render_signboard 호출: installation_type={installation_type}, sign_type={sign_type}, bg_color={bg_color}, text_color={text_color}", flush=True)
-            signboard_img, text_layer = render_signboard(
-                text, logo, logo_type, installation_type, sign_type, 
-                bg_color, text_color, final_direction, final_font_size, 
-                text_position_x, text_position_y, region_width, region_height,
-                building_photo=building_img, polygon_points=points,
-                font_family=font_family, font_weight=font_weight
-            )
-            
-            # 실제 텍스트 크기 계산 (render_combined_signboard 내부에서 계산된 값 사용)
-            # render_combined_signboard 함수 내부에서 text_width, text_height를 계산하므로
-            # 여기서도 동일한 방식으로 계산
-            from PIL import Image, ImageDraw, ImageFont
-            font = get_korean_font(final_font_size)
-            draw_temp = ImageDraw.Draw(Image.new('RGB', (region_width, region_height)))
-            if final_direction == "vertical":
-                text_vertical = '\n'.join(list(text))
-                bbox = draw_temp.multiline_textbbox((0, 0), text_vertical, font=font)
+                # 영역 크기에 맞춰 리사이즈
+                signboard_img = cv2.resize(uploaded_img, (region_width, region_height))
+                text_layer = None
             else:
-                bbox = draw_temp.textbbox((0, 0), text, font=font)
-            actual_text_width = bbox[2] - bbox[0]
-            actual_text_height = bbox[3] - bbox[1]
+                # 텍스트 방식 (영역 크기에 맞게)
+                logger.info(f"[API] render_signboard 호출: installation_type={installation_type}, sign_type={sign_type}, bg_color={bg_color}, text_color={text_color}")
+                print(f"[API] render_signboard 호출: installation_type={installation_type}, sign_type={sign_type}, bg_color={bg_color}, text_color={text_color}", flush=True)
+                text_metrics = {}
+                signboard_img, text_layer = render_signboard(
+                    text, logo, logo_type, installation_type, sign_type, 
+                    bg_color, text_color, final_direction, final_font_size, 
+                    text_position_x, text_position_y, region_width, region_height,
+                    building_photo=building_img, polygon_points=points,
+                    font_family=font_family, font_weight=font_weight,
+                    text_metrics=text_metrics
+                )
+            
+                # 실제 텍스트 크기 (render_combined_signboard에서 자동 맞춤된 값 그대로 사용)
+                actual_text_width = text_metrics.get("text_width")
+                actual_text_height = text_metrics.get("text_height")
         
-        # 회전 적용 (rotation 각도가 있으면)
-        # rotation_value는 위에서 이미 변환됨
-        rotation_float = rotation_value
-        print(f"[DEBUG] 회전 체크 - rotation_float: {rotation_float}, abs: {abs(rotation_float)}, > 0.01: {abs(rotation_float) > 0.01}")
-        log_error(f"회전 체크 - rotation_float: {rotation_float}")
+            # 회전 적용 (rotation 각도가 있으면)
+            # rotation_value는 위에서 이미 변환됨
+            rotation_float = rotation_value
+            print(f"[DEBUG] 회전 체크 - rotation_float: {rotation_float}, abs: {abs(rotation_float)}, > 0.01: {abs(rotation_float) > 0.01}")
+            log_error(f"회전 체크 - rotation_float: {rotation_float}")
         
-        if abs(rotation_float) > 0.01:  # 0.01도 이상일 때만 회전 적용
-            try:
-                print(f"[DEBUG] 회전 적용 시작 - rotation: {rotation_float}도")
-                log_error(f"회전 적용 시작 - rotation: {rotation_float}도")
+            if abs(rotation_float) > 0.01:  # 0.01도 이상일 때만 회전 적용
+                try:
+                    print(f"[DEBUG] 회전 적용 시작 - rotation: {rotation_float}도")
+                    log_error(f"회전 적용 시작 - rotation: {rotation_float}도")
                 
-                # 회전 전 크기 저장
-                original_h, original_w = signboard_img.shape[:2]
-                print(f"[DEBUG] 회전 전 이미지 크기: {original_w}x{original_h}")
+                    # 회전 전 크기 저장
+                    original_h, original_w = signboard_img.shape[:2]
+                    print(f"[DEBUG] 회전 전 이미지 크기: {original_w}x{original_h}")
                 
-                # PIL Image로 변환하여 회전 (더 정확함)
-                signboard_pil = Image.fromarray(cv2.cvtColor(signboard_img, cv2.COLOR_BGR2RGB))
-                # 회전 (음수로 회전하여 시계방향 회전, expand=True로 크기 자동 조정)
-                # fillcolor를 투명하게 하지 않고 검은색으로 해서 배경이 보이지 않도록
-                rotated_pil = signboard_pil.rotate(
-                    -rotation_float, 
-                    expand=True, 
-                    fillcolor=(0, 0, 0),
-                    resample=Image.Resampling.BILINEAR
-                )
-                # RGB를 BGR로 변환
-                signboard_img_rotated = cv2.cvtColor(np.array(rotated_pil), cv2.COLOR_RGB2BGR)
+                    # PIL Image로 변환하여 회전 (더 정확함)
+                    signboard_pil = Image.fromarray(cv2.cvtColor(signboard_img, cv2.COLOR_BGR2RGB))
+                    # 회전 (음수로 회전하여 시계방향 회전, expand=True로 크기 자동 조정)
+                    # fillcolor를 투명하게 하지 않고 검은색으로 해서 배경이 보이지 않도록
+                    rotated_pil = signboard_pil.rotate(
+                        -rotation_float, 
+                        expand=True, 
+                        fillcolor=(0, 0, 0),
+                        resample=Image.Resampling.BILINEAR
+                    )
+                    # RGB를 BGR로 변환
+                    signboard_img_rotated = cv2.cvtColor(np.array(rotated_pil), cv2.COLOR_RGB2BGR)
                 
-                # 회전된 이미지로 교체
-                signboard_img = signboard_img_rotated
-                print(f"[DEBUG] 회전된 이미지로 교체 완료")
+                    # 회전된 이미지로 교체
+                    signboard_img = signboard_img_rotated
+                    print(f"[DEBUG] 회전된 이미지로 교체 완료")
                 
-                # 회전 후 크기 확인
-                rotated_h, rotated_w = signboard_img.shape[:2]
-                print(f"[DEBUG] 회전 후 이미지 크기: {rotated_w}x{rotated_h}")
+                    # 회전 후 크기 확인
+                    rotated_h, rotated_w = signboard_img.shape[:2]
+                    print(f"[DEBUG] 회전 후 이미지 크기: {rotated_w}x{rotated_h}")
                 
-                # text_layer도 회전 (전광채널인 경우)
-                if text_layer is not None:
-                    text_pil = Image.fromarray(cv2.cvtColor(text_layer, cv2.COLOR_BGR2RGB))
-                    rotated_text_pil = text_pil.rotate(-rotation_float, expand=True, fillcolor=(0, 0, 0))
-                    text_layer = cv2.cvtColor(np.array(rotated_text_pil), cv2.COLOR_RGB2BGR)
-                    print(f"[DEBUG] text_layer 회전 완료")
+                    # text_layer도 회전 (전광채널인 경우)
+                    if text_layer is not None:
+                        text_pil = Image.fromarray(cv2.cvtColor(text_layer, cv2.COLOR_BGR2RGB))
+                        rotated_text_pil = text_pil.rotate(-rotation_float, expand=True, fillcolor=(0, 0, 0))
+                        text_layer = cv2.cvtColor(np.array(rotated_text_pil), cv2.COLOR_RGB2BGR)
+                        print(f"[DEBUG] text_layer 회전 완료")
                 
-                print(f"[DEBUG] 회전 적용 완료 - 최종 크기: {rotated_w}x{rotated_h}")
-                log_error(f"회전 적용 완료 - 크기: {rotated_w}x{rotated_h}")
-            except Exception as e:
-                import traceback
-                print(f"[DEBUG] 회전 적용 오류: {e}")
-                print(f"[DEBUG] Traceback: {traceback.format_exc()}")
-                log_error(f"회전 적용 중 오류 발생", e)
-        else:
-            print(f"[DEBUG] 회전 적용 안 함 - rotation: {rotation}, rotation_float: {rotation_float}")
-            log_error(f"회전 적용 안 함 - rotation: {rotation}")
+                    print(f"[DEBUG] 회전 적용 완료 - 최종 크기: {rotated_w}x{rotated_h}")
+                    log_error(f"회전 적용 완료 - 크기: {rotated_w}x{rotated_h}")
+                except Exception as e:
+                    import traceback
+                    print(f"[DEBUG] 회전 적용 오류: {e}")
+                    print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+                    log_error(f"회전 적용 중 오류 발생", e)
+            else:
+                print(f"[DEBUG] 회전 적용 안 함 - rotation: {rotation}, rotation_float: {rotation_float}")
+                log_error(f"회전 적용 안 함 - rotation: {rotation}")
+            return signboard_img, text_layer, actual_text_width, actual_text_height
+
+        sign_key, (signboard_img, text_layer, actual_text_width, actual_text_height) = pipeline.run(
+            "sign",
+            (decode_key, geometry_key, signboard_input_type, text, logo, logo_type, signboard_image,
+             installation_type, sign_type, bg_color, text_color, font_family, font_weight,
+             text_position_x, text_position_y, orientation, flip_horizontal, flip_vertical,
+             rotate90, remove_white_bg, rotation_value),
+            sign_stage,
+        )
         
-        # 이미지 합성
-        day_sim, night_sim = composite_signboard(building_img, signboard_img, points, sign_type, text_layer, lights_list, lights_on, installation_type=installation_type)
+        # [composite] 간판 warp + 주간/야간 합성 (조명 제외, 야간은 요청한 경우만)
+        # sign만 요청하면 합성 단계 전체를 생략
+        t_composite = time.perf_counter()
+
+        def composite_stage():
+            stage_timings = {}
+            day, night = composite_signboard(
+                building_img, signboard_img, points, sign_type, text_layer, None, False,
+                building_photo_night=night_base, pre_darkened=True,
+                installation_type=installation_type, timings=stage_timings,
+                render_night=render_night,
+            )
+            return day, night, stage_timings
+
+        composite_key, day_sim, night_sim, timings = None, None, None, {}
+        if wanted & {"day", "night"}:
+            composite_key, (day_sim, night_sim, composite_timings) = pipeline.run(
+                "composite",
+                (decode_key, night_key, geometry_key, sign_key, sign_type, installation_type, render_night),
+                composite_stage,
+            )
+            # 캐시에서 재사용한 단계의 세부 시간은 처음 계산할 때 잰 값이므로 보고하지 않음
+            timings = {"composite_cached": True} if pipeline.reused("composite") else dict(composite_timings)
+
+        # [lights] 조명 합성 (간판 표면 집중, 야간 이미지만)
+        night_image_key = f"{composite_key}/night"
+        if render_night and lights_on and lights_list:
+            def lights_stage():
+                light_timings = {}
+                return apply_lights(night_sim, day_sim, lights_list, timings=light_timings), light_timings
+
+            night_image_key, (night_sim, light_timings) = pipeline.run(
+                "lights", (composite_key, json.dumps(lights_list, sort_keys=True)), lights_stage)
+            timings.update({"lights_cached": True} if pipeline.reused("lights") else light_timings)
+        timings["composite_ms"] = round((time.perf_counter() - t_composite) * 1000, 2)
         
         # 전면프레임-전후광채널 디버그: API 응답 직전에 이미지 저장 (무조건 실행)
         try:
-            if installation_type == "전면프레임" and sign_type == "전후광채널":
+            if installation_type == "전면프레임" and sign_type == "전후광채널" and night_sim is not None:
                 debug_dir = os.path.join(os.path.dirname(__file__), "debug_images")
                 os.makedirs(debug_dir, exist_ok=True)
-                import time
                 timestamp = int(time.time() * 1000)
                 cv2.imwrite(os.path.join(debug_dir, f"api_day_{timestamp}.png"), day_sim)
                 cv2.imwrite(os.path.join(debug_dir, f"api_night_{timestamp}.png"), night_sim)
@@ -3853,20 +3895,42 @@ async def generate_simulation(
         except Exception as e:
             debug_logger.error(f"[API 응답 직전] 이미지 저장 실패: {e}", exc_info=True)
         
-        # Base64로 인코딩
-        day_base64 = image_to_base64(day_sim)
-        night_base64 = image_to_base64(night_sim)
+        # [encode] 요청한 결과물 동시 인코딩 (요청 포맷, 기본 PNG - 바뀌지 않은 이미지는 캐시된 결과 사용)
+        results = {
+            "day": (f"{composite_key}/day", day_sim),
+            "night": (night_image_key, night_sim),
+            "sign": (f"{sign_key}/sign", signboard_img),
+        }
+        images, encoding_info = pipeline.encode(
+            {OUTPUT_KEYS[name]: result for name, result in results.items() if name in wanted},
+            output_encoding or negotiate_encoding(),
+        )
         
         # 실제 텍스트 크기 정보 포함
         response_data = {
-            "day_simulation": day_base64,
-            "night_simulation": night_base64
+            **images,
+            "timings": timings,
+            "encoding": encoding_info,
+            "quality": quality,
+            "preview_scale": preview_scale,
+            "outputs": [name for name in OUTPUT_KEYS if name in wanted],
+            "pipeline": pipeline.report(),
         }
         
         # 텍스트 방식인 경우 실제 텍스트 크기 정보 추가
+        # 미리보기는 축소 값을 되돌리면 반올림 오차가 생기므로 원본 사진 폴리곤으로 영역/텍스트 크기를 다시 계산
         if signboard_input_type == "text" and text:
             try:
                 if 'actual_text_width' in locals() and 'actual_text_height' in locals():
+                    if preview_scale != 1.0:
+                        _, region_width, region_height, full_direction, full_font_size = compute_geometry(1.0)
+                        if actual_text_width is not None:
+                            _, full_metrics = fit_signboard_text(
+                                text, installation_type, region_width, region_height, full_font_size,
+                                font_family=font_family, font_weight=font_weight, text_direction=full_direction,
+                            )
+                            actual_text_width = full_metrics["text_width"]
+                            actual_text_height = full_metrics["text_height"]
                     response_data["text_width"] = actual_text_width
                     response_data["text_height"] = actual_text_height
                     response_data["signboard_width"] = region_width
@@ -3888,10 +3952,182 @@ async def generate_simulation(
             {"error": str(e), "traceback": traceback.format_exc()},
             status_code=500
         )
+    finally:
+        set_glow_scale(1.0)
+
+# 배치 변형 요청 최대 개수 / 동시에 렌더링할 변형 수 (기본은 렌더 풀 워커 수)
+VARIANTS_MAX = int(os.getenv("VARIANTS_MAX", "32"))
+VARIANTS_PARALLEL = int(os.getenv("VARIANTS_PARALLEL", "0"))
+
+# 배치 전체에 공통이어야 하는 파라미터 (사진 준비 방식이 달라지므로 변형별로 바꿀 수 없음)
+VARIANT_SHARED_PARAMS = ("quality", "preview_width", "signboards")
+
+def parse_variants(value: str, job) -> list:
+    """variants JSON 파싱 - 각 변형은 기본 파라미터를 덮어쓸 작업 인자 dict
+
+    문자열 파라미터에 JSON 값(lights 배열, true/false 등)을 주면 JSON 문자열로 바꾸고,
+    int/float 파라미터는 add_raw_photo_route처럼 해당 타입으로 변환한다 ("24" → 24).
+
+    Raises:
+        ValueError: JSON 형식 오류, 빈 목록, VARIANTS_MAX 초과, 알 수 없거나 바꿀 수 없는 파라미터, 잘못된 숫자 값
+    """
+    try:
+        variants = json.loads(value)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"variants JSON 형식 오류: {e}")
+    if not isinstance(variants, list) or not variants:
+        raise ValueError("variants는 파라미터 객체의 비어 있지 않은 JSON 배열이어야 합니다.")
+    if len(variants) > VARIANTS_MAX:
+        raise ValueError(f"variants는 최대 {VARIANTS_MAX}개입니다 ({len(variants)}개 요청).")
+
+    job_params = inspect.signature(job).parameters
+    parsed = []
+    for index, variant in enumerate(variants):
+        if not isinstance(variant, dict):
+            raise ValueError(f"variants[{index}]는 JSON 객체여야 합니다.")
+        invalid = [
+            name for name in variant
+            if name not in job_params or name in JOB_INTERNAL_PARAMS or name in VARIANT_SHARED_PARAMS
+        ]
+        if invalid:
+            raise ValueError(f"variants[{index}]에서 바꿀 수 없는 파라미터: {', '.join(invalid)}")
+        parsed.append({
+            name: _variant_value(index, name, job_params[name].annotation, value)
+            for name, value in variant.items()
+        })
+    return parsed
+
+def _variant_value(index: int, name: str, annotation, value):
+    """변형 파라미터 값을 작업 인자 타입으로 변환 (문자열 파라미터의 JSON 값은 JSON 문자열로, 숫자는 int/float로)
+
+    Raises:
+        ValueError: 숫자 파라미터에 숫자로 바꿀 수 없는 값 (bool, 소수인 int 값 포함)
+    """
+    if annotation is str:
+        return json.dumps(value) if not isinstance(value, (str, type(None))) else value
+    if annotation in (int, float):
+        if isinstance(value, bool) or (annotation is int and isinstance(value, float) and not value.is_integer()):
+            raise ValueError(f"variants[{index}].{name} 값이 올바르지 않습니다: {json.dumps(value, ensure_ascii=False)}")
+        try:
+            return annotation(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"variants[{index}].{name} 값이 올바르지 않습니다: {json.dumps(value, ensure_ascii=False)}")
+    return value
+
+async def run_variant_batch(params: dict):
+    """한 건물 사진 + 여러 파라미터 변형 렌더링
+
+    사진은 한 번만 디코딩하고(임시 사진 세션: 사진 해시, 야간 배경, 미리보기 피라미드),
+    각 변형은 렌더 풀에서 별도 작업으로 동시에 실행한다. 변형 간에 같은 단계(폴리곤 geometry,
+    같은 간판의 sign 등)는 단계 캐시로 공유된다.
+    stream이면 끝나는 순서대로 NDJSON 한 줄씩 보내고, 아니면 모두 끝난 뒤 요청 순서대로 반환한다.
+    """
+    job = _generate_simulation_job
+    stream = (params.pop("stream", None) or "false").lower() == "true"
+    try:
+        variants = parse_variants(params.pop("variants"), job)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    error = await prepare_render_params(job, params)
+    if error is not None:
+        return error
+    if not isinstance(params["building_photo"], np.ndarray):
+        session = await run_render_job(_create_photo_session_job, building_photo=params["building_photo"])
+        if isinstance(session, JSONResponse):
+            return session
+        if session is None:
+            return JSONResponse(status_code=400, content={"error": "건물 사진을 디코딩할 수 없습니다."})
+        apply_photo_session(job, params, session)
+
+    t_batch = time.perf_counter()
+    parallel = asyncio.Semaphore(max(1, VARIANTS_PARALLEL or render_pool.workers))
+
+    async def run_variant(index: int, variant: dict) -> dict:
+        async with parallel:
+            t0 = time.perf_counter()
+            result = await run_render_job(job, **{**params, **variant})
+        status, body = response_content(result)
+        return {
+            "index": index,
+            "variant": variant,
+            "status": status,
+            "render_ms": round((time.perf_counter() - t0) * 1000, 1),
+            **body,
+        }
+
+    tasks = [asyncio.ensure_future(run_variant(index, variant)) for index, variant in enumerate(variants)]
+    logger.info(f"[배치 변형] {len(tasks)}개 변형 렌더링 시작")
+
+    if stream:
+        async def ndjson_lines():
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    yield json.dumps(await next_result, ensure_ascii=False) + "\n"
+            finally:
+                # 클라이언트가 연결을 끊으면 아직 시작하지 않은 변형은 취소
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*tasks)
+    return {
+        "variants": results,
+        "count": len(results),
+        "failed": sum(1 for result in results if result["status"] != 200),
+        "batch_ms": round((time.perf_counter() - t_batch) * 1000, 1),
+    }
+
+@app.post("/api/generate-variants")
+async def generate_variants(
+    request: Request,
+    variants: str = Form(...),  # 변형 목록 JSON: [{"sign_type": "전광채널", "text_color": "#FFFFFF"}, ...]
+    stream: str = Form("false"),  # "true"면 끝나는 순서대로 NDJSON 스트리밍
+    building_photo: str = Form(None),
+    polygon_points: str = Form(...),
+    signboard_input_type: str = Form("text"),
+    text: str = Form(""),
+    logo: str = Form(""),
+    logo_type: str = Form("channel"),
+    signboard_image: str = Form(""),
+    installation_type: str = Form("맨벽"),
+    sign_type: str = Form(...),
+    bg_color: str = Form(...),
+    text_color: str = Form(...),
+    text_direction: str = Form("horizontal"),
+    font_size: int = Form(100),
+    font_family: str = Form("malgun"),
+    font_weight: str = Form("400"),
+    text_position_x: int = Form(50),
+    text_position_y: int = Form(50),
+    orientation: str = Form("auto"),
+    flip_horizontal: str = Form("false"),
+    flip_vertical: str = Form("false"),
+    rotate90: int = Form(0),
+    rotation: float = Form(0.0),
+    remove_white_bg: str = Form("false"),
+    lights: str = Form("[]"),
+    lights_enabled: str = Form("true"),
+    quality: str = Form("full"),
+    preview_width: int = Form(PREVIEW_WIDTH),
+    outputs: str = Form(DEFAULT_OUTPUTS),
+    photo_session: str = Form(None),
+    output_format: str = Form(None),
+    building_photo_file: UploadFile = File(None),
+    logo_file: UploadFile = File(None),
+    signboard_image_file: UploadFile = File(None),
+):
+    """
+    배치 변형: 한 건물 사진/폴리곤에 간판 종류, 설치 방식, 색상 등 여러 조합을 한 번에 렌더링
+    (나머지 필드는 /api/generate-simulation과 같고, 각 변형이 그 값을 덮어씀)
+    """
+    return await run_variant_batch(locals())
 
 @app.post("/api/generate-hq")
 async def generate_hq(
-    building_photo: str = Form(...),
+    request: Request,
+    building_photo: str = Form(None),
     polygon_points: str = Form(...),
     signboard_input_type: str = Form("text"),
     text: str = Form(""),
@@ -3914,14 +4150,75 @@ async def generate_hq(
     remove_white_bg: str = Form("false"),
     lights: str = Form("[]"),
     lights_enabled: str = Form("true"),
-    signboards: str = Form(None)
+    signboards: str = Form(None),
+    outputs: str = Form(DEFAULT_OUTPUTS),  # 만들 결과물 (day, night, sign 중 쉼표 구분)
+    photo_session: str = Form(None),  # building_photo 대신 사진 세션 ID (/api/photo-session)
+    output_format: str = Form(None),  # 응답 이미지 포맷 (png, jpeg:80, webp 등, 없으면 Accept 헤더)
+    # base64 필드 대신 보낼 수 있는 multipart 파일 파트
+    building_photo_file: UploadFile = File(None),
+    logo_file: UploadFile = File(None),
+    signboard_image_file: UploadFile = File(None),
 ):
     """
     Phase 1 (CG 생성) + Phase 2 (pix2pix 개선) - AI 고품질 모드
+
+    작업을 HQ 작업 큐에 넣고 작업 ID를 바로 반환 (202) - 결과는 /api/jobs/{job_id}/result
     """
+    params = locals()
+    error = await prepare_render_params(_generate_hq_job, params)
+    if error is not None:
+        return error
+    return await queue_hq_job(_generate_hq_job, **params)
+
+def _generate_hq_job(
+    *,
+    building_photo: str,
+    polygon_points: str,
+    signboard_input_type: str = "text",
+    text: str = "",
+    logo: str = "",
+    logo_type: str = "channel",
+    signboard_image: str = "",
+    installation_type: str = "맨벽",
+    sign_type: str,
+    bg_color: str,
+    text_color: str,
+    text_direction: str = "horizontal",
+    font_size: int = 100,
+    text_position_x: int = 50,
+    text_position_y: int = 50,
+    orientation: str = "auto",
+    flip_horizontal: str = "false",
+    flip_vertical: str = "false",
+    rotate90: int = 0,
+    rotation: float = 0.0,
+    remove_white_bg: str = "false",
+    lights: str = "[]",
+    lights_enabled: str = "true",
+    signboards: str = None,
+    outputs: str = DEFAULT_OUTPUTS,
+    night_base: np.ndarray = None,  # 사진 세션의 미리 계산된 야간 배경
+    output_encoding: OutputEncoding = None
+):
+    """AI 고품질 모드 렌더링 (queue_hq_job으로 등록되어 hq_jobs 작업 큐의 워커 스레드에서 실행)"""
     try:
-        # 1. pix2pix 모델 확인
+        wanted = parse_outputs(outputs)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    # 단계별 처리 시간 (ms)
+    timings = {}
+    t_start = time.perf_counter()
+
+    def mark(name: str, t0: float) -> float:
+        now = time.perf_counter()
+        timings[f"{name}_ms"] = round((now - t0) * 1000, 1)
+        return now
+
+    try:
+        # 1. pix2pix 모델 확인 (첫 요청이면 로딩 시간 포함)
         ai_engine = get_pix2pix_engine()
+        t = mark("model", t_start)
         if ai_engine is None:
             return JSONResponse(
                 status_code=503,
@@ -3929,7 +4226,8 @@ async def generate_hq(
             )
         
         # 2. Phase 1: 간판 이미지 생성 (건물에 합성하기 전의 순수 간판)
-        building_img = base64_to_image(building_photo)
+        building_img = decode_building_photo(building_photo)
+        t = mark("decode", t)
         points = json.loads(polygon_points)
         
         # 간판 영역 크기 계산 (기존 generate_simulation 로직 재사용)
@@ -3979,6 +4277,8 @@ async def generate_hq(
                 building_photo=building_img, polygon_points=points
             )
         
+        t = mark("render", t)
+
         # 3. pix2pix로 개선 (원본 크기 그대로)
         logger.info(f"[AI 고품질] pix2pix 추론 시작: 간판 크기 {phase1_signboard.shape[1]}x{phase1_signboard.shape[0]}")
         
@@ -3987,8 +4287,10 @@ async def generate_hq(
         cv2.imwrite(debug_path, phase1_signboard)
         logger.info(f"[AI 고품질] 디버그 이미지 저장: {debug_path}, shape={phase1_signboard.shape}, min={phase1_signboard.min()}, max={phase1_signboard.max()}, mean={phase1_signboard.mean():.2f}")
         
+        t = time.perf_counter()
         enhanced_signboard = ai_engine.enhance(phase1_signboard)
-        logger.info(f"[AI 고품질] pix2pix 추론 완료: 결과 크기 {enhanced_signboard.shape}")
+        t = mark("inference", t)
+        logger.info(f"[AI 고품질] pix2pix 추론 완료: 결과 크기 {enhanced_signboard.shape}, {timings['inference_ms']}ms")
         
         # 3-1. 맨벽/프레임바일 때 배경을 검정으로 변경 (합성용)
         if installation_type in ["맨벽", "프레임바"]:
@@ -4005,29 +4307,74 @@ async def generate_hq(
             logger.info(f"[AI 고품질] 배경 검정 처리 완료: {similarity.sum()} 픽셀")
         
         # 4. 건물 사진에 합성 (기존 composite_signboard 로직 재사용, 리사이즈 불필요)
+        #    sign만 요청하면 합성 생략, 야간을 요청하지 않으면 야간 경로 생략
         lights_list = json.loads(lights) if lights else []
         lights_on = lights_enabled.lower() != "false"
         
-        final_day, final_night = composite_signboard(
-            building_img, enhanced_signboard, points, sign_type,
-            text_layer=None, lights=lights_list, lights_enabled=lights_on,
-            installation_type=installation_type
-        )
+        final_day = final_night = None
+        if wanted & {"day", "night"}:
+            final_day, final_night = composite_signboard(
+                building_img, enhanced_signboard, points, sign_type,
+                text_layer=None, lights=lights_list, lights_enabled=lights_on,
+                building_photo_night=night_base, pre_darkened=night_base is not None,
+                installation_type=installation_type, render_night="night" in wanted,
+            )
+        t = mark("composite", t)
         
-        # 6. Base64로 인코딩하여 반환
+        # 6. 요청한 결과물 동시 인코딩하여 반환
+        results = {"day": final_day, "night": final_night, "sign": enhanced_signboard}
+        images, encoding_info = encode_images(
+            {OUTPUT_KEYS[name]: image for name, image in results.items() if name in wanted},
+            output_encoding or negotiate_encoding(),
+        )
+        mark("encode", t)
+        timings["total_ms"] = round((time.perf_counter() - t_start) * 1000, 1)
         return {
-            "day_simulation": image_to_base64(final_day),
-            "night_simulation": image_to_base64(final_night) if final_night is not None else image_to_base64(final_day),
-            "processing_time": 0  # TODO: 실제 처리 시간 측정
+            **images,
+            "outputs": [name for name in OUTPUT_KEYS if name in wanted],
+            "encoding": encoding_info,
+            "timings": timings,
+            "processing_time": round(timings["total_ms"] / 1000, 2),  # 초
         }
         
     except Exception as e:
         logger.error(f"AI 고품질 생성 실패: {e}", exc_info=True)
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """작업 상태 조회 (queued/running/done/failed/cancelled, 대기 순서, 단계별 처리 시간)"""
+    job = hq_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "작업이 없거나 결과 보관 시간이 지났습니다."})
+    return job.describe(hq_jobs.queue_position(job))
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """작업 결과 조회 - 아직 끝나지 않았으면 202 + 상태, 실패면 작업의 오류 상태 코드"""
+    job = hq_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "작업이 없거나 결과 보관 시간이 지났습니다."})
+    if not job.is_finished:
+        return JSONResponse(status_code=202, content=job.describe(hq_jobs.queue_position(job)))
+    if job.status == CANCELLED:
+        return JSONResponse(status_code=409, content={**job.describe(), "error": "취소된 작업입니다."})
+    return JSONResponse(status_code=job.status_code, content={**job.result, "job": job.describe()})
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """대기 중인 작업 취소 (이미 실행 중이거나 끝난 작업은 409)"""
+    job = hq_jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "작업이 없거나 결과 보관 시간이 지났습니다."})
+    if not hq_jobs.cancel(job_id):
+        return JSONResponse(status_code=409, content={**job.describe(), "error": "대기 중인 작업만 취소할 수 있습니다."})
+    return job.describe()
+
 @app.post("/api/generate-flat-design")
 async def generate_flat_design_api(
-    building_photo: str = Form(...),  # 원본 건물 사진
+    request: Request,
+    building_photo: str = Form(None),  # 원본 건물 사진 (또는 building_photo_file 파트)
     polygon_points: str = Form(...),
     signboard_input_type: str = Form("text"),
     text: str = Form(""),
@@ -4052,13 +4399,52 @@ async def generate_flat_design_api(
     region_width_mm: float = Form(None),  # 실제 영역 너비 (mm, 선택사항)
     region_height_mm: float = Form(None),  # 실제 영역 높이 (mm, 선택사항)
     mode: str = Form("day"),  # 주간/야간 모드 ("day" 또는 "night")
+    photo_session: str = Form(None),  # building_photo 대신 사진 세션 ID (/api/photo-session)
+    output_format: str = Form(None),  # 응답 이미지 포맷 (png, jpeg:80, webp 등, 없으면 Accept 헤더)
+    # base64 필드 대신 보낼 수 있는 multipart 파일 파트
+    building_photo_file: UploadFile = File(None),
+    logo_file: UploadFile = File(None),
+    signboard_image_file: UploadFile = File(None),
 ):
     """
     평면 시안 생성: 원본 건물 사진에서 폴리곤 영역을 정면으로 펴서 간판 시안 합성
     """
+    # 렌더링은 렌더 풀 워커에서 실행 (이벤트 루프를 막지 않도록)
+    return await run_image_render_job(_generate_flat_design_api_job, locals())
+
+def _generate_flat_design_api_job(
+    *,
+    building_photo: str,  # 원본 건물 사진
+    polygon_points: str,
+    signboard_input_type: str = "text",
+    text: str = "",
+    logo: str = "",
+    logo_type: str = "channel",
+    signboard_image: str = "",
+    installation_type: str = "맨벽",
+    sign_type: str,
+    bg_color: str,
+    text_color: str,
+    text_direction: str = "horizontal",
+    font_size: int = 100,
+    text_position_x: int = 50,
+    text_position_y: int = 50,
+    orientation: str = "auto",
+    flip_horizontal: str = "false",
+    flip_vertical: str = "false",
+    rotate90: int = 0,
+    rotation: float = 0.0,
+    lights_enabled: str = "true",
+    show_dimensions: str = "true",  # 치수 표시 여부
+    region_width_mm: float = None,  # 실제 영역 너비 (mm, 선택사항)
+    region_height_mm: float = None,  # 실제 영역 높이 (mm, 선택사항)
+    mode: str = "day",  # 주간/야간 모드 ("day" 또는 "night")
+    output_encoding: OutputEncoding = None,
+):
+    """평면 시안 렌더링 (렌더 풀 워커에서 실행)"""
     try:
         # 1. 원본 건물 사진 디코딩
-        building_img = base64_to_image(building_photo)
+        building_img = decode_building_photo(building_photo)
         
         # 2. 폴리곤 포인트 파싱
         points = json.loads(polygon_points)
@@ -4151,10 +4537,14 @@ async def generate_flat_design_api(
             sign_type=sign_type  # 간판 종류 (발광 효과용)
         )
         
-        # 6. Base64로 인코딩하여 반환
+        # 6. 두 이미지를 동시 인코딩하여 반환
+        images, encoding_info = encode_images(
+            {"design_only": design_only, "with_context": with_context},
+            output_encoding or negotiate_encoding(),
+        )
         return {
-            "design_only": image_to_base64(design_only),
-            "with_context": image_to_base64(with_context),
+            **images,
+            "encoding": encoding_info,
             "dimensions": dimensions,
             "width": design_only.shape[1],
             "height": design_only.shape[0],
@@ -4166,17 +4556,33 @@ async def generate_flat_design_api(
         logger.error(f"평면 시안 생성 실패: {e}", exc_info=True)
         return JSONResponse(status_code=500, content={"error": str(e)})
 
-# AI 브랜딩 시스템 초기화
-if AI_BRANDING_AVAILABLE:
-    try:
-        branding_system = AIBrandingSystem()
-        logger.info("AI 브랜딩 시스템 초기화 완료")
-    except Exception as e:
-        logger.error(f"AI 브랜딩 시스템 초기화 실패: {e}")
-        branding_system = None
-else:
-    branding_system = None
-    logger.warning("AI 브랜딩 시스템을 사용할 수 없습니다 (openai 모듈 없음)")
+# AI 브랜딩 시스템 (startup 워밍업에서 init_branding_system으로 초기화)
+branding_system = None
+
+def init_branding_system():
+    """AI 브랜딩 시스템 초기화 (openai import 포함, 실패하면 branding_system은 None 유지)"""
+    global branding_system
+    from ai_branding import AIBrandingSystem
+    branding_system = AIBrandingSystem()
+    logger.info("AI 브랜딩 시스템 초기화 완료")
+
+def branding_unavailable() -> JSONResponse:
+    """branding_system이 없을 때의 응답 - 아직 초기화 중이면 503 (잠시 후 재시도), 초기화 실패/사용 불가면 500"""
+    if readiness.status("ai_branding") in (PENDING, WARMING):
+        return JSONResponse(
+            {"error": "AI 브랜딩 시스템을 초기화하는 중입니다. 잠시 후 다시 시도해주세요."},
+            status_code=503,
+            headers={"Retry-After": "2"},
+        )
+    return JSONResponse(
+        {"error": "AI 브랜딩 시스템이 초기화되지 않았습니다."},
+        status_code=500,
+    )
+
+# 건물 사진을 raw 본문(image/jpeg 등)으로 받는 엔드포인트 (나머지 파라미터는 query string)
+add_raw_photo_route("/api/generate-simulation/raw", _generate_simulation_job)
+add_raw_photo_route("/api/generate-hq/raw", _generate_hq_job, runner=queue_hq_job)
+add_raw_photo_route("/api/generate-flat-design/raw", _generate_flat_design_api_job)
 
 @app.post("/api/ai-suggest-names")
 async def ai_suggest_names(
@@ -4188,10 +4594,7 @@ async def ai_suggest_names(
     """AI 상호명 제안 엔드포인트"""
     
     if not branding_system:
-        return JSONResponse(
-            {"error": "AI 브랜딩 시스템이 초기화되지 않았습니다."},
-            status_code=500
-        )
+        return branding_unavailable()
     
     try:
         logger.info(f"상호명 생성 요청: industry={industry}, mood={mood}")
@@ -4237,10 +4640,7 @@ async def ai_suggest_style(
     """AI 간판 스타일 추천 엔드포인트"""
     
     if not branding_system:
-        return JSONResponse(
-            {"error": "AI 브랜딩 시스템이 초기화되지 않았습니다."},
-            status_code=500
-        )
+        return branding_unavailable()
     
     try:
         logger.info(f"스타일 추천 요청: business_name={business_name}, industry={industry}")
@@ -4281,10 +4681,7 @@ async def ai_suggest_colors(
     """AI 브랜드 색상 추천 엔드포인트"""
     
     if not branding_system:
-        return JSONResponse(
-            {"error": "AI 브랜딩 시스템이 초기화되지 않았습니다."},
-            status_code=500
-        )
+        return branding_unavailable()
     
     try:
         logger.info(f"색상 추천 요청: business_name={business_name}")
@@ -4333,10 +4730,7 @@ async def ai_branding_complete(
     """
     
     if not branding_system:
-        return JSONResponse(
-            {"error": "AI 브랜딩 시스템이 초기화되지 않았습니다."},
-            status_code=500
-        )
+        return branding_unavailable()
     
     try:
         selected_name = business_name.strip()
@@ -4387,10 +4781,7 @@ async def ai_generate_logo(
     """DALL-E 3를 사용한 간판용 로고 생성 엔드포인트"""
 
     if not branding_system:
-        return JSONResponse(
-            {"error": "AI 브랜딩 시스템이 초기화되지 않았습니다."},
-            status_code=500,
-        )
+        return branding_unavailable()
 
     try:
         colors = {
@@ -4434,6 +4825,21 @@ async def root():
     return {
         "message": "Signboard Simulation API",
         "ai_branding_available": branding_system is not None,
+        "ready": readiness.ready(),
+        "font_cache": font_registry.stats(),
+        "text_cache": text_cache.stats(),
+        "glow_cache": glow_cache.stats(),
+        "render_pool": render_pool.stats(),
+        "photo_sessions": photo_sessions.stats(),
+        "stage_cache": stage_cache.stats(),
+        "hq_jobs": hq_jobs.stats(),
+        "pix2pix_backend": pix2pix_backend,
+        "pix2pix_precision": PIX2PIX_PRECISION if pix2pix_backend == "onnx" else
+                             "bf16" if pix2pix_torch_options and pix2pix_torch_options["bf16"] else "fp32",
+        "pix2pix_torch": pix2pix_torch_options,
+        "pix2pix_batching": pix2pix_scheduler.stats() if pix2pix_scheduler else None,
+        "pix2pix_tiling": pix2pix_tiler.stats() if pix2pix_tiler else None,
+        "pix2pix_cache": pix2pix_cache.stats() if pix2pix_cache else None,
         "endpoints": {
             "ai_suggest_names": "/api/ai-suggest-names",
             "ai_suggest_style": "/api/ai-suggest-style", 
@@ -0,0 +1,96 @@
+"""
+pix2pix 추론 엔진 - ONNX Runtime 백엔드 (torch 불필요)
+
+export_onnx.py로 변환한 generator(.onnx)를 onnxruntime CPU 실행 프로바이더로 실행한다.
+SignboardAIEngine(pix2pix_inference.py)과 같은 enhance / preprocess / infer / postprocess
+인터페이스와 같은 전처리(pix2pix_io.py: 512x512 비율 유지 + 중앙 패딩, [-1, 1] 정규화)를 사용하므로
+PIX2PIX_BACKEND 설정만으로 바꿔 쓸 수 있다.
+
+- 서버에서 torch, torchvision, pytorch-CycleGAN-and-pix2pix 저장소가 필요 없음
+- 그래프 최적화(ORT_ENABLE_ALL) 적용, ONNX_THREADS로 연산 스레드 수 지정 (0이면 onnxruntime 기본값)
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Tuple
+
+import numpy as np
+import onnxruntime as ort
+
+from pix2pix_io import ScaleInfo, new_input_batch, preprocess_into, postprocess_output
+
+logger = logging.getLogger(__name__)
+
+# 연산(intra-op) 스레드 수 (0이면 onnxruntime 기본값 = 물리 코어 수)
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))
+
+
+class ONNXSignboardEngine:
+    def __init__(self, onnx_path: str, threads: int = ONNX_THREADS):
+        """
+        Args:
+            onnx_path: export_onnx.py로 변환한 모델 경로 (예: 'checkpoints/signboard_pix2pix_v1/140_net_G.onnx')
+            threads: 연산 스레드 수 (0이면 onnxruntime 기본값)
+        """
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(f"ONNX 모델 파일을 찾을 수 없습니다: {onnx_path} (export_onnx.py로 변환)")
+
+        t0 = time.perf_counter()
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.output_name = self.session.get_outputs()[0].name
+        self._local = threading.local()
+        logger.info(f"Pix2pix ONNX 모델 로드 완료: {onnx_path} ({(time.perf_counter() - t0) * 1000:.0f}ms, "
+                    f"providers={self.session.get_providers()})")
+
+    @staticmethod
+    def preprocess(img: np.ndarray, out: np.ndarray = None) -> Tuple[np.ndarray, ScaleInfo]:
+        """
+        OpenCV BGR 이미지를 모델 입력 형식으로 변환 (SignboardAIEngine.preprocess와 같은 결과)
+
+        Args:
+            out: 재사용할 입력 버퍼 [1, 3, 512, 512] (None이면 새로 할당)
+
+        Returns:
+            tuple: ([1, 3, 512, 512] float32, (original_h, original_w, resized_h, resized_w, pad_top, pad_left))
+        """
+        batch = out if out is not None else new_input_batch(1)
+        return batch, preprocess_into(img, batch[0])
+
+    def infer(self, batch: np.ndarray) -> np.ndarray:
+        """모델 실행 ([N, 3, 512, 512] float32 → [N, 3, 512, 512], 값 범위 [-1, 1])"""
+        return self.session.run([self.output_name], {self.input_name: batch})[0]
+
+    def postprocess(self, output: np.ndarray, scale_info: ScaleInfo) -> np.ndarray:
+        """모델 출력 [1, 3, H, W]를 원본 크기 BGR 이미지로 복원 (SignboardAIEngine.postprocess와 같음)"""
+        return postprocess_output(output[0], scale_info)
+
+    def _input_buffer(self) -> np.ndarray:
+        """스레드별로 재사용하는 입력 버퍼 (enhance 전용)"""
+        buffer = getattr(self._local, "input", None)
+        if buffer is None:
+            buffer = self._local.input = new_input_batch(1)
+        return buffer
+
+    def enhance(self, phase1_signboard: np.ndarray) -> np.ndarray:
+        """
+        Phase 1 CG 간판 이미지를 실제 사진처럼 변환 (원본 크기 유지)
+
+        Args:
+            phase1_signboard: OpenCV BGR 이미지 (간판만, 어떤 크기든 가능)
+
+        Returns:
+            변환된 간판 이미지 (원본 크기, BGR)
+        """
+        input_tensor, scale_info = self.preprocess(phase1_signboard, out=self._input_buffer())
+        output = self.infer(input_tensor)
+        result = self.postprocess(output, scale_info)
+        logger.info(f"[pix2pix/onnx] 추론 완료: 입력 {phase1_signboard.shape} → 결과 {result.shape}")
+        return result
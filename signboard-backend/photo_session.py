@@ -0,0 +1,213 @@
+"""
+건물 사진 세션 - 업로드한 사진을 디코딩된 상태로 서버에 보관
+
+프론트엔드는 슬라이더를 움직일 때마다 같은 건물 사진을 base64로 다시 보내고
+서버는 매번 다시 디코딩한다. 사진을 한 번 업로드해 세션을 만들면 이후 요청은
+photo_session ID만 보내고, 서버는 디코딩된 사진과 미리 계산한 값을 재사용한다.
+
+세션에 미리 계산해 두는 것:
+- photo: 디코딩된 BGR 사진 (읽기 전용)
+- night_base: 야간 합성용 어두운 배경 (composite_signboard와 같은 NIGHT_DARKEN 배율)
+- pyramid: 미리보기용 축소 사진 (cv2.pyrDown 반복, 1/2, 1/4, ...)
+- photo_hash: 디코딩된 픽셀 해시 (같은 사진을 다시 올리면 기존 세션 재사용)
+
+같은 사진을 올린 클라이언트들은 같은 세션 ID를 공유하므로 세션은 참조 수(holders)를 세고,
+DELETE는 참조를 하나 줄이며 마지막 참조가 삭제될 때만 세션을 제거한다.
+
+세션은 마지막 사용 후 PHOTO_SESSION_TTL 초가 지나면 만료되고,
+전체 메모리가 PHOTO_SESSION_MAX_MB를 넘으면 가장 오래 사용하지 않은 세션부터 제거한다.
+"""
+
+import os
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import cv2
+
+import compositing
+
+logger = logging.getLogger(__name__)
+
+# 세션 유지 시간 (초, 마지막 사용 기준)
+PHOTO_SESSION_TTL = float(os.getenv("PHOTO_SESSION_TTL", "1800"))
+# 전체 세션 메모리 한도 (MB)
+PHOTO_SESSION_MAX_MB = float(os.getenv("PHOTO_SESSION_MAX_MB", "512"))
+
+# 야간 배경 밝기 배율 (composite_signboard의 "전체 배경 어둡게"와 같은 값)
+NIGHT_DARKEN = 0.25
+
+# 미리보기 피라미드의 가장 작은 레벨 긴 변 (px)
+PREVIEW_MIN_SIDE = 256
+
+
+class PhotoSession:
+    """디코딩된 건물 사진 + 미리 계산한 야간 배경/미리보기 피라미드"""
+
+    def __init__(self, photo: np.ndarray, photo_hash: str):
+        self.id = uuid.uuid4().hex
+        self.photo_hash = photo_hash
+        self.photo = photo
+        self.night_base = compositing.scale(photo, NIGHT_DARKEN)
+
+        self.pyramid = []
+        level = photo
+        while max(level.shape[:2]) // 2 >= PREVIEW_MIN_SIDE:
+            level = cv2.pyrDown(level)
+            self.pyramid.append(level)
+
+        # 여러 요청이 공유하므로 읽기 전용
+        for array in (self.photo, self.night_base, *self.pyramid):
+            array.setflags(write=False)
+
+        self.created = time.time()
+        self.last_access = self.created
+        # 이 세션을 업로드해 받은 클라이언트 수 (PhotoSessionStore가 관리)
+        self.holders = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.photo.nbytes + self.night_base.nbytes + sum(level.nbytes for level in self.pyramid)
+
+    @property
+    def size(self) -> tuple:
+        """(width, height)"""
+        return self.photo.shape[1], self.photo.shape[0]
+
+    def preview_source(self, width: int) -> np.ndarray:
+        """가로가 width 이상인 가장 작은 피라미드 레벨 (없으면 원본) - 미리보기 축소의 시작점"""
+        for level in reversed(self.pyramid):
+            if level.shape[1] >= width:
+                return level
+        return self.photo
+
+    def describe(self) -> dict:
+        """업로드 응답용 정보"""
+        width, height = self.size
+        return {
+            "session_id": self.id,
+            "photo_hash": self.photo_hash,
+            "width": width,
+            "height": height,
+            "preview_sizes": [[level.shape[1], level.shape[0]] for level in self.pyramid],
+            "expires_in": PHOTO_SESSION_TTL,
+        }
+
+
+def photo_hash(photo: np.ndarray) -> str:
+    """디코딩된 사진 픽셀 해시 (크기 포함)"""
+    digest = hashlib.blake2b(np.ascontiguousarray(photo).data, digest_size=16)
+    digest.update(str(photo.shape).encode())
+    return digest.hexdigest()
+
+
+def build_photo_session(photo: np.ndarray) -> PhotoSession:
+    """사진으로 세션 생성 (해시/야간 배경/피라미드 계산 - 렌더 풀 워커에서 실행)"""
+    return PhotoSession(photo, photo_hash(photo))
+
+
+class PhotoSessionStore:
+    """세션 ID → PhotoSession (TTL + 메모리 한도 LRU)"""
+
+    def __init__(self, ttl: float = PHOTO_SESSION_TTL, max_bytes: int = int(PHOTO_SESSION_MAX_MB * 1024 * 1024)):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._by_hash = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _remove(self, session_id: str):
+        session = self._sessions.pop(session_id)
+        self._by_hash.pop(session.photo_hash, None)
+        self.current_bytes -= session.nbytes
+
+    def _expire(self, now: float):
+        """TTL이 지난 세션 제거 (가장 오래 사용하지 않은 것부터 확인)"""
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access <= self.ttl:
+                break
+            self._remove(session_id)
+            self.expired += 1
+
+    def add(self, session: PhotoSession) -> PhotoSession:
+        """세션 등록 (같은 사진의 세션이 이미 있으면 참조 수를 늘리고 그 세션을 반환)"""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            existing_id = self._by_hash.get(session.photo_hash)
+            if existing_id is not None:
+                existing = self._sessions[existing_id]
+                existing.holders += 1
+                existing.last_access = now
+                self._sessions.move_to_end(existing_id)
+                return existing
+
+            if session.nbytes > self.max_bytes:
+                # 한도보다 큰 사진은 보관하지 않음 (호출하는 쪽에서 base64 업로드 사용)
+                raise ValueError(f"사진이 너무 큽니다 ({session.nbytes / 1024 / 1024:.0f}MB > "
+                                 f"{self.max_bytes / 1024 / 1024:.0f}MB)")
+
+            session.holders = 1
+            self._sessions[session.id] = session
+            self._by_hash[session.photo_hash] = session.id
+            self.current_bytes += session.nbytes
+            while self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self._sessions)))
+                self.evictions += 1
+        logger.info(f"[사진 세션] 생성: {session.id} {session.size[0]}x{session.size[1]}, "
+                    f"{session.nbytes / 1024 / 1024:.1f}MB")
+        return session
+
+    def get(self, session_id: str):
+        """세션 조회 (없거나 만료되었으면 None)"""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                self.misses += 1
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            self.hits += 1
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        """세션 참조 하나 삭제 (다른 클라이언트가 같은 세션을 쓰고 있으면 세션은 유지)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            session.holders -= 1
+            if session.holders <= 0:
+                self._remove(session_id)
+            return True
+
+    def stats(self) -> dict:
+        """세션 통계 (/ 엔드포인트용)"""
+        with self._lock:
+            self._expire(time.time())
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+
+
+# 프로세스 전역 사진 세션 저장소
+photo_sessions = PhotoSessionStore()
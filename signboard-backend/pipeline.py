@@ -0,0 +1,183 @@
+"""
+렌더링 파이프라인 단계 캐시 - 바뀐 파라미터의 하위 단계만 다시 계산
+
+generate_simulation은 아래 단계를 순서대로 실행한다.
+
+    decode → night_base → geometry → sign → composite → lights → encode
+
+각 단계의 캐시 키는 (단계 이름, 그 단계가 쓰는 요청 파라미터, 상위 단계 키)의 해시다.
+상위 단계 키가 키에 포함되므로 파라미터 하나가 바뀌면 그 파라미터를 쓰는 단계와
+그 아래 단계만 키가 바뀌고, 위쪽 단계는 캐시된 결과를 그대로 쓴다.
+예) 조명만 바꾸면 lights 단계와 야간 이미지 인코딩만 다시 계산한다.
+
+단계 결과는 여러 요청이 공유하므로 읽기 전용이다 (배열은 write=False).
+"""
+
+import os
+import time
+import hashlib
+import logging
+
+import numpy as np
+
+from text_cache import TextRasterCache
+from encoding import encode_image, encode_executor, to_data_url
+
+logger = logging.getLogger(__name__)
+
+# 단계 캐시 메모리 한도 (MB, 0이면 캐시하지 않음)
+PIPELINE_CACHE_MAX_MB = float(os.getenv("PIPELINE_CACHE_MAX_MB", "512"))
+
+
+class StageResult:
+    """캐시에 넣는 단계 결과 (값 안의 배열/bytes 크기를 nbytes로 집계)"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def _items(self):
+        value = self.value
+        return value if isinstance(value, (tuple, list)) else (value,)
+
+    @property
+    def nbytes(self) -> int:
+        total = 0
+        for item in self._items():
+            if isinstance(item, np.ndarray):
+                total += item.nbytes
+            elif isinstance(item, (bytes, str)):
+                total += len(item)
+        return total
+
+    def freeze(self):
+        for item in self._items():
+            if isinstance(item, np.ndarray):
+                item.setflags(write=False)
+
+
+def _feed(digest, value):
+    """캐시 키 해시에 값 추가 (배열/bytes는 내용, 그 외는 repr)"""
+    if isinstance(value, np.ndarray):
+        digest.update(f"nd{value.shape}{value.dtype}".encode())
+        digest.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        digest.update(b"b")
+        digest.update(value)
+    elif isinstance(value, str):
+        digest.update(b"s")
+        digest.update(value.encode("utf-8"))
+    else:
+        digest.update(repr(value).encode("utf-8"))
+    digest.update(b"\x00")
+
+
+def stage_key(name: str, *inputs) -> str:
+    """단계 캐시 키 (단계 이름 + 입력값 해시)"""
+    digest = hashlib.blake2b(digest_size=16)
+    _feed(digest, name)
+    for value in inputs:
+        _feed(digest, value)
+    return f"{name}:{digest.hexdigest()}"
+
+
+# 프로세스 전역 단계 캐시
+stage_cache = TextRasterCache(int(PIPELINE_CACHE_MAX_MB * 1024 * 1024))
+
+
+class PipelineRun:
+    """요청 하나의 단계 실행 기록 (어떤 단계가 캐시에서 재사용되었는지)"""
+
+    def __init__(self, cache: TextRasterCache = stage_cache):
+        self.cache = cache
+        self.stages = []
+
+    def _record(self, name: str, key: str, reused: bool, t0: float):
+        self.stages.append({
+            "stage": name,
+            "key": key.split(":", 1)[1][:12],
+            "reused": reused,
+            "ms": round((time.perf_counter() - t0) * 1000, 2),
+        })
+
+    def run(self, name: str, inputs: tuple, fn):
+        """단계 실행 (같은 입력의 결과가 캐시에 있으면 재사용)
+
+        Args:
+            name: 단계 이름
+            inputs: 결과를 결정하는 값들 (요청 파라미터, 상위 단계 키)
+            fn: 결과를 계산하는 함수 (인자 없음)
+
+        Returns:
+            (단계 키, 결과)
+        """
+        key = stage_key(name, *inputs)
+        computed = []
+
+        def render():
+            computed.append(True)
+            return StageResult(fn())
+
+        t0 = time.perf_counter()
+        result = self.cache.get_or_render(key, render)
+        self._record(name, key, not computed, t0)
+        return key, result.value
+
+    def given(self, name: str, key: str, value):
+        """요청 밖에서 이미 계산된 결과를 단계로 기록 (사진 세션의 디코딩된 사진 등)"""
+        self._record(name, key, True, time.perf_counter())
+        return key, value
+
+    def encode(self, images: dict, encoding):
+        """이미지별 인코딩 단계 (캐시에 없는 것만 인코딩 스레드에서 동시에 인코딩)
+
+        Args:
+            images: {응답 키: (이미지를 만든 단계 키, 이미지)}
+            encoding: OutputEncoding
+
+        Returns:
+            ({응답 키: data URL}, 응답에 넣을 인코딩 정보 dict) - encoding.encode_images와 같은 형식
+        """
+        t0 = time.perf_counter()
+        encoding_inputs = tuple(sorted(encoding.describe().items()))
+
+        def encode_one(key, image):
+            computed = []
+
+            def render():
+                computed.append(True)
+                return StageResult(encode_image(image, encoding))
+
+            started = time.perf_counter()
+            result = self.cache.get_or_render(key, render)
+            return result.value, not computed, started
+
+        futures = {}
+        for name, (source_key, image) in images.items():
+            key = stage_key("encode", source_key, encoding_inputs)
+            futures[name] = (key, encode_executor.submit(encode_one, key, image))
+
+        encoded = {}
+        for name, (key, future) in futures.items():
+            data, reused, started = future.result()
+            self._record(f"encode:{name}", key, reused, started)
+            encoded[name] = data
+
+        info = encoding.describe()
+        info["bytes"] = {name: len(data) for name, data in encoded.items()}
+        info["encode_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return {name: to_data_url(data, encoding) for name, data in encoded.items()}, info
+
+    def reused(self, name: str) -> bool:
+        """마지막으로 기록된 name 단계가 캐시에서 재사용되었는지"""
+        for stage in reversed(self.stages):
+            if stage["stage"] == name:
+                return stage["reused"]
+        return False
+
+    def report(self) -> dict:
+        """응답에 넣을 단계 실행 정보"""
+        return {
+            "stages": self.stages,
+            "reused": [stage["stage"] for stage in self.stages if stage["reused"]],
+            "computed": [stage["stage"] for stage in self.stages if not stage["reused"]],
+        }
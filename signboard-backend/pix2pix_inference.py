@@ -1,16 +1,32 @@
 import torch
 import torch.nn as nn
-import torchvision.transforms as transforms
-from PIL import Image
 import numpy as np
-import cv2
 import os
 import sys
 import logging
+import threading
+from contextlib import nullcontext
 from typing import Tuple
 
+from pix2pix_io import INPUT_SIZE, preprocess_into, postprocess_output
+
 logger = logging.getLogger(__name__)
 
+# CPU 추론 튜닝 (결과에 영향이 없는 설정은 기본으로 켜고, bf16처럼 결과가 달라지는 설정은 기본으로 끔)
+# torch.inference_mode로 forward (0이면 torch.no_grad)
+PIX2PIX_INFERENCE_MODE = os.getenv("PIX2PIX_INFERENCE_MODE", "1") != "0"
+# 가중치와 입력을 channels_last(NHWC) 메모리 배치로 (oneDNN 합성곱이 재배치 없이 실행)
+PIX2PIX_CHANNELS_LAST = os.getenv("PIX2PIX_CHANNELS_LAST", "0") != "0"
+# torch.compile (첫 forward에서 컴파일, 그래프는 PIX2PIX_COMPILE_CACHE_DIR에 저장해 재시작 시 재사용)
+PIX2PIX_COMPILE = os.getenv("PIX2PIX_COMPILE", "0") != "0"
+PIX2PIX_COMPILE_CACHE_DIR = os.getenv(
+    "PIX2PIX_COMPILE_CACHE_DIR", os.path.join(os.path.dirname(__file__), "cache", "torch_compile"))
+# bf16 autocast (CPU 전용, "auto"면 CPU가 bf16 연산을 지원할 때만, "0"이면 사용 안 함)
+PIX2PIX_BF16 = os.getenv("PIX2PIX_BF16", "0").lower()
+# torch 연산 스레드 수 (0이면 torch 기본값, 프로세스 전체에 적용)
+PIX2PIX_TORCH_THREADS = int(os.getenv("PIX2PIX_TORCH_THREADS", "0"))
+PIX2PIX_TORCH_INTEROP_THREADS = int(os.getenv("PIX2PIX_TORCH_INTEROP_THREADS", "0"))
+
 # pytorch-CycleGAN-and-pix2pix 라이브러리 경로 추가 (선택적)
 # 로컬에 설치되어 있지 않으면 직접 모델 구조 정의
 PIX2PIX_LIB_AVAILABLE = False
@@ -36,12 +52,37 @@ except Exception as e:
     logger.warning(f"pytorch-CycleGAN-and-pix2pix 라이브러리를 찾을 수 없습니다: {e}")
 
 
+def cpu_supports_bf16() -> bool:
+    """CPU가 oneDNN bf16 연산(AVX512-BF16 / AMX 등)을 지원하는지"""
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def configure_threads(intra: int = PIX2PIX_TORCH_THREADS, inter: int = PIX2PIX_TORCH_INTEROP_THREADS):
+    """torch 연산 스레드 수 설정 (0이면 그대로, inter-op은 병렬 작업이 시작되기 전에만 바꿀 수 있음)"""
+    if intra > 0 and torch.get_num_threads() != intra:
+        torch.set_num_threads(intra)
+    if inter > 0 and torch.get_num_interop_threads() != inter:
+        try:
+            torch.set_num_interop_threads(inter)
+        except RuntimeError as e:
+            logger.warning(f"inter-op 스레드 수를 바꿀 수 없습니다 (현재 {torch.get_num_interop_threads()}): {e}")
+
+
 class SignboardAIEngine:
-    def __init__(self, checkpoint_path: str, device: str = None):
+    def __init__(self, checkpoint_path: str, device: str = None, inference_mode: bool = PIX2PIX_INFERENCE_MODE,
+                 channels_last: bool = PIX2PIX_CHANNELS_LAST, compile: bool = PIX2PIX_COMPILE,
+                 bf16: str = PIX2PIX_BF16):
         """
         Args:
             checkpoint_path: 체크포인트 파일 경로 (예: 'checkpoints/signboard_pix2pix_v1/140_net_G.pth')
             device: 'cuda' or 'cpu' (None이면 자동 선택)
+            inference_mode: torch.inference_mode로 forward (False면 torch.no_grad)
+            channels_last: 가중치와 입력을 channels_last 메모리 배치로
+            compile: torch.compile 사용 (컴파일에 실패하면 eager로 실행)
+            bf16: "1" / "auto" / "0" - CPU bf16 autocast ("auto"면 CPU가 지원할 때만)
         """
         if device is None:
             self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
@@ -51,9 +92,51 @@ class SignboardAIEngine:
         if not os.path.exists(checkpoint_path):
             raise FileNotFoundError(f"체크포인트 파일을 찾을 수 없습니다: {checkpoint_path}")
         
+        configure_threads()
         self.model = self._load_model(checkpoint_path)
         self.model.eval()
-        logger.info(f"Pix2pix 모델 로드 완료: {checkpoint_path} (device: {self.device})")
+        # GPU로 보낼 입력은 pinned 메모리에 두고 비동기 복사
+        self._pin = self.device.type == 'cuda'
+        self._local = threading.local()
+
+        self.inference_mode = inference_mode
+        self.channels_last = channels_last
+        if channels_last:
+            self.model = self.model.to(memory_format=torch.channels_last)
+        bf16 = str(bf16).lower()
+        self.bf16 = self.device.type == 'cpu' and (bf16 in ("1", "true") or (bf16 == "auto" and cpu_supports_bf16()))
+        # self.model은 eager 모듈 그대로 두고 (ONNX 변환 등), forward만 컴파일된 모듈로
+        self._forward = self.model
+        self.compiled = False
+        if compile:
+            self._compile()
+        logger.info(f"Pix2pix 모델 로드 완료: {checkpoint_path} (device: {self.device}, {self.options()})")
+
+    def _compile(self):
+        """torch.compile (그래프 캐시는 PIX2PIX_COMPILE_CACHE_DIR, 실제 컴파일은 첫 forward에서)"""
+        if not hasattr(torch, "compile"):
+            logger.warning("torch.compile을 사용할 수 없습니다 (torch 2.0 이상 필요), eager로 실행")
+            return
+        os.makedirs(PIX2PIX_COMPILE_CACHE_DIR, exist_ok=True)
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", PIX2PIX_COMPILE_CACHE_DIR)
+        try:
+            import torch._inductor.config as inductor_config
+            inductor_config.fx_graph_cache = True
+        except (ImportError, AttributeError):
+            pass
+        self._forward = torch.compile(self.model)
+        self.compiled = True
+
+    def options(self) -> dict:
+        """추론 설정 (로그, 캐시 버전, 벤치마크 출력용)"""
+        return {
+            "inference_mode": self.inference_mode,
+            "channels_last": self.channels_last,
+            "compile": self.compiled,
+            "bf16": self.bf16,
+            "threads": torch.get_num_threads(),
+            "interop_threads": torch.get_num_interop_threads(),
+        }
     
     def _load_model(self, checkpoint_path: str):
         """Pix2pix Generator 모델 로드"""
@@ -117,54 +200,34 @@ class SignboardAIEngine:
             # 다른 형식의 체크포인트
             raise ValueError(f"알 수 없는 체크포인트 형식: {first_key}")
     
-    def preprocess(self, img: np.ndarray) -> Tuple[torch.Tensor, Tuple[int, int, int, int, int, int]]:
+    def new_input_batch(self, batch: int = 1) -> torch.Tensor:
+        """입력 버퍼 [batch, 3, 512, 512] float32 (CUDA면 pinned 메모리)"""
+        return torch.empty((batch, 3, INPUT_SIZE, INPUT_SIZE), dtype=torch.float32, pin_memory=self._pin)
+
+    def _input_buffer(self) -> torch.Tensor:
+        """스레드별로 재사용하는 입력 버퍼 (enhance 전용)"""
+        buffer = getattr(self._local, "input", None)
+        if buffer is None:
+            buffer = self._local.input = self.new_input_batch(1)
+        return buffer
+
+    def preprocess(self, img: np.ndarray, out: torch.Tensor = None) -> Tuple[torch.Tensor, Tuple[int, int, int, int, int, int]]:
         """
         OpenCV BGR 이미지를 pix2pix 입력 형식으로 변환 (512x512로 맞춤, 비율 유지)
         
+        전처리는 pix2pix_io.preprocess_into가 입력 버퍼에 바로 기록 (PIL 캔버스/transforms 없이,
+        결과는 ToTensor + Normalize(0.5, 0.5)와 같음)
+        
         Args:
             img: OpenCV BGR 이미지 (numpy array, 어떤 크기든 가능)
+            out: 재사용할 입력 버퍼 [1, 3, 512, 512] (None이면 새로 할당)
         
         Returns:
             tuple: (tensor, (original_h, original_w, resized_h, resized_w, pad_top, pad_left))
         """
-        original_h, original_w = img.shape[:2]
-        original_ratio = original_w / original_h
-        
-        # 512x512 내에 비율 유지하며 맞추기
-        if original_ratio > 1.0:  # 가로가 더 긴 경우
-            new_w = 512
-            new_h = int(512 / original_ratio)
-        else:  # 세로가 더 긴 경우
-            new_h = 512
-            new_w = int(512 * original_ratio)
-        
-        # 4의 배수로 맞추기
-        new_h = ((new_h + 3) // 4) * 4
-        new_w = ((new_w + 3) // 4) * 4
-        
-        # BGR -> RGB
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        
-        # PIL Image로 변환 및 리사이즈 (비율 유지)
-        pil_img = Image.fromarray(img_rgb)
-        pil_img = pil_img.resize((new_w, new_h), Image.LANCZOS)
-        
-        # 512x512로 패딩 추가 (중앙 정렬, 검은색 배경)
-        padded_img = Image.new('RGB', (512, 512), (0, 0, 0))
-        pad_left = (512 - new_w) // 2
-        pad_top = (512 - new_h) // 2
-        padded_img.paste(pil_img, (pad_left, pad_top))
-        
-        # Tensor로 변환 및 정규화
-        transform = transforms.Compose([
-            transforms.ToTensor(),
-            transforms.Normalize(mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5])  # [-1, 1]
-        ])
-        
-        tensor = transform(padded_img).unsqueeze(0)  # [1, 3, 512, 512]
-        scale_info = (original_h, original_w, new_h, new_w, pad_top, pad_left)
-        
-        return tensor.to(self.device), scale_info
+        batch = out if out is not None else self.new_input_batch(1)
+        scale_info = preprocess_into(img, batch[0].numpy())
+        return batch.to(self.device, non_blocking=True), scale_info
     
     def postprocess(self, tensor: torch.Tensor, scale_info: Tuple[int, int, int, int, int, int]) -> np.ndarray:
         """
@@ -177,28 +240,36 @@ class SignboardAIEngine:
         Returns:
             OpenCV BGR 이미지 (원본 크기, BGR)
         """
-        original_h, original_w, resized_h, resized_w, pad_top, pad_left = scale_info
-        
-        # GPU -> CPU, 배치 차원 제거
-        img_np = tensor.squeeze(0).cpu().numpy()  # [3, H, W]
-        
-        # CHW -> HWC
-        img_np = np.transpose(img_np, (1, 2, 0))  # [H, W, 3]
-        
-        # [-1, 1] -> [0, 255]
-        img_np = ((img_np + 1.0) * 127.5).clip(0, 255).astype(np.uint8)
-        
-        # 패딩 제거 (있는 경우)
-        if pad_top > 0 or pad_left > 0:
-            img_np = img_np[pad_top:pad_top+resized_h, pad_left:pad_left+resized_w]
-        
-        # 원본 크기로 리사이즈
-        img_np = cv2.resize(img_np, (original_w, original_h), interpolation=cv2.INTER_LANCZOS4)
+        # GPU -> CPU (CPU면 복사 없이 numpy 뷰)
+        return postprocess_output(tensor[0].cpu().numpy(), scale_info)
+    
+    def infer(self, batch: torch.Tensor) -> torch.Tensor:
+        """
+        모델 forward (배치 지원)
         
-        # RGB -> BGR
-        img_bgr = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+        Args:
+            batch: 전처리된 입력 [N, 3, 512, 512]
         
-        return img_bgr
+        Returns:
+            모델 출력 [N, 3, 512, 512], 값 범위 [-1, 1]
+        """
+        grad_context = torch.inference_mode() if self.inference_mode else torch.no_grad()
+        autocast = torch.autocast("cpu", dtype=torch.bfloat16) if self.bf16 else nullcontext()
+        if self.channels_last:
+            batch = batch.contiguous(memory_format=torch.channels_last)
+        with grad_context, autocast:
+            try:
+                output = self._forward(batch)
+            except Exception as e:
+                if not self.compiled:
+                    raise
+                # 컴파일러(C++ 툴체인 등)가 없으면 eager로 전환
+                logger.warning(f"torch.compile 실행 실패, eager로 전환: {e}")
+                self._forward = self.model
+                self.compiled = False
+                output = self.model(batch)
+        # bf16 출력은 float32로 (후처리는 numpy float32)
+        return output.float() if output.dtype != torch.float32 else output
     
     def enhance(self, phase1_signboard: np.ndarray) -> np.ndarray:
         """
@@ -210,22 +281,23 @@ class SignboardAIEngine:
         Returns:
             변환된 간판 이미지 (원본 크기, BGR)
         """
-        # 입력 이미지 디버깅
-        logger.info(f"[pix2pix] 입력 이미지: shape={phase1_signboard.shape}, min={phase1_signboard.min()}, max={phase1_signboard.max()}, mean={phase1_signboard.mean():.2f}")
+        # 값 통계(min/max/mean)는 이미지 전체를 훑으므로 DEBUG 로그일 때만 계산
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"[pix2pix] 입력 이미지: shape={phase1_signboard.shape}, min={phase1_signboard.min()}, max={phase1_signboard.max()}, mean={phase1_signboard.mean():.2f}")
         
-        # 전처리 (4의 배수로 맞춤, 비율 유지)
-        input_tensor, scale_info = self.preprocess(phase1_signboard)
-        logger.info(f"[pix2pix] 전처리 후 텐서: shape={input_tensor.shape}, min={input_tensor.min().item():.3f}, max={input_tensor.max().item():.3f}, mean={input_tensor.mean().item():.3f}")
+        # 전처리 (4의 배수로 맞춤, 비율 유지, 스레드별 입력 버퍼 재사용)
+        input_tensor, scale_info = self.preprocess(phase1_signboard, out=self._input_buffer())
+        if debug:
+            logger.debug(f"[pix2pix] 전처리 후 텐서: shape={input_tensor.shape}, min={input_tensor.min().item():.3f}, max={input_tensor.max().item():.3f}, mean={input_tensor.mean().item():.3f}")
         
         # 추론
-        with torch.no_grad():
-            output_tensor = self.model(input_tensor)
-        
-        # 모델 출력 디버깅
-        logger.info(f"[pix2pix] 모델 출력 텐서: shape={output_tensor.shape}, min={output_tensor.min().item():.3f}, max={output_tensor.max().item():.3f}, mean={output_tensor.mean().item():.3f}")
+        output_tensor = self.infer(input_tensor)
+        if debug:
+            logger.debug(f"[pix2pix] 모델 출력 텐서: shape={output_tensor.shape}, min={output_tensor.min().item():.3f}, max={output_tensor.max().item():.3f}, mean={output_tensor.mean().item():.3f}")
         
         # 후처리 (원본 크기로 복원)
         result = self.postprocess(output_tensor, scale_info)
-        logger.info(f"[pix2pix] 후처리 후 결과: shape={result.shape}, min={result.min()}, max={result.max()}, mean={result.mean():.2f}")
+        logger.info(f"[pix2pix] 추론 완료: 입력 {phase1_signboard.shape} → 결과 {result.shape}")
         
         return result
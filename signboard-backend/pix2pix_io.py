@@ -0,0 +1,82 @@
+"""
+pix2pix 입출력 변환 - 간판 BGR 이미지 ↔ 모델 입력/출력 (torch, ONNX 엔진 공용)
+
+학습 때와 같은 전처리(512x512 안에 비율 유지 + 4의 배수 + 중앙 검은색 패딩, ToTensor + Normalize(0.5, 0.5))를
+PIL 캔버스나 transforms.Compose 없이 미리 할당한 float32 버퍼 위에서 바로 수행한다.
+
+- 정규화 + BGR→RGB + HWC→CHW를 룩업 테이블 np.take 한 번으로 (결과는 ToTensor + Normalize와 비트 단위로 같음)
+- LANCZOS 리사이즈와 출력 복원은 채널별 연산이므로 BGR 그대로 처리 (cvtColor 없음)
+- 출력은 패딩을 먼저 잘라낸 뒤 [-1, 1] → [0, 255] 변환 (패딩 영역은 계산하지 않음)
+"""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# 모델 입력 크기 (학습 시 load_size=crop_size=512)
+INPUT_SIZE = 512
+
+# uint8 → [-1, 1] 룩업 테이블 (ToTensor의 /255와 Normalize의 (x - 0.5) / 0.5를 같은 float32 연산으로 미리 계산)
+NORMALIZE_LUT = (np.arange(256, dtype=np.float32) / np.float32(255) - np.float32(0.5)) / np.float32(0.5)
+
+ScaleInfo = Tuple[int, int, int, int, int, int]
+
+
+def letterbox(original_h: int, original_w: int) -> Tuple[int, int, int, int]:
+    """512x512 안에 비율 유지하며 맞춘 크기(4의 배수)와 중앙 패딩 → (new_h, new_w, pad_top, pad_left)"""
+    original_ratio = original_w / original_h
+    if original_ratio > 1.0:  # 가로가 더 긴 경우
+        new_w = INPUT_SIZE
+        new_h = int(INPUT_SIZE / original_ratio)
+    else:  # 세로가 더 긴 경우
+        new_h = INPUT_SIZE
+        new_w = int(INPUT_SIZE * original_ratio)
+    new_h = ((new_h + 3) // 4) * 4
+    new_w = ((new_w + 3) // 4) * 4
+    return new_h, new_w, (INPUT_SIZE - new_h) // 2, (INPUT_SIZE - new_w) // 2
+
+
+def new_input_batch(batch: int = 1) -> np.ndarray:
+    """모델 입력 버퍼 [batch, 3, 512, 512] float32"""
+    return np.empty((batch, 3, INPUT_SIZE, INPUT_SIZE), dtype=np.float32)
+
+
+def preprocess_into(img: np.ndarray, out: np.ndarray) -> ScaleInfo:
+    """
+    OpenCV BGR 이미지를 모델 입력 형식으로 변환해 out([3, 512, 512] float32, RGB, [-1, 1])에 기록
+
+    Returns:
+        (original_h, original_w, resized_h, resized_w, pad_top, pad_left)
+    """
+    original_h, original_w = img.shape[:2]
+    new_h, new_w, pad_top, pad_left = letterbox(original_h, original_w)
+
+    # LANCZOS 리사이즈 (채널별 독립이므로 BGR 그대로)
+    if (new_h, new_w) != (original_h, original_w):
+        img = np.asarray(Image.fromarray(img).resize((new_w, new_h), Image.LANCZOS))
+
+    # 패딩(검은색) = -1, 간판 영역은 정규화 + BGR→RGB + HWC→CHW를 한 번에
+    out.fill(NORMALIZE_LUT[0])
+    np.take(NORMALIZE_LUT, img[:, :, ::-1].transpose(2, 0, 1),
+            out=out[:, pad_top:pad_top + new_h, pad_left:pad_left + new_w], mode="clip")
+    return original_h, original_w, new_h, new_w, pad_top, pad_left
+
+
+def postprocess_output(output: np.ndarray, scale_info: ScaleInfo) -> np.ndarray:
+    """모델 출력 하나([3, 512, 512] float32, RGB, [-1, 1])를 원본 크기 BGR uint8 이미지로 복원"""
+    original_h, original_w, resized_h, resized_w, pad_top, pad_left = scale_info
+
+    # 패딩 제거 + RGB→BGR + CHW→HWC (뷰)
+    hwc = output[::-1, pad_top:pad_top + resized_h, pad_left:pad_left + resized_w].transpose(1, 2, 0)
+
+    # [-1, 1] → [0, 255] (버퍼 하나에서 in-place)
+    img = np.add(hwc, np.float32(1.0), order="C")
+    img *= np.float32(127.5)
+    np.clip(img, 0, 255, out=img)
+    img = img.astype(np.uint8)
+
+    if (resized_h, resized_w) != (original_h, original_w):
+        img = cv2.resize(img, (original_w, original_h), interpolation=cv2.INTER_LANCZOS4)
+    return img
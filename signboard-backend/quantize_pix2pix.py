@@ -0,0 +1,184 @@
+"""
+pix2pix generator ONNX 모델(fp32)을 INT8로 양자화하는 스크립트 (CPU 추론용).
+
+export_onnx.py로 변환한 fp32 모델을 onnxruntime.quantization으로 양자화한다.
+
+- static (기본): 생성한 Phase 1 간판 이미지로 활성값 범위를 보정(calibration)하는 정적 양자화 (QDQ 형식)
+- dynamic: 보정 없이 가중치만 미리 양자화하고 활성값은 실행 중에 양자화 (static이 실패하는 연산이 있을 때)
+
+보정 데이터는 HQ 추론 입력과 같은 render_signboard 출력
+(간판 종류 × 설치 방식 × 색상 × 크기를 seed로 무작위 선택)을 ONNXSignboardEngine.preprocess로 변환해 사용한다.
+양자화 결과의 속도/메모리/화질(PSNR, SSIM)은 compare_pix2pix.py로 확인한다.
+
+사용 예시:
+
+    python quantize_pix2pix.py \
+        --model checkpoints/signboard_pix2pix_v1/140_net_G.onnx \
+        --output checkpoints/signboard_pix2pix_v1/140_net_G_int8.onnx \
+        --calibration 64
+
+서버에서 사용: PIX2PIX_PRECISION=int8 (PIX2PIX_SETUP.md 참고)
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from generate_pairs import SIGN_TYPE_MAP, generate_phase1_image
+from onnx_inference import ONNXSignboardEngine
+
+# 보정/평가용 간판 문구와 색상 (#RRGGBB)
+SAMPLE_TEXTS = ["간판", "오프닝카페", "행복한 치킨", "서울약국", "BAKERY", "미용실 헤어", "24시 편의점", "김밥천국"]
+SAMPLE_COLORS = ["#FFFFFF", "#000000", "#D32F2F", "#1565C0", "#2E7D32", "#F9A825", "#6A1B9A", "#5D4037", "#EEEEEE"]
+# HQ 간판 영역 크기 범위 (가로형 간판 위주)
+SAMPLE_WIDTHS = (480, 1600)
+SAMPLE_ASPECTS = (1.5, 6.0)
+
+
+def build_phase1_samples(count: int, seed: int) -> List[np.ndarray]:
+    """Phase 1 간판 이미지(BGR) count장 생성 (같은 seed면 같은 조합)
+
+    보정용(quantize)과 평가용(compare)은 서로 다른 seed로 만들어 평가 세트가 보정에 쓰이지 않게 한다.
+    """
+    rng = random.Random(seed)
+    # 하위 호환용 키(channel_wall 등)는 같은 조합이므로 중복 제거
+    sign_types = sorted(set(SIGN_TYPE_MAP.values()))
+    sign_keys = [next(key for key, value in SIGN_TYPE_MAP.items() if value == sign_type) for sign_type in sign_types]
+
+    samples = []
+    for _ in range(count):
+        bg_color, text_color = rng.sample(SAMPLE_COLORS, 2)
+        width = rng.randint(*SAMPLE_WIDTHS)
+        height = max(64, int(width / rng.uniform(*SAMPLE_ASPECTS)))
+        samples.append(generate_phase1_image(
+            text=rng.choice(SAMPLE_TEXTS),
+            sign_type_key=rng.choice(sign_keys),
+            bg_color=bg_color,
+            text_color=text_color,
+            width=width,
+            height=height,
+        ))
+    return samples
+
+
+class Phase1CalibrationReader:
+    """onnxruntime.quantization.CalibrationDataReader: 보정 이미지를 하나씩 모델 입력으로 전달"""
+
+    def __init__(self, input_name: str, samples: List[np.ndarray]):
+        self.input_name = input_name
+        self.samples = samples
+        self._iter = iter(samples)
+
+    def get_next(self):
+        img = next(self._iter, None)
+        if img is None:
+            return None
+        # 전처리는 서빙 엔진과 같은 함수 사용
+        tensor, _ = ONNXSignboardEngine.preprocess(img)
+        return {self.input_name: tensor}
+
+    def rewind(self):
+        self._iter = iter(self.samples)
+
+
+def quantize(model: Path, output: Path, mode: str, calibration: int, seed: int, per_channel: bool) -> None:
+    """fp32 ONNX 모델을 INT8로 양자화해 output에 저장"""
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationMethod, QuantFormat, QuantType, quantize_dynamic, quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if mode == "dynamic":
+        quantize_dynamic(str(model), str(output), weight_type=QuantType.QUInt8, per_channel=per_channel)
+        print(f"[INFO] 동적 양자화 완료: {output} ({output.stat().st_size / 1024 / 1024:.1f}MB)")
+        return
+
+    input_name = onnx.load(str(model), load_external_data=False).graph.input[0].name
+    print(f"[INFO] 보정용 Phase 1 간판 {calibration}장 생성 (seed={seed})")
+    reader = Phase1CalibrationReader(input_name, build_phase1_samples(calibration, seed))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 양자화 전 shape 추론/그래프 정리 (권장 전처리)
+        prepared = Path(tmp) / "prepared.onnx"
+        quant_pre_process(str(model), str(prepared))
+        quantize_static(
+            str(prepared),
+            str(output),
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+    print(f"[INFO] 정적 양자화 완료: {output} ({output.stat().st_size / 1024 / 1024:.1f}MB)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="pix2pix generator INT8 양자화")
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="checkpoints/signboard_pix2pix_v1/140_net_G.onnx",
+        help="양자화할 fp32 ONNX 모델 (기본: checkpoints/signboard_pix2pix_v1/140_net_G.onnx)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="저장할 INT8 모델 경로 (기본: <모델 이름>_int8.onnx)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["static", "dynamic"],
+        default="static",
+        help="static: Phase 1 간판으로 보정하는 정적 양자화 (기본), dynamic: 동적 양자화",
+    )
+    parser.add_argument(
+        "--calibration",
+        type=int,
+        default=64,
+        help="static 보정에 사용할 간판 이미지 수 (기본: 64)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="보정 이미지 seed (기본: 0, compare_pix2pix.py 평가 세트는 다른 seed 사용)",
+    )
+    parser.add_argument(
+        "--per-channel",
+        action="store_true",
+        help="가중치를 출력 채널별로 양자화 (정확도 ↑, 일부 CPU에서 속도 ↓)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    # 스크립트 디렉토리 기준으로 상대 경로 해석
+    os.chdir(Path(__file__).parent)
+
+    model = Path(args.model).resolve()
+    output = Path(args.output).resolve() if args.output else model.with_name(f"{model.stem}_int8.onnx")
+    if not model.exists():
+        print(f"[ERROR] ONNX 모델 파일이 없습니다: {model}")
+        print("  먼저 export_onnx.py로 변환하세요: python export_onnx.py")
+        sys.exit(1)
+
+    quantize(model, output, args.mode, args.calibration, args.seed, args.per_channel)
+    print("\n[안내] 속도/메모리/화질 비교:")
+    print(f"  python compare_pix2pix.py --fp32 {model} --int8 {output}")
+
+
+if __name__ == "__main__":
+    main()
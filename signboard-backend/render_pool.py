@@ -0,0 +1,144 @@
+"""
+렌더링 작업 풀 - async 엔드포인트의 CPU 작업을 이벤트 루프 밖에서 실행
+
+generate_simulation / generate_hq / generate_flat_design 은 수 초 걸리는 OpenCV, PIL, torch
+작업을 동기적으로 수행한다. 이벤트 루프에서 직접 실행하면 요청 하나가 다른 모든 요청
+(AI 브랜딩, / 등)을 막으므로, 렌더링은 이 풀의 워커에서 실행하고 엔드포인트는 결과만 기다린다.
+
+- RENDER_POOL_KIND: "thread" (기본, OpenCV/torch는 GIL을 풀어줌) 또는 "process"
+- RENDER_WORKERS: 워커 수
+- RENDER_QUEUE_SIZE: 실행 중인 작업 외에 대기할 수 있는 작업 수 (초과 시 RenderQueueFull)
+- RENDER_JOB_TIMEOUT: 작업당 최대 대기 시간 (초, 초과 시 RenderJobTimeout)
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+RENDER_POOL_KIND = os.getenv("RENDER_POOL_KIND", "thread").lower()
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", "16"))
+RENDER_JOB_TIMEOUT = float(os.getenv("RENDER_JOB_TIMEOUT", "120"))
+
+
+class RenderQueueFull(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+class RenderJobTimeout(Exception):
+    """작업이 제한 시간 안에 끝나지 않음"""
+
+
+class RenderPool:
+    """스레드/프로세스 워커 풀 + 제한된 대기열 + 작업별 타임아웃
+
+    initializer는 워커마다 한 번 실행된다 (폰트/모델 로딩 등).
+    process 모드에서는 작업 함수와 인자, 반환값이 pickle 가능해야 한다.
+    """
+
+    def __init__(self, kind: str = RENDER_POOL_KIND, workers: int = RENDER_WORKERS,
+                 queue_size: int = RENDER_QUEUE_SIZE, job_timeout: float = RENDER_JOB_TIMEOUT,
+                 initializer=None):
+        if kind not in ("thread", "process"):
+            logger.warning(f"[렌더 풀] 알 수 없는 RENDER_POOL_KIND={kind}, thread 사용")
+            kind = "thread"
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.job_timeout = job_timeout
+        self.initializer = initializer
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def start(self):
+        """워커 풀 생성 (이미 있으면 그대로)"""
+        with self._lock:
+            if self._executor is not None:
+                return
+            if self.kind == "process":
+                # torch/OpenCV 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="render",
+                    initializer=self.initializer,
+                )
+        logger.info(f"[렌더 풀] 시작: kind={self.kind}, workers={self.workers}, "
+                    f"queue_size={self.queue_size}, job_timeout={self.job_timeout}s")
+
+    def shutdown(self):
+        """워커 풀 종료 (대기 중인 작업은 취소)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs)를 워커에서 실행하고 결과를 기다림
+
+        Raises:
+            RenderQueueFull: 실행 중 + 대기 중 작업이 workers + queue_size 이상
+            RenderJobTimeout: job_timeout 초 안에 끝나지 않음 (이미 실행 중인 작업은 워커에서 끝까지 실행됨)
+        """
+        self.start()
+        with self._lock:
+            if self.pending >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise RenderQueueFull(f"렌더링 대기열이 가득 찼습니다 (pending={self.pending})")
+            self.pending += 1
+            future = self._executor.submit(fn, *args, **kwargs)
+        # 슬롯은 작업이 실제로 끝날 때 반납 (타임아웃 후에도 실행 중이면 계속 점유)
+        future.add_done_callback(self._release)
+
+        t0 = time.perf_counter()
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.job_timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"[렌더 풀] 작업 타임아웃: {getattr(fn, '__name__', fn)}, "
+                           f"{time.perf_counter() - t0:.1f}s > {self.job_timeout}s")
+            raise RenderJobTimeout(f"렌더링 시간이 초과되었습니다 ({self.job_timeout:g}초)")
+
+    def stats(self) -> dict:
+        """풀 상태 (/ 엔드포인트용)"""
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "job_timeout": self.job_timeout,
+                "running": self._executor is not None,
+                "pending": self.pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
@@ -0,0 +1,135 @@
+"""
+텍스트 래스터 캐시 - extract_text_layer / create_text_mask 결과 메모이제이션
+
+같은 텍스트를 같은 폰트·크기·색상·캔버스·위치로 다시 그리는 경우
+(채널 렌더러의 앞면/옆면/하이라이트/그림자, 슬라이더 조정 등)
+글리프 래스터화를 건너뛰고 캐시된 래스터를 반환한다.
+캐시에는 글자 bbox 크기의 TextRaster만 보관하므로 메모리는 글자 면적에 비례하고,
+캐시된 래스터는 여러 요청이 공유하므로 읽기 전용이다.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 텍스트 래스터 캐시 메모리 한도 (MB)
+TEXT_CACHE_MAX_MB = float(os.getenv("TEXT_CACHE_MAX_MB", "64"))
+
+
+def font_identity(font):
+    """폰트 객체를 캐시 키로 쓸 수 있는 값으로 변환 (파일 경로, TTC 인덱스, 크기)
+
+    파일 경로가 없는 폰트(기본 비트맵 폰트 등)는 None → 캐시하지 않음
+    """
+    path = getattr(font, "path", None)
+    if not isinstance(path, str):
+        return None
+    return (path, getattr(font, "index", 0), getattr(font, "size", None))
+
+
+class TextRasterCache:
+    """메모리 한도 기반 LRU 캐시 (키 → 읽기 전용 np.ndarray / TextRaster)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_render(self, key, render_fn):
+        """키에 해당하는 항목을 반환 (없으면 render_fn()으로 만들어 캐시)
+
+        항목은 np.ndarray 또는 nbytes/freeze()를 가진 객체(TextRaster).
+        key가 None이면 캐시하지 않고 render_fn() 결과를 그대로 반환한다.
+        """
+        if key is None:
+            return render_fn()
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        value = render_fn()
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+        else:
+            value.freeze()
+
+        if value.nbytes > self.max_bytes:
+            # 한도보다 큰 항목은 캐시하지 않음
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self.current_bytes += value.nbytes
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.current_bytes -= evicted.nbytes
+                    self.evictions += 1
+        return value
+
+    def stats(self) -> dict:
+        """캐시 히트/미스 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+# 프로세스 전역 텍스트 래스터 캐시
+text_cache = TextRasterCache(int(TEXT_CACHE_MAX_MB * 1024 * 1024))
+
+
+def text_layer_key(text: str, font, color: tuple, canvas_size: tuple, position: tuple):
+    """extract_text_layer 캐시 키"""
+    font_id = font_identity(font)
+    if font_id is None:
+        return None
+    return (
+        "layer",
+        text,
+        font_id,
+        tuple(int(c) for c in color),
+        tuple(int(s) for s in canvas_size),
+        tuple(float(p) for p in position),
+    )
+
+
+def text_mask_key(text: str, font, canvas_size: tuple, position: tuple):
+    """create_text_mask 캐시 키"""
+    font_id = font_identity(font)
+    if font_id is None:
+        return None
+    return (
+        "mask",
+        text,
+        font_id,
+        tuple(int(s) for s in canvas_size),
+        tuple(float(p) for p in position),
+    )
@@ -0,0 +1,101 @@
+"""
+타이트 bbox 텍스트 래스터화
+
+텍스트를 캔버스 전체 크기가 아니라 글자 bbox 크기의 버퍼에 그리고,
+캔버스 내 오프셋(x, y)과 함께 보관한다.
+큰 간판 영역(예: 3000x800)에서도 메모리와 연산량이 글자 면적에만 비례하도록
+이후 합성 단계는 bounds() 사각형 안에서만 수행한다.
+"""
+
+import math
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# textbbox 바깥으로 삐져나오는 안티앨리어싱 픽셀 대비 여유 (px)
+BBOX_MARGIN = 2
+
+
+class TextRaster:
+    """글자 bbox 크기의 래스터 + 캔버스 내 위치
+
+    Attributes:
+        pixels: (h, w, 4) RGBA 또는 (h, w) L 배열 (bbox 영역만)
+        x, y: 캔버스 내 좌상단 위치
+        canvas_size: (width, height) 원래 캔버스 크기
+    """
+
+    def __init__(self, pixels: np.ndarray, x: int, y: int, canvas_size: tuple):
+        self.pixels = pixels
+        self.x = x
+        self.y = y
+        self.canvas_size = canvas_size
+
+    @property
+    def nbytes(self) -> int:
+        return self.pixels.nbytes
+
+    def freeze(self):
+        """캐시 공유를 위해 읽기 전용으로 설정"""
+        self.pixels.setflags(write=False)
+
+    def bounds(self):
+        """캔버스 좌표 기준 (x0, y0, x1, y1), 비어 있으면 None"""
+        h, w = self.pixels.shape[:2]
+        if h == 0 or w == 0:
+            return None
+        return self.x, self.y, self.x + w, self.y + h
+
+    def crop(self, rect: tuple) -> np.ndarray:
+        """캔버스 좌표 사각형 rect 영역을 잘라냄 (래스터 밖은 0)"""
+        x0, y0, x1, y1 = rect
+        h, w = self.pixels.shape[:2]
+        out = np.zeros((y1 - y0, x1 - x0) + self.pixels.shape[2:], dtype=self.pixels.dtype)
+        sx0 = max(x0, self.x)
+        sy0 = max(y0, self.y)
+        sx1 = min(x1, self.x + w)
+        sy1 = min(y1, self.y + h)
+        if sx0 < sx1 and sy0 < sy1:
+            out[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = \
+                self.pixels[sy0 - self.y:sy1 - self.y, sx0 - self.x:sx1 - self.x]
+        return out
+
+    def to_canvas(self) -> np.ndarray:
+        """캔버스 전체 크기 배열로 변환 (기존 full-canvas API용)"""
+        width, height = self.canvas_size
+        return self.crop((0, 0, width, height))
+
+
+def union_bounds(*rasters):
+    """여러 래스터를 모두 포함하는 캔버스 사각형 (모두 비어 있으면 None)"""
+    rects = [r.bounds() for r in rasters if r is not None and r.bounds() is not None]
+    if not rects:
+        return None
+    return (
+        min(r[0] for r in rects),
+        min(r[1] for r in rects),
+        max(r[2] for r in rects),
+        max(r[3] for r in rects),
+    )
+
+
+def rasterize_text(text: str, font, fill, canvas_size: tuple, position: tuple, mode: str = 'RGBA') -> TextRaster:
+    """텍스트를 bbox 크기 버퍼에 그림 (캔버스 밖은 잘림 - 캔버스에 그린 것과 동일)
+
+    위치는 정수 단위로만 옮기므로 글리프의 서브픽셀 배치는 캔버스에 그린 것과 같다.
+    """
+    width, height = canvas_size
+    draw = ImageDraw.Draw(Image.new(mode, (1, 1)))
+    left, top, right, bottom = draw.textbbox(position, text, font=font)
+
+    x0 = max(0, int(math.floor(left)) - BBOX_MARGIN)
+    y0 = max(0, int(math.floor(top)) - BBOX_MARGIN)
+    x1 = min(width, int(math.ceil(right)) + BBOX_MARGIN)
+    y1 = min(height, int(math.ceil(bottom)) + BBOX_MARGIN)
+    if x0 >= x1 or y0 >= y1:
+        channels = (4,) if mode == 'RGBA' else ()
+        return TextRaster(np.zeros((0, 0) + channels, dtype=np.uint8), 0, 0, canvas_size)
+
+    buffer = Image.new(mode, (x1 - x0, y1 - y0), 0)
+    ImageDraw.Draw(buffer).text((position[0] - x0, position[1] - y0), text, fill=fill, font=font)
+    return TextRaster(np.array(buffer), x0, y0, canvas_size)
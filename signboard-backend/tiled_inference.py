@@ -0,0 +1,172 @@
+"""
+pix2pix 타일 추론 - 큰 간판을 겹치는 512x512 타일로 나눠 높은 해상도로 개선
+
+engine.enhance는 어떤 크기의 간판이든 512x512 안으로 축소(레터박스)해 추론한 뒤 원본 크기로 다시 확대하므로
+2400x600 간판은 512x128로 추론되어 흐릿하게 돌아온다. TiledEnhancer는 간판을 겹치는 512x512 타일로 나눠
+PIX2PIX_TILE_BATCH장씩 배치로 추론하고, 겹치는 영역은 타일 가장자리로 갈수록 작아지는 가중치(feather)로
+섞어 이음매가 보이지 않게 한다.
+
+- 타일 수는 PIX2PIX_TILE_MAX와 지연 시간 예산(PIX2PIX_TILE_BUDGET_MS ÷ 측정한 타일당 추론 시간)으로 제한,
+  넘으면 타일 수가 맞을 때까지 간판을 축소한 뒤 타일로 나눔 (그래도 기존 방식보다 해상도가 높음)
+- 512x512 안에 들어가는 간판(또는 타일 1장으로 줄어드는 경우)은 기존 enhance와 같음
+- 타일보다 짧은 변은 레터박스처럼 검은색으로 중앙 패딩 (학습 데이터와 같은 형태)
+- engine은 preprocess / infer / postprocess / enhance를 가진 엔진
+  (SignboardAIEngine, ONNXSignboardEngine, InferenceScheduler - 스케줄러면 타일도 다른 요청과 묶어서 실행)
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+
+import cv2
+import numpy as np
+
+from inference_scheduler import concat_batch
+
+logger = logging.getLogger(__name__)
+
+# 모델 입력 크기 = 타일 크기
+TILE_SIZE = 512
+# 이웃 타일과 겹치는 최소 폭 (px, 이 폭에서 가중치가 0 → 1로 증가)
+PIX2PIX_TILE_OVERLAP = int(os.getenv("PIX2PIX_TILE_OVERLAP", "64"))
+# 간판 하나당 최대 타일 수
+PIX2PIX_TILE_MAX = int(os.getenv("PIX2PIX_TILE_MAX", "16"))
+# 간판 하나의 추론 시간 예산 (ms, 0이면 PIX2PIX_TILE_MAX만 적용)
+PIX2PIX_TILE_BUDGET_MS = float(os.getenv("PIX2PIX_TILE_BUDGET_MS", "10000"))
+# 한 번에 추론할 타일 수
+PIX2PIX_TILE_BATCH = int(os.getenv("PIX2PIX_TILE_BATCH", "4"))
+
+
+def tile_starts(length: int, tile: int = TILE_SIZE, overlap: int = PIX2PIX_TILE_OVERLAP) -> list:
+    """길이 length를 덮는 타일 시작 위치 (이웃 타일과 overlap 이상 겹치도록 균등 간격)"""
+    if length <= tile:
+        return [0]
+    count = math.ceil((length - overlap) / (tile - overlap))
+    return [round(i * (length - tile) / (count - 1)) for i in range(count)]
+
+
+def feather_weights(tile: int = TILE_SIZE, overlap: int = PIX2PIX_TILE_OVERLAP) -> np.ndarray:
+    """타일 합성 가중치 [tile, tile, 1] - 가장자리 overlap 픽셀에서 선형으로 감소 (0이 되지는 않음)"""
+    index = np.arange(tile, dtype=np.float32)
+    ramp = np.minimum(index + 0.5, tile - index - 0.5) / max(overlap, 1)
+    ramp = np.clip(ramp, 1e-3, 1.0)
+    return np.outer(ramp, ramp)[..., np.newaxis]
+
+
+class TiledEnhancer:
+    """engine 앞단의 타일 추론 래퍼 (engine.enhance와 같은 인터페이스)"""
+
+    def __init__(self, engine, overlap: int = PIX2PIX_TILE_OVERLAP, max_tiles: int = PIX2PIX_TILE_MAX,
+                 budget_ms: float = PIX2PIX_TILE_BUDGET_MS, batch: int = PIX2PIX_TILE_BATCH):
+        self.engine = engine
+        self.overlap = min(max(0, overlap), TILE_SIZE // 2)
+        self.max_tiles = max(1, max_tiles)
+        self.budget_ms = budget_ms
+        self.batch = max(1, batch)
+        self.weights = feather_weights(TILE_SIZE, self.overlap)
+        self._lock = threading.Lock()
+        self.ms_per_tile = None  # 타일(=추론 1장)당 추론 시간 이동 평균
+        self.requests = 0
+        self.tiled = 0
+        self.downscaled = 0
+        self.tiles = 0
+        logger.info(f"[pix2pix 타일] 사용: overlap={self.overlap}, max_tiles={self.max_tiles}, "
+                    f"budget={budget_ms:g}ms, batch={self.batch}")
+
+    def tile_limit(self) -> int:
+        """현재 허용 타일 수 (예산 ÷ 측정한 타일당 시간, 측정 전에는 max_tiles)"""
+        with self._lock:
+            limit = self.max_tiles
+            if self.budget_ms > 0 and self.ms_per_tile:
+                limit = min(limit, max(1, int(self.budget_ms // self.ms_per_tile)))
+            return limit
+
+    def _grid(self, h: int, w: int) -> int:
+        return len(tile_starts(h, TILE_SIZE, self.overlap)) * len(tile_starts(w, TILE_SIZE, self.overlap))
+
+    def plan(self, h: int, w: int):
+        """타일로 나눌 배율 (1.0이면 원본 크기, None이면 타일 1장 = 기존 enhance)"""
+        limit = self.tile_limit()
+        scale = 1.0
+        while True:
+            sh, sw = max(1, round(h * scale)), max(1, round(w * scale))
+            tiles = self._grid(sh, sw)
+            if tiles == 1:
+                return None
+            if tiles <= limit:
+                return scale
+            scale *= 0.9
+
+    def _observe(self, tiles: int, elapsed_ms: float):
+        with self._lock:
+            per_tile = elapsed_ms / tiles
+            self.ms_per_tile = per_tile if self.ms_per_tile is None else 0.8 * self.ms_per_tile + 0.2 * per_tile
+
+    def enhance(self, phase1_signboard: np.ndarray) -> np.ndarray:
+        """engine.enhance와 같음 (큰 간판은 타일로 나눠 추론, 원본 크기 BGR 반환)"""
+        h, w = phase1_signboard.shape[:2]
+        scale = self.plan(h, w)
+        if scale is None:
+            t0 = time.perf_counter()
+            result = self.engine.enhance(phase1_signboard)
+            self._observe(1, (time.perf_counter() - t0) * 1000)
+            with self._lock:
+                self.requests += 1
+            return result
+
+        sh, sw = max(1, round(h * scale)), max(1, round(w * scale))
+        work = phase1_signboard if scale == 1.0 else cv2.resize(phase1_signboard, (sw, sh), interpolation=cv2.INTER_AREA)
+
+        # 타일보다 짧은 변은 검은색 중앙 패딩
+        ph, pw = max(sh, TILE_SIZE), max(sw, TILE_SIZE)
+        pad_top, pad_left = (ph - sh) // 2, (pw - sw) // 2
+        canvas = np.zeros((ph, pw, 3), dtype=np.uint8)
+        canvas[pad_top:pad_top + sh, pad_left:pad_left + sw] = work
+
+        boxes = [(y, x) for y in tile_starts(ph, TILE_SIZE, self.overlap) for x in tile_starts(pw, TILE_SIZE, self.overlap)]
+        accum = np.zeros((ph, pw, 3), dtype=np.float32)
+        weight_sum = np.zeros((ph, pw, 1), dtype=np.float32)
+        t0 = time.perf_counter()
+        for start in range(0, len(boxes), self.batch):
+            part = boxes[start:start + self.batch]
+            prepared = [self.engine.preprocess(canvas[y:y + TILE_SIZE, x:x + TILE_SIZE]) for y, x in part]
+            t_infer = time.perf_counter()
+            outputs = self.engine.infer(concat_batch([tensor for tensor, _ in prepared]))
+            self._observe(len(part), (time.perf_counter() - t_infer) * 1000)
+            for index, ((y, x), (_, scale_info)) in enumerate(zip(part, prepared)):
+                tile = self.engine.postprocess(outputs[index:index + 1], scale_info)
+                accum[y:y + TILE_SIZE, x:x + TILE_SIZE] += tile * self.weights
+                weight_sum[y:y + TILE_SIZE, x:x + TILE_SIZE] += self.weights
+
+        blended = (accum / weight_sum)[pad_top:pad_top + sh, pad_left:pad_left + sw]
+        result = np.clip(np.round(blended), 0, 255).astype(np.uint8)
+        if scale != 1.0:
+            result = cv2.resize(result, (w, h), interpolation=cv2.INTER_LANCZOS4)
+
+        with self._lock:
+            self.requests += 1
+            self.tiled += 1
+            self.tiles += len(boxes)
+            if scale != 1.0:
+                self.downscaled += 1
+        logger.info(f"[pix2pix 타일] {w}x{h} → 배율 {scale:.2f}, 타일 {len(boxes)}장, "
+                    f"{(time.perf_counter() - t0) * 1000:.0f}ms")
+        return result
+
+    def stats(self) -> dict:
+        """타일 추론 통계 (/ 엔드포인트용)"""
+        limit = self.tile_limit()
+        with self._lock:
+            return {
+                "overlap": self.overlap,
+                "max_tiles": self.max_tiles,
+                "budget_ms": self.budget_ms,
+                "tile_limit": limit,
+                "ms_per_tile": round(self.ms_per_tile, 1) if self.ms_per_tile else None,
+                "requests": self.requests,
+                "tiled": self.tiled,
+                "downscaled": self.downscaled,
+                "mean_tiles": round(self.tiles / self.tiled, 2) if self.tiled else 0.0,
+            }
@@ -0,0 +1,89 @@
+"""
+서버 워밍업 상태 - 시작 시 무거운 서브시스템(폰트, 간판 렌더링, pix2pix, AI 브랜딩) 초기화 추적
+
+main.py는 import 시점에 torch/openai 같은 무거운 모듈을 불러오지 않고, startup 훅에서
+백그라운드 워밍업을 시작한다. 워밍업 단계마다 상태와 소요 시간을 여기에 기록하고,
+/api/ready는 필수 서브시스템이 모두 준비되었는지(ready)와 각 서브시스템의 상태를 반환한다.
+
+상태: pending (대기) → warming (초기화 중) → ready / failed, 사용할 수 없는 서브시스템은 disabled
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# 서브시스템 상태
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+DISABLED = "disabled"
+
+
+class Readiness:
+    """서브시스템별 워밍업 상태와 소요 시간
+
+    required=True인 서브시스템이 모두 ready여야 ready() == True (disabled는 제외)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subsystems = OrderedDict()
+        self.created = time.time()
+
+    def register(self, name: str, required: bool = True):
+        with self._lock:
+            self._subsystems[name] = {"status": PENDING, "required": required}
+
+    def start(self, name: str):
+        with self._lock:
+            self._subsystems[name].update(status=WARMING, _started=time.perf_counter())
+
+    def finish(self, name: str, error: str = None, detail: dict = None):
+        """워밍업 완료(error가 있으면 실패) 기록 + 소요 시간 로그"""
+        with self._lock:
+            info = self._subsystems[name]
+            duration_ms = round((time.perf_counter() - info.pop("_started")) * 1000, 1)
+            info.update(status=FAILED if error else READY, duration_ms=duration_ms)
+            if error:
+                info["error"] = error
+            if detail:
+                info["detail"] = detail
+        if error:
+            logger.error(f"[워밍업] {name} 실패 ({duration_ms:.0f}ms): {error}")
+        else:
+            logger.info(f"[워밍업] {name} 완료: {duration_ms:.0f}ms")
+
+    def disable(self, name: str, reason: str):
+        with self._lock:
+            self._subsystems[name].update(status=DISABLED, reason=reason)
+        logger.info(f"[워밍업] {name} 사용 안 함: {reason}")
+
+    def status(self, name: str) -> str:
+        with self._lock:
+            return self._subsystems[name]["status"]
+
+    def ready(self) -> bool:
+        with self._lock:
+            return all(info["status"] in (READY, DISABLED)
+                       for info in self._subsystems.values() if info["required"])
+
+    def report(self) -> dict:
+        """/api/ready 응답 본문"""
+        with self._lock:
+            subsystems = {
+                name: {key: value for key, value in info.items() if not key.startswith("_")}
+                for name, info in self._subsystems.items()
+            }
+        return {
+            "ready": self.ready(),
+            "uptime_s": round(time.time() - self.created, 1),
+            "subsystems": subsystems,
+        }
+
+
+# 서버 전역 워밍업 상태
+readiness = Readiness()
@@ -138,8 +138,6 @@ function App() {
     setLoading(true);
 
     try {
-      // 이미지를 base64로 변환
-      const buildingBase64 = await imageToBase64(buildingImage);
       const signboardsPayload = [];
 
       for (const sb of signboards) {
@@ -197,7 +195,7 @@ function App() {
 
       // API 호출 (복수 간판)
       const formDataToSend = new FormData();
-      formDataToSend.append('building_photo', buildingBase64);
+      await appendBuildingPhoto(formDataToSend);
       // 기존 백엔드의 시그니처 유지를 위해 첫 간판 정보 별도 전송, 실제 처리는 signboards에서)
       const firstArea = signboards[0].selectedArea;
       let firstPoints;
@@ -242,10 +240,7 @@ function App() {
       setLoadingProgress(30);
 
       // Phase 1: 기본 생성
-      const response = await fetch('http://localhost:8000/api/generate-simulation', {
-        method: 'POST',
-        body: formDataToSend
-      });
+      const response = await postWithBuildingPhoto('http://localhost:8000/api/generate-simulation', formDataToSend);
 
       const data = await response.json();
       
@@ -261,13 +256,10 @@ function App() {
         try {
           setLoadingProgress(80);
           
-          // Phase 2 API 호출 (아직은 구현)
-          const aiResponse = await fetch('http://localhost:8000/api/generate-hq', {
-            method: 'POST',
-            body: formDataToSend
-          });
+          // Phase 2: HQ 작업 등록 후 결과가 나올 때까지 폴링
+          const aiResponse = await postWithBuildingPhoto('http://localhost:8000/api/generate-hq', formDataToSend);
 
-          const aiData = await aiResponse.json();
+          const aiData = await waitForJob(await aiResponse.json());
           
           if (aiData.error) {
             console.warn('AI 개선 실패, 기본 결과로 표시:', aiData.error);
@@ -324,6 +316,71 @@ function App() {
     });
   };
 
+  // 건물 사진 세션: 같은 사진은 서버에 한 번만 업로드하고 이후 요청에는 세션 ID만 전송
+  const photoSessionRef = useRef({ image: null, id: null });
+
+  const getPhotoSessionId = async (image) => {
+    if (photoSessionRef.current.image === image && photoSessionRef.current.id) {
+      return photoSessionRef.current.id;
+    }
+    try {
+      const uploadData = new FormData();
+      uploadData.append('building_photo_file', image);
+      const response = await fetch('http://localhost:8000/api/photo-session', {
+        method: 'POST',
+        body: uploadData
+      });
+      const data = await response.json();
+      if (!response.ok || data.error) {
+        console.warn('[사진 세션] 생성 실패, base64 전송 사용:', data.error);
+        return null;
+      }
+      photoSessionRef.current = { image, id: data.session_id };
+      return data.session_id;
+    } catch (error) {
+      console.warn('[사진 세션] 생성 실패, base64 전송 사용:', error);
+      return null;
+    }
+  };
+
+  // 건물 사진을 세션 ID로 (세션을 만들 수 없으면 base64로) FormData에 추가
+  const appendBuildingPhoto = async (formData) => {
+    const sessionId = await getPhotoSessionId(buildingImage);
+    if (sessionId) {
+      formData.set('photo_session', sessionId);
+    } else {
+      formData.set('building_photo', await imageToBase64(buildingImage));
+    }
+  };
+
+  // 사진 세션이 만료(410)되었으면 다시 업로드해서 한 번 재시도
+  const postWithBuildingPhoto = async (url, formData) => {
+    let response = await fetch(url, { method: 'POST', body: formData });
+    if (response.status === 410 && formData.has('photo_session')) {
+      photoSessionRef.current = { image: null, id: null };
+      formData.delete('photo_session');
+      await appendBuildingPhoto(formData);
+      response = await fetch(url, { method: 'POST', body: formData });
+    }
+    return response;
+  };
+
+  // 작업 큐에 등록된 작업(202 응답)의 결과가 나올 때까지 폴링 (timeoutMs가 지나면 오류)
+  const waitForJob = async (job, intervalMs = 1000, timeoutMs = 10 * 60 * 1000) => {
+    if (!job.job_id) {
+      return job; // 등록 실패 (대기열 초과 등) - 오류 응답 그대로
+    }
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+      const response = await fetch(`http://localhost:8000${job.result_url}`);
+      if (response.status !== 202) {
+        return await response.json();
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+    throw new Error(`작업 대기 시간 초과 (${Math.round(timeoutMs / 1000)}초)`);
+  };
+
   // 브랜딩 자산 저장
   const handleSaveBranding = (brandingAsset) => {
     setSavedBrandings(prev => [brandingAsset, ...prev]);
@@ -358,10 +415,9 @@ function App() {
     setLoadingPhase('flat');
 
     try {
-      const buildingBase64 = await imageToBase64(buildingImage);
       const formDataToSend = new FormData();
       
-      formDataToSend.append('building_photo', buildingBase64);
+      await appendBuildingPhoto(formDataToSend);
       
       // 폴리곤 포인트 변환
       let points;
@@ -424,10 +480,7 @@ function App() {
       }
 
       console.log('[App.js] 평면도 생성 API 호출 시작');
-      const response = await fetch('http://localhost:8000/api/generate-flat-design', {
-        method: 'POST',
-        body: formDataToSend
-      });
+      const response = await postWithBuildingPhoto('http://localhost:8000/api/generate-flat-design', formDataToSend);
 
       console.log('[App.js] 평면도 생성 API 응답 상태:', response.status);
       
@@ -669,7 +722,6 @@ function App() {
                       if (!buildingImage || !signboards.length) return;
                       setLoading(true);
                       try {
-                        const buildingBase64 = await imageToBase64(buildingImage);
                         // transforms: [{id, ...transform}]
                         const updatedSignboards = signboards.map((sb) => {
                           const t = Array.isArray(transforms)
@@ -748,7 +800,7 @@ function App() {
                         }
 
                         const formDataToSend = new FormData();
-                        formDataToSend.append('building_photo', buildingBase64);
+                        await appendBuildingPhoto(formDataToSend);
                         const firstArea = updatedSignboards[0].selectedArea;
                         let firstPoints;
                         if (firstArea.type === 'polygon') {
@@ -793,10 +845,7 @@ function App() {
                         const rotationFormValue = formDataToSend.get('rotation');
                         console.log('  formDataToSend.get("rotation"):', rotationFormValue);
 
-                        const response = await fetch('http://localhost:8000/api/generate-simulation', {
-                          method: 'POST',
-                          body: formDataToSend
-                        });
+                        const response = await postWithBuildingPhoto('http://localhost:8000/api/generate-simulation', formDataToSend);
 
                         const data = await response.json();
                         if (data.error) {